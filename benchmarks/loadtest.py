@@ -0,0 +1,157 @@
+"""
+Нагрузочный прогон главной страницы (run_dashboard, как в main) без сети.
+
+Внешние API отвечают записанными ответами из data/fixtures (transport.ReplayTransport),
+задержка и отказы сети имитируются transport.SimulatedTransport. Запуск из корня проекта:
+
+    python -m benchmarks.loadtest --requests 500 --concurrency 50
+    python -m benchmarks.loadtest --requests 200 --concurrency 20 --latency 0.1 --jitter 0.05 --failure-rate 0.05
+    python -m benchmarks.loadtest --cached --requests 2000 --concurrency 100
+
+Без --cached кеш курсов и котировок очищается перед каждым запросом, чтобы каждый запрос
+доходил до транспорта; при параллельных запросах часть из них все равно может попасть в кеш соседа.
+"""
+
+import argparse
+import json
+import os
+import sys
+import tempfile
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Optional
+
+import numpy as np
+
+from src.dashboard import STOCK_SYMBOLS, run_dashboard
+from src.market_cache import clear_market_caches
+from src.quotes import NOT_AVAILABLE
+from src.store import DEFAULT_OPERATIONS_FILE
+from src.transport import DEFAULT_FIXTURES_DIR, ReplayTransport, SimulatedTransport, set_transport
+
+# Ключ для режима воспроизведения: в записи ответов ключ не входит
+REPLAY_API_KEY = "replay"
+
+
+def run_load_test(
+    file_path: str = DEFAULT_OPERATIONS_FILE,
+    requests: int = 100,
+    concurrency: int = 10,
+    user_request: Optional[str] = "такси",
+    fixtures_dir: str = DEFAULT_FIXTURES_DIR,
+    latency: float = 0.0,
+    jitter: float = 0.0,
+    failure_rate: float = 0.0,
+    cached: bool = False,
+    seed: Optional[int] = 0,
+) -> dict:
+    """
+    Запуск requests запросов главной страницы по concurrency одновременно.
+
+    Args:
+        file_path: Файл операций.
+        requests: Число запросов.
+        concurrency: Число одновременных запросов.
+        user_request: Поисковый запрос (None - без поиска).
+        fixtures_dir: Директория записанных ответов API.
+        latency: Задержка каждого запроса к API в секундах.
+        jitter: Случайная добавка к задержке до jitter секунд.
+        failure_rate: Доля запросов к API, завершающихся HTTP 503.
+        cached: Оставлять ли кеш курсов и котировок между запросами.
+        seed: Начальное значение генератора задержек и отказов.
+
+    Returns:
+        Метрики: время, запросы в секунду, процентили задержки (мс), число запросов с неполными
+        рыночными данными (degraded) и с исключениями (errors).
+    """
+    transport = SimulatedTransport(ReplayTransport(fixtures_dir), latency, jitter, failure_rate, seed)
+    previous_transport = set_transport(transport)
+    previous_key = os.environ.get("ALPHAVANTAGE_API_KEY")
+    os.environ["ALPHAVANTAGE_API_KEY"] = previous_key or REPLAY_API_KEY
+
+    timings: list = []
+    counters = {"degraded": 0, "errors": 0}
+    lock = threading.Lock()
+
+    with tempfile.TemporaryDirectory() as workdir:
+
+        def one_request(number: int) -> None:
+            if not cached:
+                clear_market_caches()
+            output_file = os.path.join(workdir, f"search_{threading.get_ident()}.json")
+            started = time.perf_counter()
+            try:
+                result = run_dashboard(file_path, user_request, output_file, None, STOCK_SYMBOLS)
+                prices = [quote["price"] for quote in result["stock_prices"]]
+                degraded = not result["currency_rates"] or len(prices) < len(STOCK_SYMBOLS) or NOT_AVAILABLE in prices
+                error = False
+            except Exception as e:
+                print(f"Запрос {number}: {e}", file=sys.stderr)
+                degraded, error = False, True
+            elapsed = time.perf_counter() - started
+            with lock:
+                timings.append(elapsed)
+                counters["degraded"] += degraded
+                counters["errors"] += error
+
+        try:
+            # Прогревочный запрос: разбор файла операций не входит в замер
+            run_dashboard(file_path, user_request, os.path.join(workdir, "warmup.json"), None, STOCK_SYMBOLS)
+            started = time.perf_counter()
+            with ThreadPoolExecutor(max_workers=concurrency) as executor:
+                list(executor.map(one_request, range(requests)))
+            seconds = time.perf_counter() - started
+        finally:
+            set_transport(previous_transport)
+            if previous_key is None:
+                del os.environ["ALPHAVANTAGE_API_KEY"]
+            else:
+                os.environ["ALPHAVANTAGE_API_KEY"] = previous_key
+            clear_market_caches()
+
+    latencies = np.array(timings) * 1000
+    return {
+        "requests": requests,
+        "concurrency": concurrency,
+        "seconds": round(seconds, 4),
+        "requests_per_second": round(requests / seconds, 1) if seconds else None,
+        "p50_ms": round(float(np.percentile(latencies, 50)), 2),
+        "p95_ms": round(float(np.percentile(latencies, 95)), 2),
+        "max_ms": round(float(latencies.max()), 2),
+        **counters,
+    }
+
+
+def main(argv: Optional[list] = None) -> int:
+    parser = argparse.ArgumentParser(description="Нагрузочный прогон главной страницы на записанных ответах API")
+    parser.add_argument("--file", default=DEFAULT_OPERATIONS_FILE, help="файл операций")
+    parser.add_argument("--requests", type=int, default=100, help="число запросов")
+    parser.add_argument("--concurrency", type=int, default=10, help="одновременных запросов")
+    parser.add_argument("--query", default="такси", help="поисковый запрос")
+    parser.add_argument("--fixtures", default=DEFAULT_FIXTURES_DIR, help="директория записанных ответов")
+    parser.add_argument("--latency", type=float, default=0.0, help="задержка запроса к API, с")
+    parser.add_argument("--jitter", type=float, default=0.0, help="случайная добавка к задержке, с")
+    parser.add_argument("--failure-rate", type=float, default=0.0, help="доля отказов API (HTTP 503)")
+    parser.add_argument("--cached", action="store_true", help="не очищать кеш курсов и котировок между запросами")
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args(argv)
+
+    results = run_load_test(
+        args.file,
+        args.requests,
+        args.concurrency,
+        args.query,
+        args.fixtures,
+        args.latency,
+        args.jitter,
+        args.failure_rate,
+        args.cached,
+        args.seed,
+    )
+    print(json.dumps(results, ensure_ascii=False, indent=2))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
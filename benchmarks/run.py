@@ -0,0 +1,333 @@
+"""
+Бенчмарки горячих путей анализа операций.
+
+Запуск из корня проекта:
+
+    python -m benchmarks.run --scales 10000 100000
+    python -m benchmarks.run --scales 10000 --save benchmarks/baseline.json
+    python -m benchmarks.run --scales 10000 --compare benchmarks/baseline.json --tolerance 0.25 --rss-tolerance 0.5
+
+С --compare процесс завершается с кодом 1, если какая-либо стадия медленнее базовой
+линии больше чем на tolerance или расходует больше памяти (прирост пика RSS) больше чем
+на rss-tolerance - это можно использовать как проверку перед релизом.
+
+Индексы, нужные стадиям поиска и отчетов, строятся до замера (см. stage(setup=...));
+время их построения замеряют отдельные стадии *_build.
+"""
+
+import argparse
+import json
+import os
+import sys
+import tempfile
+import time
+import tracemalloc
+from typing import Callable, Optional
+
+import pandas as pd
+
+from benchmarks.synthetic import generate_operations
+from src.analytics import run_analytics
+from src.chunked import iter_operation_batches
+from src.database import OperationsDatabase, build_database
+from src.date_index import CategoryDateIndex
+from src.fuzzy_search import FuzzyIndex
+from src.reports import select_transactions_by_category_and_date
+from src.schema import normalize_operations
+from src.search_index import SearchIndex
+from src.snapshot import read_snapshot, write_snapshot
+from src.utils import aggregate_cards
+
+DEFAULT_SCALES = [10_000, 100_000]
+SEARCH_QUERIES = ["магнит", "такси", "перевод", "кэшбэк", "food", "аптека", "а", "несуществующий запрос"]
+
+# Пик RSS процесса (VmHWM) сбрасывается записью "5" в clear_refs (Linux)
+PROC_STATUS = "/proc/self/status"
+PROC_CLEAR_REFS = "/proc/self/clear_refs"
+# Прирост RSS меньше этого порога считается шумом при сравнении с базовой линией
+RSS_NOISE_MB = 4.0
+
+# Стадия: функция (контекст) -> None; контекст готовится один раз на масштаб
+STAGES: dict = {}
+# Подготовка контекста стадии (построение индексов) вне замера: имя стадии -> функция (контекст) -> None
+STAGE_SETUP: dict = {}
+
+
+def stage(name: str, setup: Optional[Callable] = None) -> Callable:
+    """
+    Регистрация функции как стадии бенчмарка; setup вызывается перед замером стадии.
+    """
+
+    def register(func: Callable) -> Callable:
+        STAGES[name] = func
+        if setup is not None:
+            STAGE_SETUP[name] = setup
+        return func
+
+    return register
+
+
+def with_normalized(context: dict) -> None:
+    if "normalized_df" not in context:
+        context["normalized_df"] = normalize_operations(context["df"])
+
+
+def with_search_index(context: dict) -> None:
+    if "search_index" not in context:
+        context["search_index"] = SearchIndex(context["df"])
+
+
+def with_fuzzy_index(context: dict) -> None:
+    if "fuzzy_index" not in context:
+        context["fuzzy_index"] = FuzzyIndex(context["df"])
+
+
+def with_database(context: dict) -> None:
+    if "database" not in context:
+        bench_sqlite_build(context)
+
+
+def with_category_index(context: dict) -> None:
+    if "category_index" not in context:
+        context["category_index"] = CategoryDateIndex(context["df"])
+
+
+@stage("load_cache")
+def bench_load_cache(context: dict) -> None:
+    # Повторный запуск: операции читаются из дискового кеша хранилища (pickle)
+    pd.read_pickle(context["pickle_path"])
+
+
+@stage("load_snapshot")
+def bench_load_snapshot(context: dict) -> None:
+    # Снимок .npy: столбцы отображаются в память без чтения и копирования
+    read_snapshot(context["snapshot_path"])
+
+
+@stage("load_batches")
+def bench_load_batches(context: dict) -> None:
+    # Потоковое чтение порциями (режим для файлов, не помещающихся в память)
+    for _ in iter_operation_batches(context["csv_path"], batch_size=50_000):
+        pass
+
+
+@stage("search_index_build")
+def bench_search_index_build(context: dict) -> None:
+    context["search_index"] = SearchIndex(context["df"])
+
+
+@stage("search", setup=with_search_index)
+def bench_search(context: dict) -> None:
+    for query in SEARCH_QUERIES:
+        context["search_index"].search(query, limit=100)
+
+
+@stage("fuzzy_index_build")
+def bench_fuzzy_index_build(context: dict) -> None:
+    context["fuzzy_index"] = FuzzyIndex(context["df"])
+
+
+@stage("fuzzy_search", setup=with_fuzzy_index)
+def bench_fuzzy_search(context: dict) -> None:
+    for query in SEARCH_QUERIES:
+        context["fuzzy_index"].fuzzy_search(query, limit=100)
+
+
+@stage("sqlite_build", setup=with_normalized)
+def bench_sqlite_build(context: dict) -> None:
+    with_normalized(context)
+    db_path = os.path.join(os.path.dirname(context["pickle_path"]), f"operations_{context['rows']}.sqlite")
+    context["database"] = OperationsDatabase(build_database(context["normalized_df"], db_path))
+
+
+@stage("sqlite_search", setup=with_database)
+def bench_sqlite_search(context: dict) -> None:
+    for query in SEARCH_QUERIES:
+        context["database"].search(query, limit=100)
+
+
+@stage("card_summary")
+def bench_card_summary(context: dict) -> None:
+    aggregate_cards(context["df"])
+
+
+@stage("analytics", setup=with_normalized)
+def bench_analytics(context: dict) -> None:
+    # Все зарегистрированные отчеты аналитики по одному общему проходу (по операциям после load_operations)
+    run_analytics(context["normalized_df"])
+
+
+@stage("category_index_build")
+def bench_category_index_build(context: dict) -> None:
+    context["category_index"] = CategoryDateIndex(context["df"])
+
+
+@stage("category_report", setup=with_category_index)
+def bench_category_report(context: dict) -> None:
+    for category in ("Супермаркеты", "Транспорт", "Фастфуд"):
+        select_transactions_by_category_and_date(context["df"], category, "01.01.2023", index=context["category_index"])
+
+
+def prepare_context(rows: int, workdir: str, seed: int = 0) -> dict:
+    """
+    Генерация данных масштаба rows и файлов для стадий чтения.
+    """
+    df = generate_operations(rows, seed=seed)
+    pickle_path = os.path.join(workdir, f"operations_{rows}.pkl")
+    csv_path = os.path.join(workdir, f"operations_{rows}.csv")
+    df.to_pickle(pickle_path)
+    df.to_csv(csv_path, index=False)
+    snapshot_path = write_snapshot(normalize_operations(df), os.path.join(workdir, f"operations_{rows}.snapshot"))
+    return {"df": df, "rows": rows, "pickle_path": pickle_path, "csv_path": csv_path, "snapshot_path": snapshot_path}
+
+
+def read_memory_kb(field: str) -> Optional[int]:
+    """
+    Поле памяти процесса из /proc/self/status (VmRSS - текущий RSS, VmHWM - пик RSS) в килобайтах;
+    None - если /proc недоступен (не Linux).
+    """
+    try:
+        with open(PROC_STATUS, encoding="ascii") as f:
+            for line in f:
+                if line.startswith(f"{field}:"):
+                    return int(line.split()[1])
+    except OSError:
+        pass
+    return None
+
+
+def reset_peak_rss() -> bool:
+    """
+    Сброс пика RSS процесса (VmHWM), чтобы пик относился только к следующей стадии.
+
+    Returns:
+        False, если сброс недоступен (не Linux или нет прав).
+    """
+    try:
+        with open(PROC_CLEAR_REFS, "w", encoding="ascii") as f:
+            f.write("5")
+        return True
+    except OSError:
+        return False
+
+
+def measure(func: Callable, context: dict, repeat: int) -> dict:
+    """
+    Лучшее время из repeat запусков, пик RSS во время этих запусков и пик выделенной памяти
+    (tracemalloc) отдельным запуском.
+
+    Пик RSS стадии - VmHWM после сброса перед стадией (см. reset_peak_rss), а не пик всего процесса;
+    rss_growth_mb - его прирост над RSS на начало стадии. Без /proc обе метрики - None.
+    """
+    rss_before = read_memory_kb("VmRSS")
+    peak_reset = reset_peak_rss()
+    timings = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        func(context)
+        timings.append(time.perf_counter() - started)
+    peak_rss = read_memory_kb("VmHWM") if peak_reset else None
+
+    tracemalloc.start()
+    func(context)
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    seconds = min(timings)
+    return {
+        "seconds": round(seconds, 6),
+        "rows_per_second": round(context["rows"] / seconds) if seconds else None,
+        "peak_alloc_mb": round(peak / 2**20, 2),
+        "peak_rss_mb": round(peak_rss / 1024, 1) if peak_rss is not None else None,
+        "rss_growth_mb": round(max(peak_rss - rss_before, 0) / 1024, 1) if peak_rss is not None and rss_before is not None else None,
+    }
+
+
+def run_benchmarks(scales: list, stages: Optional[list] = None, repeat: int = 3, seed: int = 0) -> dict:
+    """
+    Запуск стадий на каждом масштабе.
+
+    Args:
+        scales: Числа строк синтетических данных.
+        stages: Имена стадий (None - все зарегистрированные).
+        repeat: Число повторов для замера времени.
+        seed: Начальное значение генератора данных.
+
+    Returns:
+        Словарь "стадия@строки" -> метрики (seconds, rows_per_second, peak_alloc_mb, peak_rss_mb, rss_growth_mb).
+    """
+    results = {}
+    with tempfile.TemporaryDirectory() as workdir:
+        for rows in scales:
+            context = prepare_context(rows, workdir, seed)
+            for name in stages or list(STAGES):
+                if name in STAGE_SETUP:
+                    STAGE_SETUP[name](context)
+                results[f"{name}@{rows}"] = measure(STAGES[name], context, repeat)
+                print(f"{name}@{rows}: {results[f'{name}@{rows}']}", file=sys.stderr)
+    return results
+
+
+def compare_with_baseline(results: dict, baseline: dict, tolerance: float, rss_tolerance: Optional[float] = None) -> list:
+    """
+    Стадии, которые медленнее базовой линии больше чем на tolerance (доля) или чей прирост
+    пика RSS больше базового больше чем на rss_tolerance (доля, плюс RSS_NOISE_MB на шум).
+
+    Args:
+        results: Результаты run_benchmarks.
+        baseline: Базовая линия в том же формате.
+        tolerance: Допустимое замедление.
+        rss_tolerance: Допустимый рост памяти (None - память не сравнивается). Стадии без
+            rss_growth_mb в результатах или в базовой линии по памяти не сравниваются.
+
+    Returns:
+        Список строк с описанием регрессий (пустой - регрессий нет).
+    """
+    regressions = []
+    for key, metrics in results.items():
+        if key not in baseline:
+            continue
+        limit = baseline[key]["seconds"] * (1 + tolerance)
+        if metrics["seconds"] > limit:
+            regressions.append(f"{key}: {metrics['seconds']:.4f} с > {limit:.4f} с (база {baseline[key]['seconds']:.4f} с)")
+
+        growth, base_growth = metrics.get("rss_growth_mb"), baseline[key].get("rss_growth_mb")
+        if rss_tolerance is None or growth is None or base_growth is None:
+            continue
+        rss_limit = base_growth * (1 + rss_tolerance) + RSS_NOISE_MB
+        if growth > rss_limit:
+            regressions.append(f"{key}: прирост RSS {growth:.1f} МБ > {rss_limit:.1f} МБ (база {base_growth:.1f} МБ)")
+    return regressions
+
+
+def main(argv: Optional[list] = None) -> int:
+    parser = argparse.ArgumentParser(description="Бенчмарки анализа операций")
+    parser.add_argument("--scales", type=int, nargs="+", default=DEFAULT_SCALES, help="числа строк (10000 ... 10000000)")
+    parser.add_argument("--stages", nargs="+", choices=sorted(STAGES), help="стадии (по умолчанию все)")
+    parser.add_argument("--repeat", type=int, default=3, help="повторов для замера времени")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--save", help="сохранить результаты как базовую линию")
+    parser.add_argument("--compare", help="сравнить с базовой линией из файла")
+    parser.add_argument("--tolerance", type=float, default=0.25, help="допустимое замедление (доля)")
+    parser.add_argument("--rss-tolerance", type=float, default=0.25, help="допустимый рост пика RSS стадии (доля)")
+    args = parser.parse_args(argv)
+
+    results = run_benchmarks(args.scales, args.stages, args.repeat, args.seed)
+    print(json.dumps(results, ensure_ascii=False, indent=2))
+
+    if args.save:
+        with open(args.save, "w", encoding="utf-8") as f:
+            json.dump(results, f, ensure_ascii=False, indent=2)
+
+    if args.compare:
+        with open(args.compare, encoding="utf-8") as f:
+            baseline = json.load(f)
+        regressions = compare_with_baseline(results, baseline, args.tolerance, args.rss_tolerance)
+        for regression in regressions:
+            print(f"Регрессия: {regression}", file=sys.stderr)
+        return 1 if regressions else 0
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,115 @@
+import numpy as np
+import pandas as pd
+
+# Категории с MCC, весами и типичными описаниями, по мотивам выгрузки банка (data/operations.xls)
+CATEGORIES = [
+    ("Супермаркеты", 5411, 0.22, ["Магнит", "Пятёрочка", "Перекресток", "Лента", "Дикси", "ВкусВилл", "Ашан"]),
+    ("Транспорт", 4131, 0.18, ["Единая транспортная карта (etk21)", "Метро Санкт-Петербург", "Яндекс Такси"]),
+    ("Переводы", None, 0.12, ["Владимиров А.", "Александр В.", "Светлана Т.", "Константин Л.", "Иван С."]),
+    ("Фастфуд", 5814, 0.08, ["Wilco Food", "Бургер Кинг", "KFC", "Вкусно и точка", "Теремок"]),
+    ("Рестораны", 5812, 0.05, ["Дикий лось", "Шоколадница", "Тануки", "Кофемания"]),
+    ("Различные товары", 5399, 0.06, ["Fix Price", "Ozon.ru", "Wildberries", "Яндекс Маркет"]),
+    ("Мобильная связь", 4814, 0.03, ["Билайн +7 967 791-67-01", "МТС Mobile +7 921 555-12-34", "Мегафон"]),
+    ("Аптеки", 5912, 0.04, ["Аптека Вита", "Аптека Апрель", "Ригла"]),
+    ("Одежда и обувь", 5651, 0.03, ["Спортмастер", "Gloria Jeans", "ZARA"]),
+    ("Каршеринг", 7512, 0.03, ["Ситидрайв", "Яндекс Драйв", "Делимобиль"]),
+    ("Топливо", 5541, 0.04, ["Лукойл", "Роснефть", "Газпромнефть"]),
+    ("Услуги банка", 9999, 0.02, ["Плата за оповещения об операциях", "Обслуживание карты"]),
+    ("Красота", 7230, 0.02, ["Барбершоп Борода", "Салон красоты Лотос"]),
+    ("Развлечения", 7832, 0.03, ["Кинотеатр Формула Кино", "Яндекс Афиша", "Боулинг Космик"]),
+    ("Бонусы", None, 0.02, ["Кэшбэк за обычные покупки", "Выплата по акции"]),
+    ("Овощи и фрукты", 5499, 0.03, ["Овощная лавка", "Фермерский рынок"]),
+]
+
+COLUMNS = [
+    "date_operation",
+    "data_payment",
+    "card_number",
+    "status",
+    "transaction_amount",
+    "currency_operation",
+    "payment_amount",
+    "payment_currency",
+    "cashback",
+    "category",
+    "MCC",
+    "description",
+    "bonuses_including_cashback",
+    "rounding_investment_bank",
+    "amount_rounding_operation",
+]
+
+
+def generate_operations(
+    rows: int, cards: int = 12, seed: int = 0, start: str = "2018-01-01", end: str = "2024-06-05"
+) -> pd.DataFrame:
+    """
+    Синтетическая выгрузка операций в формате data/operations.xls.
+
+    Номера карт распределены по закону Ципфа (одна-две основные карты, остальные редкие),
+    около 7% операций без карты, категории и описания - по весам CATEGORIES, суммы - логнормальные
+    траты с редкими поступлениями (переводы, бонусы), около 4% операций без даты платежа.
+    Строки упорядочены по убыванию времени операции, как в выгрузке банка.
+
+    Args:
+        rows: Число операций.
+        cards: Число карт.
+        seed: Начальное значение генератора случайных чисел.
+        start: Начало периода операций.
+        end: Конец периода операций.
+
+    Returns:
+        DataFrame с колонками COLUMNS.
+    """
+    rng = np.random.default_rng(seed)
+
+    card_numbers = np.array([f"*{number:04d}" for number in rng.choice(10000, size=cards, replace=False)], dtype=object)
+    card_weights = 1.0 / np.arange(1, cards + 1) ** 1.5
+    card_column = card_numbers[rng.choice(cards, size=rows, p=card_weights / card_weights.sum())]
+    card_column[rng.random(rows) < 0.07] = None
+
+    weights = np.array([category[2] for category in CATEGORIES])
+    category_codes = rng.choice(len(CATEGORIES), size=rows, p=weights / weights.sum())
+    category_names = np.array([category[0] for category in CATEGORIES], dtype=object)
+    mcc_values = np.array([np.nan if category[1] is None else category[1] for category in CATEGORIES])
+
+    descriptions = np.empty(rows, dtype=object)
+    for code, (_, _, _, merchants) in enumerate(CATEGORIES):
+        selected = np.flatnonzero(category_codes == code)
+        merchant_weights = 1.0 / np.arange(1, len(merchants) + 1)
+        merchant_index = rng.choice(len(merchants), size=len(selected), p=merchant_weights / merchant_weights.sum())
+        descriptions[selected] = np.array(merchants, dtype=object)[merchant_index]
+
+    amounts = -np.round(rng.lognormal(mean=5.5, sigma=1.2, size=rows), 2)
+    incoming = np.isin(category_names[category_codes], ["Переводы", "Бонусы"]) & (rng.random(rows) < 0.5)
+    amounts[incoming] = -amounts[incoming]
+
+    start_ns = pd.Timestamp(start).value
+    end_ns = pd.Timestamp(end).value
+    timestamps = pd.to_datetime(np.sort(rng.integers(start_ns, end_ns, size=rows))[::-1])
+    payment_dates = timestamps.strftime("%d.%m.%Y").to_numpy(dtype=object)
+    payment_dates[rng.random(rows) < 0.04] = None
+
+    status = np.where(rng.random(rows) < 0.03, "FAILED", "OK")
+    rounding = np.where(amounts < 0, np.ceil(-amounts / 10) * 10 + amounts, 0.0)
+
+    return pd.DataFrame(
+        {
+            "date_operation": timestamps.strftime("%d.%m.%Y %H:%M:%S"),
+            "data_payment": payment_dates,
+            "card_number": card_column,
+            "status": status,
+            "transaction_amount": amounts,
+            "currency_operation": "RUB",
+            "payment_amount": amounts,
+            "payment_currency": "RUB",
+            "cashback": np.where(rng.random(rows) < 0.05, np.floor(-amounts / 100), np.nan),
+            "category": category_names[category_codes],
+            "MCC": mcc_values[category_codes],
+            "description": descriptions,
+            "bonuses_including_cashback": np.maximum(np.floor(-amounts / 100), 0).astype(np.int64),
+            "rounding_investment_bank": 0,
+            "amount_rounding_operation": np.round(np.abs(amounts) + rounding, 2),
+        },
+        columns=COLUMNS,
+    )
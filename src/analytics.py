@@ -0,0 +1,252 @@
+import logging
+from datetime import datetime
+from typing import Callable, Iterable, Iterator, Optional
+
+import numpy as np
+import pandas as pd
+
+from src.date_index import parse_dates
+from src.instrumentation import annotate, instrumented
+from src.money import split_spending, to_kopecks, to_rubles
+from src.reports import REPORT_PERIOD_DAYS, report_period
+from src.schema import DATE_FORMATS, parse_datetimes
+from src.store import DEFAULT_OPERATIONS_FILE, load_operations
+from src.writers import FORMAT_JSON, write_json_stream
+
+logger = logging.getLogger(__name__)
+
+WEEKDAYS = ("Понедельник", "Вторник", "Среда", "Четверг", "Пятница", "Суббота", "Воскресенье")
+
+# Число записей в отчетах-рейтингах по умолчанию
+DEFAULT_TOP_N = 10
+
+# Отчет: функция (SpendingScan) -> список записей; все отчеты считаются по одному проходу SpendingScan
+ANALYTICS: dict = {}
+
+
+def analytics_report(name: str) -> Callable:
+    """
+    Регистрация функции как отчета аналитики трат.
+    """
+
+    def register(func: Callable) -> Callable:
+        ANALYTICS[name] = func
+        return func
+
+    return register
+
+
+def _sum_by(codes: np.ndarray, values: np.ndarray, size: int) -> np.ndarray:
+    """
+    Целочисленные суммы значений по кодам групп (коды < 0 пропускаются).
+    """
+    sums = np.zeros(size, dtype=np.int64)
+    valid = codes >= 0
+    np.add.at(sums, codes[valid], values[valid])
+    return sums
+
+
+class SpendingScan:
+    """
+    Общий проход по операциям для всех отчетов аналитики.
+
+    Один раз за запуск операции отбираются по периоду (дата платежа в [start, end)), суммы
+    переводятся в копейки и делятся на траты и поступления, из даты операции вычисляются
+    день недели и час, категории, описания и карты кодируются целыми числами.
+    Отчеты затем только группируют готовые массивы (np.add.at по кодам), не обращаясь к строкам.
+    """
+
+    def __init__(
+        self, df: pd.DataFrame, start: Optional[datetime] = None, end: Optional[datetime] = None, top_n: int = DEFAULT_TOP_N
+    ) -> None:
+        self.top_n = top_n
+        size = len(df)
+
+        def column(name: str) -> pd.Series:
+            return df[name] if name in df.columns else pd.Series([None] * size, dtype=object)
+
+        mask = np.ones(size, dtype=bool)
+        if start is not None or end is not None:
+            payment_dates = parse_dates(column("data_payment"))
+            mask &= ~np.isnat(payment_dates)
+            if start is not None:
+                mask &= payment_dates >= np.datetime64(pd.Timestamp(start))
+            if end is not None:
+                mask &= payment_dates < np.datetime64(pd.Timestamp(end))
+        self.rows = int(mask.sum())
+
+        kopecks = to_kopecks(column("transaction_amount"))[mask]
+        self.spent, self.refunds = split_spending(kopecks)
+        self.spending = self.spent > 0
+
+        if "date_operation" in df.columns:
+            operation_dates = parse_datetimes(df["date_operation"], DATE_FORMATS["date_operation"])
+            moments = operation_dates.to_numpy(dtype="datetime64[ns]")[mask]
+            known = ~np.isnat(moments)
+            days = moments.astype("datetime64[D]").astype(np.int64)
+            # 01.01.1970 - четверг (день 3, если понедельник - 0)
+            self.weekday = np.where(known, (days + 3) % 7, -1)
+            self.hour = np.where(known, moments.astype("datetime64[h]").astype(np.int64) % 24, -1)
+        else:
+            self.weekday = self.hour = np.full(self.rows, -1, dtype=np.int64)
+
+        self.category_codes, self.categories = self._factorize(column("category"), mask)
+        self.merchant_codes, self.merchants = self._factorize(column("description"), mask)
+        self.card_codes, self.cards = self._factorize(column("card_number"), mask)
+
+    @staticmethod
+    def _factorize(values: pd.Series, mask: np.ndarray) -> tuple:
+        codes, uniques = pd.factorize(values[mask])
+        return np.asarray(codes, dtype=np.int64), list(uniques)
+
+    def group(self, codes: np.ndarray, size: int) -> tuple:
+        """
+        Траты (копейки) и число операций-трат по группам.
+        """
+        spent = _sum_by(codes, self.spent, size)
+        counts = _sum_by(codes, self.spending.astype(np.int64), size)
+        return spent, counts
+
+
+def _average(spent: int, count: int) -> float:
+    return round(to_rubles(spent) / count, 2) if count else 0.0
+
+
+@analytics_report("by_category")
+def by_category(scan: SpendingScan) -> list:
+    """
+    Траты по категориям по убыванию суммы, с долей от всех трат периода (в процентах).
+    """
+    spent, counts = scan.group(scan.category_codes, len(scan.categories))
+    total = int(spent.sum())
+    order = np.argsort(-spent, kind="stable")
+    return [
+        {
+            "category": scan.categories[code],
+            "spent": to_rubles(spent[code]),
+            "count": int(counts[code]),
+            "share": round(100 * int(spent[code]) / total, 2) if total else 0.0,
+        }
+        for code in order
+        if counts[code]
+    ]
+
+
+@analytics_report("by_weekday")
+def by_weekday(scan: SpendingScan) -> list:
+    """
+    Траты по дням недели (по дате операции), с понедельника.
+    """
+    spent, counts = scan.group(scan.weekday, len(WEEKDAYS))
+    return [
+        {
+            "weekday": name,
+            "spent": to_rubles(spent[day]),
+            "count": int(counts[day]),
+            "average": _average(spent[day], counts[day]),
+        }
+        for day, name in enumerate(WEEKDAYS)
+    ]
+
+
+@analytics_report("by_hour")
+def by_hour(scan: SpendingScan) -> list:
+    """
+    Траты по часам суток (по времени операции).
+    """
+    spent, counts = scan.group(scan.hour, 24)
+    return [{"hour": hour, "spent": to_rubles(spent[hour]), "count": int(counts[hour])} for hour in range(24)]
+
+
+@analytics_report("top_merchants")
+def top_merchants(scan: SpendingScan) -> list:
+    """
+    top_n получателей (описаний операций) с наибольшими тратами; при равных тратах - по первому появлению.
+    """
+    spent, counts = scan.group(scan.merchant_codes, len(scan.merchants))
+    order = np.argsort(-spent, kind="stable")[: scan.top_n]
+    return [
+        {"merchant": scan.merchants[code], "spent": to_rubles(spent[code]), "count": int(counts[code])}
+        for code in order
+        if spent[code] > 0
+    ]
+
+
+def run_analytics(
+    df: pd.DataFrame,
+    reports: Optional[Iterable[str]] = None,
+    start: Optional[datetime] = None,
+    end: Optional[datetime] = None,
+    top_n: int = DEFAULT_TOP_N,
+) -> dict:
+    """
+    Расчет нескольких отчетов аналитики по одному общему проходу по операциям.
+
+    Args:
+        df: Операции.
+        reports: Имена отчетов из ANALYTICS (по умолчанию - все).
+        start: Начало периода по дате платежа (включительно), None - без ограничения.
+        end: Конец периода (не включительно), None - без ограничения.
+        top_n: Число записей в рейтингах.
+
+    Returns:
+        Словарь имя отчета -> список записей.
+
+    Raises:
+        ValueError: Если отчет с таким именем не зарегистрирован.
+    """
+    names = list(ANALYTICS) if reports is None else list(reports)
+    unknown = [name for name in names if name not in ANALYTICS]
+    if unknown:
+        raise ValueError(f"Неизвестные отчеты: {', '.join(unknown)}; доступны: {', '.join(ANALYTICS)}")
+    scan = SpendingScan(df, start, end, top_n)
+    logger.info("Аналитика трат: %s операций, отчеты: %s", scan.rows, ", ".join(names))
+    return {name: ANALYTICS[name](scan) for name in names}
+
+
+def iter_analytics_records(results: dict) -> Iterator[dict]:
+    """
+    Записи отчетов одним потоком: к каждой записи добавляется имя отчета в поле "report".
+    """
+    for name, records in results.items():
+        for record in records:
+            yield {"report": name, **record}
+
+
+@instrumented()
+def write_analytics_report(
+    file_path: str = DEFAULT_OPERATIONS_FILE,
+    output_file: str = "analytics.json",
+    reports: Optional[Iterable[str]] = None,
+    start_date: Optional[str] = None,
+    days: int = REPORT_PERIOD_DAYS,
+    end_date: Optional[str] = None,
+    top_n: int = DEFAULT_TOP_N,
+    output_format: str = FORMAT_JSON,
+    indent: Optional[int] = 4,
+    compress: bool = False,
+) -> int:
+    """
+    Запись отчетов аналитики трат в файл в формате main_reports (JSON-массив записей).
+
+    Каждая запись содержит имя отчета в поле "report"; output_format, indent и compress -
+    как у main_reports (см. writers.write_json_stream).
+
+    Args:
+        file_path: Путь к файлу операций.
+        output_file: Путь к файлу результатов.
+        reports: Имена отчетов (по умолчанию - все зарегистрированные).
+        start_date: Дата начала периода DD.MM.YYYY (None - все операции).
+        days: Длина периода в днях, если не задан end_date.
+        end_date: Дата конца периода DD.MM.YYYY (не включительно).
+        top_n: Число записей в рейтингах.
+
+    Returns:
+        Число записанных записей.
+    """
+    start, end = report_period(start_date, days, end_date) if start_date else (None, None)
+    results = run_analytics(load_operations(file_path), reports, start, end, top_n)
+    rows = write_json_stream(iter_analytics_records(results), output_file, output_format, indent, compress)
+    annotate(rows=rows)
+    logger.info(f"Отчеты аналитики записаны в файл {output_file}")
+    return rows
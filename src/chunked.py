@@ -0,0 +1,101 @@
+import logging
+import os
+from typing import Any, Iterator
+
+import pandas as pd
+
+from src.schema import normalize_operations
+from src.snapshot import is_snapshot, read_snapshot
+
+logger = logging.getLogger(__name__)
+
+# Размер порции строк по умолчанию
+DEFAULT_BATCH_SIZE = 50000
+
+
+def _rows_to_frame(header: list, rows: list) -> pd.DataFrame:
+    """
+    Порция строк в виде DataFrame; пустые ячейки становятся NaN, как у pd.read_excel.
+    """
+    df = pd.DataFrame.from_records(rows, columns=header)
+    return df.mask(df.eq("")).infer_objects()
+
+
+def _iter_xlsx_rows(file_path: str) -> Iterator[tuple]:
+    """
+    Строки листа .xlsx в режиме только для чтения openpyxl (без загрузки книги в память).
+    """
+    from openpyxl import load_workbook
+
+    workbook = load_workbook(file_path, read_only=True, data_only=True)
+    try:
+        yield from workbook.worksheets[0].iter_rows(values_only=True)
+    finally:
+        workbook.close()
+
+
+def _iter_xls_rows(file_path: str) -> Iterator[list]:
+    """
+    Строки листа .xls через xlrd; ячейки-даты преобразуются в datetime.
+    """
+    import xlrd
+
+    workbook = xlrd.open_workbook(file_path, on_demand=True)
+    try:
+        sheet = workbook.sheet_by_index(0)
+        for row_index in range(sheet.nrows):
+            row = []
+            for cell in sheet.row(row_index):
+                if cell.ctype == xlrd.XL_CELL_DATE:
+                    row.append(xlrd.xldate_as_datetime(cell.value, workbook.datemode))
+                else:
+                    row.append(cell.value)
+            yield row
+    finally:
+        workbook.release_resources()
+
+
+def iter_operation_batches(file_path: str, batch_size: int = DEFAULT_BATCH_SIZE) -> Iterator[pd.DataFrame]:
+    """
+    Потоковое чтение файла операций порциями по batch_size строк.
+
+    Поддерживаются .csv (pd.read_csv с chunksize), .xlsx (openpyxl в режиме read-only),
+    .xls (xlrd; строки преобразуются в DataFrame порциями), снимок (см. snapshot.py; порции -
+    срезы отображенных в память столбцов, без копирования) и объединенное хранилище .pkl (см. ingest.py;
+    оно читается целиком, порции - срезы). Первая строка таблиц - заголовок.
+    В памяти одновременно находится одна порция, а не вся книга и ее копия в виде словарей.
+    Каждая порция приводится к канонической схеме (см. schema.normalize_operations), как при load_operations.
+
+    Args:
+        file_path: Путь к файлу операций.
+        batch_size: Число строк в порции.
+
+    Yields:
+        DataFrame с очередной порцией операций.
+    """
+    extension = os.path.splitext(str(file_path))[1].lower()
+    if is_snapshot(file_path) or extension == ".pkl":
+        # Снимок отображается в память, объединенное хранилище (см. ingest.py) читается целиком
+        df = read_snapshot(file_path) if is_snapshot(file_path) else normalize_operations(pd.read_pickle(file_path))
+        for start in range(0, len(df), batch_size):
+            yield df.iloc[start : start + batch_size]
+        return
+
+    if extension == ".csv":
+        for batch in pd.read_csv(file_path, chunksize=batch_size):
+            yield normalize_operations(batch)
+        return
+
+    rows_iter: Iterator[Any] = _iter_xls_rows(file_path) if extension == ".xls" else _iter_xlsx_rows(file_path)
+    header = next(rows_iter, None)
+    if header is None:
+        return
+    header = list(header)
+    rows: list = []
+    for row in rows_iter:
+        rows.append(row)
+        if len(rows) >= batch_size:
+            yield normalize_operations(_rows_to_frame(header, rows))
+            rows = []
+    if rows:
+        yield normalize_operations(_rows_to_frame(header, rows))
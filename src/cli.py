@@ -0,0 +1,260 @@
+"""
+Командная строка анализа операций.
+
+Запуск из корня проекта:
+
+    python -m src.cli summary --date 20.05.2024
+    python -m src.cli search такси --limit 10
+    python -m src.cli report Супермаркеты 01.01.2024 --days 90
+    python -m src.cli analytics --reports by_weekday top_merchants --start-date 01.01.2024
+    python -m src.cli fetch-rates
+
+Тяжелые зависимости (pandas, requests) импортируются только внутри команд. Результаты команд,
+выводимые в stdout, кешируются в JSON рядом с кешем операций и привязаны к версии файла
+(mtime и размер); повторный вызов с теми же аргументами отдается из кеша без импорта pandas.
+"""
+
+import argparse
+import hashlib
+import json
+import os
+import sys
+import time
+from datetime import datetime
+from typing import Any, Optional
+
+from src.greeting import get_greeting
+from src.paths import DEFAULT_OPERATIONS_FILE, get_cache_dir, source_key
+
+DATE_FORMAT = "%d.%m.%Y"
+
+# Источники данных поиска и отчетов (см. database.BACKENDS; модуль не импортируется, чтобы не загружать pandas)
+BACKEND_CHOICES = ("memory", "sqlite")
+
+
+def result_cache_path(file_path: str, key: dict) -> str:
+    """
+    Путь к кешированному результату команды.
+    """
+    digest = hashlib.sha1(json.dumps(key, sort_keys=True, ensure_ascii=False).encode("utf-8")).hexdigest()
+    return os.path.join(get_cache_dir(file_path), "cli", f"{digest}.json")
+
+
+def read_cached_result(file_path: str, key: dict) -> Any:
+    """
+    Результат команды из кеша или None (нет записи, другая версия файла или истек срок).
+    """
+    try:
+        with open(result_cache_path(file_path, key), encoding="utf-8") as f:
+            entry = json.load(f)
+    except (OSError, ValueError):
+        return None
+    if entry.get("key") != key or (entry.get("expires") is not None and entry["expires"] < time.time()):
+        return None
+    return entry.get("result")
+
+
+def write_cached_result(file_path: str, key: dict, result: Any, ttl: Optional[float] = None) -> None:
+    """
+    Сохранение результата команды в кеш (запись атомарная, ошибки записи игнорируются).
+    """
+    path = result_cache_path(file_path, key)
+    entry = {"key": key, "expires": time.time() + ttl if ttl else None, "result": result}
+    try:
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        with open(path + ".tmp", "w", encoding="utf-8") as f:
+            json.dump(entry, f, ensure_ascii=False, default=str)
+        os.replace(path + ".tmp", path)
+    except OSError:
+        pass
+
+
+def command_summary(args: argparse.Namespace) -> Any:
+    from src.utils import get_card_summary
+
+    analysis_date = datetime.strptime(args.date, DATE_FORMAT) if args.date else None
+    result = get_card_summary(
+        args.file,
+        analysis_date,
+        currency_rates=[] if args.no_rates else None,
+        batch_size=args.batch_size,
+        incremental=args.incremental,
+    )
+    result.pop("greeting", None)
+    return result
+
+
+def command_search(args: argparse.Namespace) -> Any:
+    if args.output:
+        from src.services import simple_search
+
+        simple_search(args.query, args.file, args.output, args.limit, fuzzy=args.fuzzy, backend=args.backend)
+        return {"output_file": args.output}
+
+    from src.writers import iter_records
+
+    if args.backend == "sqlite" and not args.fuzzy:
+        from src.services import read_database_search
+
+        return list(iter_records(read_database_search(args.file, args.query, args.limit)))
+
+    from src.services import read_search_index
+
+    transactions, index = read_search_index(args.file, fuzzy=args.fuzzy)
+    positions = index.fuzzy_search(args.query, args.limit) if args.fuzzy else index.search(args.query, args.limit)
+    return transactions.to_records(positions)
+
+
+def command_report(args: argparse.Namespace) -> Any:
+    from src.reports import write_category_report
+
+    if args.output:
+        rows = write_category_report(
+            args.category, args.start_date, args.file, args.output, days=args.days, backend=args.backend
+        )
+        return {"output_file": args.output, "rows": rows}
+
+    from src.reports import read_category_date_index, read_transactions_xlsx, report_period
+    from src.writers import iter_records
+
+    start, end = report_period(args.start_date, args.days)
+    if args.backend == "sqlite":
+        from src.database import load_database
+
+        return list(iter_records(load_database(args.file).select_category(args.category, start, end)))
+    operations = read_transactions_xlsx(args.file)
+    index = read_category_date_index(args.file, operations)
+    return list(iter_records(operations, index.select(args.category, start, end)))
+
+
+def command_analytics(args: argparse.Namespace) -> Any:
+    if args.output:
+        from src.analytics import write_analytics_report
+
+        rows = write_analytics_report(args.file, args.output, args.reports, args.start_date, args.days, top_n=args.top)
+        return {"output_file": args.output, "rows": rows}
+
+    from src.analytics import iter_analytics_records, run_analytics
+    from src.reports import read_transactions_xlsx, report_period
+
+    start, end = report_period(args.start_date, args.days) if args.start_date else (None, None)
+    results = run_analytics(read_transactions_xlsx(args.file), args.reports, start, end, args.top)
+    return list(iter_analytics_records(results))
+
+
+def command_fetch_rates(args: argparse.Namespace) -> Any:
+    from src.utils import get_currency_rate, get_stock_prices
+
+    result: dict = {"currency_rates": get_currency_rate()}
+    if args.stocks:
+        result["stock_prices"] = get_stock_prices(args.stocks)
+    return result
+
+
+def build_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(prog="python -m src.cli", description="Анализ банковских операций")
+    parser.add_argument("--file", default=DEFAULT_OPERATIONS_FILE, help="файл операций")
+    parser.add_argument("--no-cache", action="store_true", help="не использовать кеш результатов команд")
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    summary = commands.add_parser("summary", help="сводка по картам и топ операций")
+    summary.add_argument("--date", help="дата анализа DD.MM.YYYY: операции с начала ее месяца (по умолчанию - все)")
+    summary.add_argument("--no-rates", action="store_true", help="без запроса курсов валют")
+    summary.add_argument("--batch-size", type=int, help="читать файл порциями по столько строк")
+    summary.add_argument("--incremental", action="store_true", help="обрабатывать только новые операции")
+    summary.set_defaults(handler=command_summary)
+
+    search = commands.add_parser("search", help="поиск по описанию и категории")
+    search.add_argument("query")
+    search.add_argument("--limit", type=int)
+    search.add_argument("--fuzzy", action="store_true", help="нечеткий поиск (словоформы и опечатки)")
+    search.add_argument("--output", help="записать результат в файл вместо stdout")
+    search.add_argument("--backend", choices=BACKEND_CHOICES, default="memory", help="индекс в памяти или база SQLite")
+    search.set_defaults(handler=command_search)
+
+    report = commands.add_parser("report", help="траты по категории за период")
+    report.add_argument("category")
+    report.add_argument("start_date", help="дата начала периода DD.MM.YYYY")
+    report.add_argument("--days", type=int, default=90)
+    report.add_argument("--output", help="записать результат в файл вместо stdout")
+    report.add_argument("--backend", choices=BACKEND_CHOICES, default="memory", help="индекс в памяти или база SQLite")
+    report.set_defaults(handler=command_report)
+
+    analytics = commands.add_parser("analytics", help="траты по категориям, дням недели, часам и топ получателей")
+    analytics.add_argument("--reports", nargs="+", help="by_category, by_weekday, by_hour, top_merchants (по умолчанию - все)")
+    analytics.add_argument("--start-date", help="дата начала периода DD.MM.YYYY (по умолчанию - все операции)")
+    analytics.add_argument("--days", type=int, default=90)
+    analytics.add_argument("--top", type=int, default=10, help="число записей в рейтингах")
+    analytics.add_argument("--output", help="записать результат в файл вместо stdout")
+    analytics.set_defaults(handler=command_analytics)
+
+    rates = commands.add_parser("fetch-rates", help="курсы валют ЦБ (и цены акций с --stocks)")
+    rates.add_argument("--stocks", nargs="*", help="тикеры акций")
+    rates.set_defaults(handler=command_fetch_rates)
+    return parser
+
+
+def cache_key(args: argparse.Namespace) -> Optional[dict]:
+    """
+    Ключ кеша результата команды: аргументы и версия файла операций.
+
+    Returns:
+        Словарь-ключ или None, если результат не кешируется (запись в файл, файл операций недоступен).
+    """
+    if args.no_cache or getattr(args, "output", None):
+        return None
+    arguments = {
+        name: value for name, value in vars(args).items() if name not in ("handler", "no_cache", "file")
+    }
+    if args.command == "fetch-rates":
+        return {"arguments": arguments}
+    version = source_key(args.file)
+    if version is None:
+        return None
+    return {"arguments": arguments, "source": list(version)}
+
+
+def result_ttl(args: argparse.Namespace) -> Optional[float]:
+    """
+    Срок жизни результата: ограничен, если в нем есть курсы валют или цены акций.
+    """
+    from src.market_cache import CURRENCY_RATES_TTL, STOCK_QUOTES_TTL
+
+    if args.command == "fetch-rates":
+        return STOCK_QUOTES_TTL if args.stocks else CURRENCY_RATES_TTL
+    if args.command == "summary" and not args.no_rates:
+        return CURRENCY_RATES_TTL
+    return None
+
+
+def is_cacheable(args: argparse.Namespace, result: Any) -> bool:
+    """
+    Можно ли кешировать результат: пустые курсы или цены означают сбой источника
+    (сеть, ключ API), и такой результат не должен отдаваться до истечения срока жизни.
+    """
+    if not isinstance(result, dict):
+        return True
+    if "currency_rates" in result and not result["currency_rates"] and not getattr(args, "no_rates", False):
+        return False
+    return not ("stock_prices" in result and not result["stock_prices"] and getattr(args, "stocks", None))
+
+
+def main(argv: Optional[list] = None) -> int:
+    args = build_parser().parse_args(argv)
+    key = cache_key(args)
+    result = read_cached_result(args.file, key) if key is not None else None
+    if result is None:
+        import logging
+
+        logging.basicConfig(level=logging.WARNING, format="%(asctime)s - %(levelname)s - %(message)s")
+        result = args.handler(args)
+        if key is not None and is_cacheable(args, result):
+            write_cached_result(args.file, key, result, result_ttl(args))
+    if args.command == "summary":
+        result = {"greeting": get_greeting(), **result}
+    print(json.dumps(result, ensure_ascii=False, indent=2, default=str))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,216 @@
+import logging
+from datetime import datetime
+from typing import Any
+
+import numpy as np
+import pandas as pd
+
+from src.date_index import DATE_FORMAT, parse_dates
+from src.money import to_kopecks
+from src.store import DEFAULT_OPERATIONS_FILE, load_artifact
+
+logger = logging.getLogger(__name__)
+
+# Имя артефакта куба в кеше (см. store.load_artifact); меняется при изменении устройства куба
+CUBE_ARTIFACT = "cube_v2"
+
+
+def _to_datetime64(value: Any) -> np.datetime64:
+    """
+    Дата (DD.MM.YYYY, datetime или Timestamp) в datetime64 с точностью до дня.
+    """
+    if isinstance(value, str):
+        value = datetime.strptime(value, DATE_FORMAT)
+    return np.datetime64(pd.Timestamp(value).normalize().to_datetime64(), "D")
+
+
+class SpendingCube:
+    """
+    Предрасчитанный куб операций категория x карта x день.
+
+    Для каждой пары (категория, карта) хранятся префиксные суммы по дням: сумма операций и сумма трат
+    (отрицательных операций) в копейках и число операций. Сумма за любой период - это разность
+    двух элементов префиксных сумм, поэтому запросы по категории, карте и периоду, помесячные разбивки
+    и топ категорий не просматривают исходные операции.
+
+    Куб разреженный: хранятся только встречающиеся пары и только дни, в которые по паре были операции.
+    Записи упорядочены по паре, внутри пары - по дню, как строки матрицы CSR; ключ записи -
+    номер пары x stride + день, поэтому записи пары p занимают ключи [p * stride, (p + 1) * stride),
+    и смещения пар не хранятся отдельно. Префиксные суммы накоплены по всем записям с ведущим нулем;
+    позиция дня внутри пары находится двоичным поиском (searchsorted) по ключам, одним вызовом для всех
+    пар запроса. Размер куба - (различные тройки (категория, карта, день) + 1) x 4 значения int64;
+    операции без карты учитываются как карта None, операции без даты или категории в куб не попадают.
+    """
+
+    def __init__(
+        self,
+        df: pd.DataFrame,
+        date_column: str = "data_payment",
+        category_column: str = "category",
+        card_column: str = "card_number",
+        amount_column: str = "transaction_amount",
+    ) -> None:
+        size = len(df)
+        dates = parse_dates(df[date_column]) if date_column in df.columns else np.full(size, np.datetime64("NaT", "ns"))
+        empty = pd.Series([None] * size, dtype=object)
+        category_codes, self.categories = pd.factorize(df[category_column] if category_column in df.columns else empty)
+        card_codes, cards = pd.factorize(df[card_column] if card_column in df.columns else empty)
+        kopecks = to_kopecks(df[amount_column] if amount_column in df.columns else [0] * size)
+
+        valid = ~np.isnat(dates) & (category_codes >= 0)
+        days = dates[valid].astype("datetime64[D]")
+        self.origin = days.min() if len(days) else np.datetime64("1970-01-01", "D")
+        self.days = int((days.max() - self.origin).astype(np.int64)) + 1 if len(days) else 0
+
+        # Последний номер карты - операции без карты
+        self.cards = list(cards) + [None]
+        self.card_slots = {card: slot for slot, card in enumerate(self.cards)}
+        card_slot = np.where(card_codes >= 0, card_codes, len(cards))[valid]
+        day_offset = (days - self.origin).astype(np.int64)
+        amounts = kopecks[valid]
+
+        # Встречающиеся пары (категория, карта) и записи (пара, день) с суммами за день
+        pair_ids, pair_of_row = np.unique(category_codes[valid] * len(self.cards) + card_slot, return_inverse=True)
+        self.pair_categories = pair_ids // len(self.cards)
+        self.pair_cards = pair_ids % len(self.cards)
+        self.stride = self.days + 1
+        entry_keys, entry_of_row = np.unique(pair_of_row * self.stride + day_offset, return_inverse=True)
+        entries = len(entry_keys)
+        totals = np.zeros(entries, dtype=np.int64)
+        spent = np.zeros(entries, dtype=np.int64)
+        np.add.at(totals, entry_of_row, amounts)
+        np.add.at(spent, entry_of_row, np.where(amounts < 0, -amounts, 0))
+        counts = np.bincount(entry_of_row, minlength=entries).astype(np.int64)
+
+        self.entry_keys = entry_keys.astype(np.int64)
+        # Префиксные суммы по записям: [i] - сумма записей [0, i)
+        self.total = np.concatenate([[0], np.cumsum(totals)])
+        self.spent = np.concatenate([[0], np.cumsum(spent)])
+        self.count = np.concatenate([[0], np.cumsum(counts)])
+        self.category_codes = {category: code for code, category in enumerate(self.categories)}
+        logger.info(
+            "Куб трат построен: %s категорий, %s карт, %s дней, %s пар, %s записей",
+            len(self.categories),
+            len(self.cards),
+            self.days,
+            len(pair_ids),
+            entries,
+        )
+
+    def _offset(self, date: Any, default: int) -> int:
+        """
+        Номер дня префиксной суммы для даты (с обрезкой по границам куба).
+        """
+        if date is None:
+            return default
+        offset = int((_to_datetime64(date) - self.origin).astype(np.int64))
+        return min(max(offset, 0), self.days)
+
+    def _pairs(self, category: Any, card: Any) -> np.ndarray:
+        """
+        Номера встречающихся пар (категория, карта) для выборки (None - все категории или все карты).
+        """
+        selected = np.ones(len(self.pair_categories), dtype=bool)
+        if category is not None:
+            selected &= self.pair_categories == self.category_codes.get(category, -1)
+        if card is not None:
+            selected &= self.pair_cards == self.card_slots.get(card, -1)
+        return np.flatnonzero(selected)
+
+    def _pair_sums(self, pairs: np.ndarray, start: int, end: int) -> tuple:
+        """
+        Суммы операций, трат и число операций каждой пары за дни [start, end).
+        """
+        first = np.searchsorted(self.entry_keys, pairs * self.stride + start)
+        last = np.searchsorted(self.entry_keys, pairs * self.stride + end)
+        return tuple(values[last] - values[first] for values in (self.total, self.spent, self.count))
+
+    def _sums(self, pairs: np.ndarray, start: int, end: int) -> tuple:
+        if not len(pairs) or end <= start:
+            return 0, 0, 0
+        return tuple(int(values.sum()) for values in self._pair_sums(pairs, start, end))
+
+    def query(self, category: Any = None, start: Any = None, end: Any = None, card: Any = None) -> dict:
+        """
+        Сумма операций за период [start, end).
+
+        Args:
+            category: Категория (None - все категории).
+            start: Начало периода (DD.MM.YYYY или datetime; None - с первой операции).
+            end: Конец периода, не включительно (None - по последнюю операцию).
+            card: Номер карты как в выгрузке, например "*7197" (None - все карты).
+
+        Returns:
+            Словарь {"total": сумма операций, "spent": сумма трат, "count": число операций}, суммы в рублях.
+        """
+        total, spent, count = self._sums(self._pairs(category, card), self._offset(start, 0), self._offset(end, self.days))
+        return {"total": total / 100, "spent": spent / 100, "count": count}
+
+    def monthly(self, category: Any = None, start: Any = None, end: Any = None, card: Any = None) -> list:
+        """
+        Помесячная разбивка операций за период [start, end).
+
+        Returns:
+            Список словарей {"month": "YYYY-MM", "total", "spent", "count"} по возрастанию месяца.
+        """
+        pairs = self._pairs(category, card)
+        first, last = self._offset(start, 0), self._offset(end, self.days)
+        if not len(pairs) or last <= first:
+            return []
+        first_month = (self.origin + first).astype("datetime64[M]")
+        last_month = (self.origin + last - 1).astype("datetime64[M]")
+        months = np.arange(first_month, last_month + 1)
+        edges = (months.astype("datetime64[D]") - self.origin).astype(np.int64)
+        edges = np.append(np.clip(edges, first, last), last)
+        # Позиции всех границ месяцев во всех парах - один двоичный поиск; суммы месяцев - разности по границам
+        positions = np.searchsorted(self.entry_keys, pairs[:, None] * self.stride + edges[None, :])
+        totals, spent, counts = (np.diff(values[positions], axis=1).sum(axis=0) for values in (self.total, self.spent, self.count))
+        return [
+            {"month": str(month), "total": int(total) / 100, "spent": int(spent_month) / 100, "count": int(count)}
+            for month, total, spent_month, count in zip(months, totals, spent, counts)
+        ]
+
+    def top_categories(self, start: Any = None, end: Any = None, top_n: int = 5, card: Any = None) -> list:
+        """
+        Категории с наибольшими тратами за период [start, end).
+
+        Returns:
+            Список словарей {"category", "total", "spent", "count"} по убыванию трат.
+        """
+        pairs = self._pairs(None, card)
+        first, last = self._offset(start, 0), self._offset(end, self.days)
+        if not len(pairs) or last <= first:
+            return []
+        by_category = []
+        for values in self._pair_sums(pairs, first, last):
+            sums = np.zeros(len(self.categories), dtype=np.int64)
+            np.add.at(sums, self.pair_categories[pairs], values)
+            by_category.append(sums)
+        total, spent, count = by_category
+        order = np.lexsort((np.arange(len(spent)), -spent))[:top_n]
+        return [
+            {
+                "category": self.categories[code],
+                "total": int(total[code]) / 100,
+                "spent": int(spent[code]) / 100,
+                "count": int(count[code]),
+            }
+            for code in order
+            if count[code]
+        ]
+
+
+def build_cube(df: pd.DataFrame) -> SpendingCube:
+    """
+    Построение куба трат по операциям.
+    """
+    return SpendingCube(df)
+
+
+def load_cube(file_path: Any = DEFAULT_OPERATIONS_FILE) -> SpendingCube:
+    """
+    Куб трат файла операций, сохраненный в кеше рядом с данными и перестраиваемый при изменении файла
+    (см. store.load_artifact).
+    """
+    cube: SpendingCube = load_artifact(file_path, CUBE_ARTIFACT, build_cube)
+    return cube
@@ -0,0 +1,68 @@
+import asyncio
+import logging
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Optional
+
+from src.services import simple_search
+from src.utils import get_card_summary, get_currency_rate, get_stock_prices
+
+logger = logging.getLogger(__name__)
+
+STOCK_SYMBOLS = ["AAPL", "AMZN", "GOOGL", "MSFT", "TSLA"]
+
+
+async def collect_dashboard(
+    file_path: str,
+    user_request: Optional[str],
+    output_file: str,
+    analysis_date: Any = None,
+    stock_symbols: Optional[list] = None,
+) -> dict:
+    """
+    Параллельный запуск независимых стадий главной страницы.
+
+    Работа с файлом (поиск и сводка по картам) выполняется в пуле потоков, сетевые запросы
+    (курсы ЦБ и котировки) - одновременно с ней, поэтому общее время близко к самой долгой
+    стадии, а не к их сумме. Файл операций при этом разбирается один раз (см. store.load_operations).
+
+    Args:
+        file_path: Путь к файлу операций.
+        user_request: Поисковый запрос (None - поиск не выполняется).
+        output_file: Файл для результатов поиска.
+        analysis_date: Дата анализа для сводки по картам.
+        stock_symbols: Тикеры акций.
+
+    Returns:
+        Словарь главной страницы в том же виде, что и get_card_summary, с ключом "stock_prices".
+    """
+    loop = asyncio.get_running_loop()
+    symbols = STOCK_SYMBOLS if stock_symbols is None else stock_symbols
+
+    with ThreadPoolExecutor(max_workers=2, thread_name_prefix="dashboard-file") as executor:
+        file_stages = [loop.run_in_executor(executor, get_card_summary, file_path, analysis_date, [])]
+        if user_request is not None:
+            file_stages.append(loop.run_in_executor(executor, simple_search, user_request, file_path, output_file))
+
+        currency_rates, stock_prices, *file_results = await asyncio.gather(
+            asyncio.to_thread(get_currency_rate),
+            asyncio.to_thread(get_stock_prices, symbols),
+            *file_stages,
+        )
+
+    result: dict = file_results[0]
+    result["currency_rates"] = currency_rates
+    result["stock_prices"] = stock_prices
+    return result
+
+
+def run_dashboard(
+    file_path: str,
+    user_request: Optional[str],
+    output_file: str,
+    analysis_date: Any = None,
+    stock_symbols: Optional[list] = None,
+) -> dict:
+    """
+    Синхронная обертка над collect_dashboard.
+    """
+    return asyncio.run(collect_dashboard(file_path, user_request, output_file, analysis_date, stock_symbols))
@@ -0,0 +1,235 @@
+import logging
+import os
+import sqlite3
+import threading
+from typing import Any, Optional
+
+import numpy as np
+import pandas as pd
+
+from src.instrumentation import annotate, instrumented
+from src.search_index import SEARCH_FIELDS, match_score
+from src.store import cache_path, load_operations, source_key
+
+logger = logging.getLogger(__name__)
+
+# Источники данных для поиска и отчетов: операции в памяти или база SQLite
+BACKEND_MEMORY = "memory"
+BACKEND_SQLITE = "sqlite"
+BACKENDS = (BACKEND_MEMORY, BACKEND_SQLITE)
+
+TABLE = "operations"
+FTS_TABLE = "operations_fts"
+
+# Даты хранятся строками ISO, чтобы сравнение строк совпадало со сравнением дат
+SQL_DATETIME_FORMAT = "%Y-%m-%d %H:%M:%S"
+
+# Индексы по дате платежа, категории и карте (создаются, если колонки есть)
+INDEXES = {
+    "idx_operations_date": ("data_payment",),
+    "idx_operations_category_date": ("category", "data_payment"),
+    "idx_operations_card_date": ("card_number", "data_payment"),
+}
+
+# Триграммы FTS5 находят только запросы от 3 символов; более короткие проверяются перебором
+MIN_FTS_QUERY = 3
+
+_build_lock = threading.Lock()
+
+
+def _quote(name: str) -> str:
+    return '"' + str(name).replace('"', '""') + '"'
+
+
+def fts5_available() -> bool:
+    """
+    Есть ли в sqlite3 модуль FTS5 с токенизатором trigram (SQLite 3.34+).
+    """
+    connection = sqlite3.connect(":memory:")
+    try:
+        connection.execute("CREATE VIRTUAL TABLE t USING fts5(a, tokenize='trigram')")
+        return True
+    except sqlite3.OperationalError:
+        return False
+    finally:
+        connection.close()
+
+
+def _sql_values(values: pd.Series) -> np.ndarray:
+    """
+    Значения колонки для вставки в SQLite: даты - строки ISO, пропуски - None.
+    """
+    if pd.api.types.is_datetime64_any_dtype(values):
+        values = values.dt.strftime(SQL_DATETIME_FORMAT)
+    values = values.astype(object)
+    return np.asarray(values.where(values.notna(), None).to_numpy(), dtype=object)
+
+
+def build_database(df: pd.DataFrame, db_path: str) -> str:
+    """
+    Загрузка операций в базу SQLite одной транзакцией: таблица операций, индексы
+    по дате, категории и карте и полнотекстовый индекс FTS5 (trigram) по описанию и категории.
+
+    База пишется во временный файл и подменяет прежнюю целиком.
+
+    Args:
+        df: Операции в канонической схеме (см. schema.normalize_operations).
+        db_path: Путь к файлу базы.
+
+    Returns:
+        Путь к файлу базы.
+    """
+    tmp_path = db_path + ".tmp"
+    if os.path.exists(tmp_path):
+        os.remove(tmp_path)
+    os.makedirs(os.path.dirname(os.path.abspath(db_path)), exist_ok=True)
+
+    names = [str(name) for name in df.columns]
+    date_columns = [str(name) for name in df.columns if pd.api.types.is_datetime64_any_dtype(df[name])]
+    search_fields = [field for field in SEARCH_FIELDS if field in names]
+    connection = sqlite3.connect(tmp_path)
+    try:
+        with connection:
+            definitions = ", ".join(_quote(name) for name in names)
+            connection.execute(f"CREATE TABLE {TABLE} (position INTEGER PRIMARY KEY, {definitions})")
+            connection.execute("CREATE TABLE date_columns (name TEXT PRIMARY KEY)")
+            connection.executemany("INSERT INTO date_columns VALUES (?)", [(name,) for name in date_columns])
+
+            columns = [np.arange(len(df))] + [_sql_values(df[name]) for name in df.columns]
+            placeholders = ", ".join("?" * len(columns))
+            connection.executemany(f"INSERT INTO {TABLE} VALUES ({placeholders})", zip(*[c.tolist() for c in columns]))
+
+            for index_name, index_columns in INDEXES.items():
+                if all(column in names for column in index_columns):
+                    quoted = ", ".join(_quote(column) for column in index_columns)
+                    connection.execute(f"CREATE INDEX {index_name} ON {TABLE} ({quoted}, position)")
+
+            if search_fields and fts5_available():
+                fields = ", ".join(_quote(field) for field in search_fields)
+                connection.execute(f"CREATE VIRTUAL TABLE {FTS_TABLE} USING fts5({fields}, tokenize='trigram')")
+                connection.execute(f"INSERT INTO {FTS_TABLE} (rowid, {fields}) SELECT position, {fields} FROM {TABLE}")
+    finally:
+        connection.close()
+    os.replace(tmp_path, db_path)
+    logger.info("База SQLite построена: %s операций: %s", len(df), db_path)
+    return db_path
+
+
+class OperationsDatabase:
+    """
+    Запросы к базе операций SQLite с подстановкой параметров.
+
+    Каждый запрос открывает свое соединение только для чтения, поэтому объект можно
+    использовать из нескольких потоков. Результаты возвращаются DataFrame в канонической схеме
+    (даты - datetime64), так что их можно выводить через writers.iter_records.
+    """
+
+    def __init__(self, db_path: str) -> None:
+        self.db_path = db_path
+        connection = self._connect()
+        try:
+            self.columns = [row[1] for row in connection.execute(f"PRAGMA table_info({TABLE})")][1:]
+            self.date_columns = {row[0] for row in connection.execute("SELECT name FROM date_columns")}
+            fts = connection.execute("SELECT 1 FROM sqlite_master WHERE name = ?", (FTS_TABLE,)).fetchone()
+        finally:
+            connection.close()
+        self.has_fts = fts is not None
+        self.search_fields = [field for field in SEARCH_FIELDS if field in self.columns]
+
+    def _connect(self) -> sqlite3.Connection:
+        connection = sqlite3.connect(f"file:{self.db_path}?mode=ro", uri=True, check_same_thread=False)
+        connection.create_function("match_score", 2, match_score, deterministic=True)
+        return connection
+
+    def query(self, sql: str, params: Any = ()) -> pd.DataFrame:
+        """
+        Произвольный запрос к таблице operations (параметры подставляются через "?" или ":имя").
+
+        Колонки дат результата разбираются обратно в datetime64.
+        """
+        connection = self._connect()
+        try:
+            df = pd.read_sql_query(sql, connection, params=params)
+        finally:
+            connection.close()
+        for name in self.date_columns & set(df.columns):
+            df[name] = pd.to_datetime(df[name], format=SQL_DATETIME_FORMAT, errors="coerce")
+        return df
+
+    def _select(self, where: str, order: str, params: dict, limit: Optional[int] = None, join: str = "") -> pd.DataFrame:
+        columns = ", ".join(f"o.{_quote(name)}" for name in self.columns)
+        sql = f"SELECT {columns} FROM {TABLE} o {join} WHERE {where} ORDER BY {order} LIMIT :limit"
+        df = self.query(sql, {**params, "limit": -1 if limit is None else limit})
+        annotate(rows=len(df))
+        return df
+
+    @instrumented("sqlite_search")
+    def search(self, query: str, limit: Optional[int] = None) -> pd.DataFrame:
+        """
+        Поиск операций по описанию и категории без учета регистра, с ранжированием как у SearchIndex.search.
+
+        Запросы от 3 символов ищутся по индексу FTS5 (trigram), оценка совпадения (match_score)
+        считается только для найденных строк; при равной оценке сохраняется порядок строк в файле.
+
+        Args:
+            query: Строка запроса.
+            limit: Максимальное число результатов (None - без ограничения).
+
+        Returns:
+            DataFrame найденных операций.
+        """
+        query = query.lower()
+        if not query:
+            return self._select("1", "o.position", {}, limit)
+        if not self.search_fields:
+            return self._select("0", "o.position", {}, limit)
+
+        scores = [f"match_score(o.{_quote(field)}, :query)" for field in self.search_fields]
+        score = f"max({', '.join(scores)})" if len(scores) > 1 else scores[0]
+        order = f"{score} DESC, o.position"
+        if self.has_fts and len(query) >= MIN_FTS_QUERY:
+            phrase = '"' + query.replace('"', '""') + '"'
+            join = f"JOIN {FTS_TABLE} f ON f.rowid = o.position"
+            return self._select(f"{FTS_TABLE} MATCH :phrase", order, {"query": query, "phrase": phrase}, limit, join)
+        return self._select(f"{score} > 0", order, {"query": query}, limit)
+
+    @instrumented("sqlite_category_report")
+    def select_category(self, category: str, start: Any, end: Any) -> pd.DataFrame:
+        """
+        Операции категории с датой платежа в полуинтервале [start, end), по возрастанию даты
+        (как CategoryDateIndex.select); выборка идет по индексу (category, data_payment).
+        """
+        if "category" not in self.columns or "data_payment" not in self.columns:
+            return self._select("0", "o.position", {})
+        params = {
+            "category": category,
+            "start": pd.Timestamp(start).strftime(SQL_DATETIME_FORMAT),
+            "end": pd.Timestamp(end).strftime(SQL_DATETIME_FORMAT),
+        }
+        where = "o.category = :category AND o.data_payment >= :start AND o.data_payment < :end"
+        return self._select(where, "o.data_payment, o.position", params)
+
+
+def database_path(file_path: str) -> Optional[str]:
+    """
+    Путь к базе SQLite для версии файла операций (в директории кеша) или None, если файл недоступен.
+    """
+    key = source_key(file_path)
+    return cache_path(key, "sqlite") if key is not None else None
+
+
+def load_database(file_path: str) -> OperationsDatabase:
+    """
+    База операций SQLite для файла: строится один раз на версию файла и хранится в директории кеша.
+
+    Raises:
+        FileNotFoundError: Если файл операций недоступен.
+    """
+    db_path = database_path(file_path)
+    if db_path is None:
+        raise FileNotFoundError(f"Файл {file_path} не найден")
+    with _build_lock:
+        if not os.path.exists(db_path):
+            logger.info("Загрузка операций из %s в базу SQLite", file_path)
+            build_database(load_operations(file_path), db_path)
+    return OperationsDatabase(db_path)
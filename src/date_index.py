@@ -0,0 +1,76 @@
+import logging
+from typing import Any
+
+import numpy as np
+import pandas as pd
+
+logger = logging.getLogger(__name__)
+
+DATE_FORMAT = "%d.%m.%Y"
+
+
+def parse_dates(values: Any) -> np.ndarray:
+    """
+    Разбор дат платежей (DD.MM.YYYY или уже datetime) в массив datetime64[ns]; некорректные даты - NaT.
+    """
+    series = pd.Series(values)
+    if not pd.api.types.is_datetime64_any_dtype(series):
+        series = pd.to_datetime(series, format=DATE_FORMAT, errors="coerce")
+    return np.asarray(series.to_numpy(dtype="datetime64[ns]"), dtype="datetime64[ns]")
+
+
+class CategoryDateIndex:
+    """
+    Индекс операций по категории и дате платежа.
+
+    Даты разбираются один раз; позиции строк упорядочены по (категория, дата), поэтому
+    выборка категории за период - это два двоичных поиска (searchsorted), а не проход по всем строкам.
+    Строки без даты платежа в индекс не попадают.
+    """
+
+    def __init__(self, df: pd.DataFrame, date_column: str = "data_payment", category_column: str = "category") -> None:
+        self.bounds: dict = {}
+        if df.empty or date_column not in df.columns or category_column not in df.columns:
+            self.positions = np.array([], dtype=np.int64)
+            self.dates = np.array([], dtype="datetime64[ns]")
+            return
+
+        dates = parse_dates(df[date_column])
+        codes, categories = pd.factorize(df[category_column])
+        valid = np.flatnonzero(~np.isnat(dates) & (codes >= 0))
+        order = valid[np.lexsort((dates[valid], codes[valid]))]
+
+        self.positions = order
+        self.dates = dates[order]
+        sorted_codes = codes[order]
+        starts = np.searchsorted(sorted_codes, np.arange(len(categories) + 1))
+        for code, category in enumerate(categories):
+            self.bounds[category] = (starts[code], starts[code + 1])
+        logger.info("Индекс дат построен: %s операций, %s категорий", len(order), len(categories))
+
+    def select(self, category: str, start: Any, end: Any) -> np.ndarray:
+        """
+        Позиции операций категории с датой платежа в полуинтервале [start, end), по возрастанию даты.
+
+        Args:
+            category: Категория.
+            start: Начало периода (включительно).
+            end: Конец периода (не включительно).
+
+        Returns:
+            Массив позиций строк в исходном DataFrame.
+        """
+        if category not in self.bounds:
+            return np.array([], dtype=np.int64)
+        lo, hi = self.bounds[category]
+        dates = self.dates[lo:hi]
+        bounds = np.array([pd.Timestamp(start), pd.Timestamp(end)], dtype="datetime64[ns]")
+        first, last = np.searchsorted(dates, bounds)
+        return self.positions[lo + first : lo + last]
+
+
+def build_category_date_index(df: pd.DataFrame) -> CategoryDateIndex:
+    """
+    Построение индекса по категории и дате платежа.
+    """
+    return CategoryDateIndex(df)
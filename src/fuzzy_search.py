@@ -0,0 +1,240 @@
+import logging
+import re
+from typing import Any, Iterable, Optional
+
+import numpy as np
+
+from src.search_index import SEARCH_FIELDS, SearchIndex
+
+logger = logging.getLogger(__name__)
+
+# Минимальное сходство основ по триграммам, чтобы основа прошла в проверку расстоянием редактирования
+MIN_TRIGRAM_SIMILARITY = 0.3
+
+# Оценки совпадения слова запроса со словом значения
+SCORE_STEM = 1.0
+SCORE_STEM_PREFIX = 0.8
+SCORE_TYPO = 0.6
+
+_WORD = re.compile(r"\w+")
+
+# Стеммер Портера для русского языка (суффиксы отбрасываются в области RV - после первой гласной)
+_VOWELS = "аеиоуыэюя"
+_RV = re.compile(rf"^(.*?[{_VOWELS}])(.*)$")
+_PERFECTIVE_GERUND = re.compile(r"((ив|ивши|ившись|ыв|ывши|ывшись)|((?<=[ая])(в|вши|вшись)))$")
+_REFLEXIVE = re.compile(r"(с[яь])$")
+_ADJECTIVE = re.compile(r"(ее|ие|ые|ое|ими|ыми|ей|ий|ый|ой|ем|им|ым|ом|его|ого|ему|ому|их|ых|ую|юю|ая|яя|ою|ею)$")
+_PARTICIPLE = re.compile(r"((ивш|ывш|ующ)|((?<=[ая])(ем|нн|вш|ющ|щ)))$")
+_VERB = re.compile(
+    r"((ила|ыла|ена|ейте|уйте|ите|или|ыли|ей|уй|ил|ыл|им|ым|ен|ило|ыло|ено|ят|ует|уют|ит|ыт|ены|ить|ыть|ишь|ую|ю)"
+    r"|((?<=[ая])(ла|на|ете|йте|ли|й|л|ем|н|ло|но|ет|ют|ны|ть|ешь|нно)))$"
+)
+_NOUN = re.compile(r"(а|ев|ов|ие|ье|е|иями|ями|ами|еи|ии|и|ией|ей|ой|ий|й|иям|ям|ием|ем|ам|ом|о|у|ах|иях|ях|ы|ь|ию|ью|ю|ия|ья|я)$")
+_DERIVATIONAL = re.compile(rf".*[^{_VOWELS}]+[{_VOWELS}].*ость?$")
+
+
+def stem(word: str) -> str:
+    """
+    Основа русского слова (стеммер Портера); слова без русских гласных возвращаются в нижнем регистре.
+    """
+    word = word.lower().replace("ё", "е")
+    match = _RV.match(word)
+    if not match:
+        return word
+    prefix, rv = match.groups()
+
+    stripped = _PERFECTIVE_GERUND.sub("", rv, count=1)
+    if stripped == rv:
+        rv = _REFLEXIVE.sub("", rv, count=1)
+        stripped = _ADJECTIVE.sub("", rv, count=1)
+        if stripped != rv:
+            rv = _PARTICIPLE.sub("", stripped, count=1)
+        else:
+            stripped = _VERB.sub("", rv, count=1)
+            rv = _NOUN.sub("", rv, count=1) if stripped == rv else stripped
+    else:
+        rv = stripped
+
+    rv = re.sub(r"и$", "", rv, count=1)
+    if _DERIVATIONAL.match(rv):
+        rv = re.sub(r"ость?$", "", rv, count=1)
+    stripped = re.sub(r"ь$", "", rv, count=1)
+    if stripped == rv:
+        rv = re.sub(r"нн$", "н", re.sub(r"(ейше|ейш)$", "", rv, count=1), count=1)
+    else:
+        rv = stripped
+    return prefix + rv
+
+
+def stems(text: str) -> list:
+    """
+    Основы слов строки в порядке следования.
+    """
+    return [stem(word) for word in _WORD.findall(str(text).lower())]
+
+
+def padded_trigrams(word: str) -> set:
+    """
+    Триграммы слова с границами ("$такс$"), чтобы у коротких слов тоже были триграммы.
+    """
+    padded = f"${word}$"
+    return {padded[i : i + 3] for i in range(len(padded) - 2)}
+
+
+def bounded_edit_distance(a: str, b: str, max_distance: int) -> int:
+    """
+    Расстояние Левенштейна, если оно не больше max_distance, иначе max_distance + 1.
+
+    Вычисляется только полоса ширины 2 * max_distance + 1 вокруг диагонали, с досрочным выходом.
+    """
+    if abs(len(a) - len(b)) > max_distance:
+        return max_distance + 1
+    previous = list(range(len(b) + 1))
+    for i in range(1, len(a) + 1):
+        current = [i] + [max_distance + 1] * len(b)
+        low, high = max(1, i - max_distance), min(len(b), i + max_distance)
+        for j in range(low, high + 1):
+            cost = 0 if a[i - 1] == b[j - 1] else 1
+            current[j] = min(previous[j] + 1, current[j - 1] + 1, previous[j - 1] + cost)
+        if min(current[max(0, low - 1) : high + 1]) > max_distance:
+            return max_distance + 1
+        previous = current
+    return min(previous[len(b)], max_distance + 1)
+
+
+def max_typos(word: str) -> int:
+    """
+    Допустимое число опечаток для основы: 0 для коротких, 1 до 6 букв, 2 для длинных.
+    """
+    if len(word) <= 3:
+        return 0
+    return 1 if len(word) <= 6 else 2
+
+
+class FuzzyIndex(SearchIndex):
+    """
+    Нечеткий поиск по описанию и категории: словоформы (стемминг) и опечатки.
+
+    Поверх индекса значений SearchIndex строится словарь основ слов: для каждой основы -
+    номера значений, где она встречается, и инвертированный индекс триграмм основ.
+    Слово запроса сравнивается только с основами, у которых есть общие триграммы, а оценки
+    считаются только для значений с подходящими основами, поэтому время и память поиска
+    зависят от числа найденных значений и строк результата, а не от числа операций.
+    """
+
+    def __init__(self, df: Any, fields: Iterable[str] = SEARCH_FIELDS) -> None:
+        super().__init__(df, fields)
+        vocabulary: dict = {}
+        for text_id, text in enumerate(self.texts):
+            if not isinstance(text, str):
+                continue
+            for word_stem in set(stems(text)):
+                vocabulary.setdefault(word_stem, []).append(text_id)
+
+        self.stems = list(vocabulary)
+        self.stem_texts = [np.array(ids, dtype=np.int64) for ids in vocabulary.values()]
+        self.stem_gram_counts = np.array([len(padded_trigrams(word)) for word in self.stems], dtype=np.int64)
+        postings: dict = {}
+        for stem_id, word_stem in enumerate(self.stems):
+            for gram in padded_trigrams(word_stem):
+                postings.setdefault(gram, []).append(stem_id)
+        self.stem_postings = {gram: np.array(ids, dtype=np.int64) for gram, ids in postings.items()}
+        logger.info("Нечеткий индекс построен: %s основ", len(self.stems))
+
+    def match_stems(self, word_stem: str) -> dict:
+        """
+        Основы словаря, похожие на основу слова запроса.
+
+        Returns:
+            Словарь номер основы -> оценка (совпадение, префикс или опечатка).
+        """
+        grams = padded_trigrams(word_stem)
+        lists = [self.stem_postings[gram] for gram in grams if gram in self.stem_postings]
+        if not lists:
+            return {}
+        candidates, shared = np.unique(np.concatenate(lists), return_counts=True)
+        similarity = shared / (len(grams) + self.stem_gram_counts[candidates] - shared)
+
+        matches = {}
+        typos = max_typos(word_stem)
+        for stem_id, score in zip(candidates, similarity):
+            candidate = self.stems[stem_id]
+            if candidate == word_stem:
+                matches[stem_id] = SCORE_STEM
+            elif len(word_stem) >= 3 and candidate.startswith(word_stem):
+                matches[stem_id] = SCORE_STEM_PREFIX
+            elif len(candidate) >= 3 and word_stem.startswith(candidate):
+                # Стеммер отрезает у разных форм разные окончания: "магнит" -> "магн", но "магнита" -> "магнит"
+                matches[stem_id] = SCORE_STEM_PREFIX
+            elif typos and score >= MIN_TRIGRAM_SIMILARITY:
+                distance = bounded_edit_distance(word_stem, candidate, typos)
+                if distance <= typos:
+                    matches[stem_id] = SCORE_TYPO * (1 - distance / (typos + 1))
+        return matches
+
+    def fuzzy_search(self, query: str, limit: Optional[int] = None) -> np.ndarray:
+        """
+        Нечеткий поиск: каждое слово запроса сопоставляется с основами слов значений.
+
+        Оценка строки - сумма лучших оценок слов запроса (совпадение основы, префикс основы,
+        опечатка в пределах допустимого расстояния). Строки упорядочены по убыванию оценки,
+        при равной оценке - по порядку в файле. Оценки считаются только для значений
+        с подходящими основами, в строки переводятся только значения, нужные для limit результатов.
+
+        Args:
+            query: Строка запроса.
+            limit: Максимальное число результатов (None - без ограничения).
+
+        Returns:
+            Массив позиций строк в DataFrame операций.
+        """
+        query_stems = stems(query)
+        if not query_stems:
+            return self.search(query, limit)
+
+        text_ids, text_scores = [], []
+        for word_stem in dict.fromkeys(query_stems):
+            matches = self.match_stems(word_stem)
+            if not matches:
+                continue
+            ids = np.concatenate([self.stem_texts[stem_id] for stem_id in matches])
+            scores = np.repeat(list(matches.values()), [len(self.stem_texts[stem_id]) for stem_id in matches])
+            # Лучшая оценка слова запроса для каждого значения: первая после сортировки по (значение, -оценка)
+            order = np.lexsort((-scores, ids))
+            ids, scores = ids[order], scores[order]
+            first = np.r_[True, ids[1:] != ids[:-1]]
+            text_ids.append(ids[first])
+            text_scores.append(scores[first])
+
+        if not text_ids:
+            return np.array([], dtype=np.int64)
+        ids, inverse = np.unique(np.concatenate(text_ids), return_inverse=True)
+        return self._top_rows(ids, np.bincount(inverse, weights=np.concatenate(text_scores)), limit)
+
+    def _top_rows(self, text_ids: np.ndarray, scores: np.ndarray, limit: Optional[int]) -> np.ndarray:
+        """
+        Позиции строк значений по убыванию оценки, при равной оценке - по порядку в файле.
+
+        Оценка строки - лучшая из оценок ее значений, поэтому значения обходятся группами
+        равной оценки от лучшей к худшей, строка берется из первой группы, где она встретилась,
+        и обход останавливается, как только набрано limit строк.
+        """
+        order = np.argsort(-scores, kind="stable")
+        text_ids, scores = text_ids[order], scores[order]
+        bounds = np.flatnonzero(np.r_[True, scores[1:] != scores[:-1], True])
+
+        matched = np.array([], dtype=np.int64)
+        for start, end in zip(bounds[:-1], bounds[1:]):
+            # Строки значения упорядочены по позиции, поэтому для limit результатов достаточно первых limit строк
+            rows = np.unique(np.concatenate([self.rows[text_id][:limit] for text_id in text_ids[start:end]]))
+            matched = np.concatenate([matched, np.setdiff1d(rows, matched, assume_unique=True)])
+            if limit is not None and len(matched) >= limit:
+                break
+        return matched[:limit] if limit is not None else matched
+
+
+def build_fuzzy_index(df: Any) -> FuzzyIndex:
+    """
+    Построение индекса нечеткого поиска по полям SEARCH_FIELDS (по DataFrame или Transactions).
+    """
+    return FuzzyIndex(df)
@@ -0,0 +1,19 @@
+from datetime import datetime
+
+
+def get_greeting() -> str:
+    """
+    Return a greeting based on the current time.
+
+    Returns:
+        str: Greeting message based on the current time of the day.
+    """
+    current_hour = datetime.now().hour
+    if 6 <= current_hour < 12:
+        return "Доброе утро"
+    elif 12 <= current_hour < 18:
+        return "Добрый день"
+    elif 18 <= current_hour < 22:
+        return "Добрый вечер"
+    else:
+        return "Доброй ночи"
@@ -0,0 +1,191 @@
+import hashlib
+import logging
+import os
+from typing import Any, Optional
+
+import numpy as np
+import pandas as pd
+
+from src.date_index import parse_dates
+from src.store import get_cache_dir, load_operations
+from src.money import to_kopecks
+from src.utils import CardAggregate
+
+logger = logging.getLogger(__name__)
+
+# Версия формата состояния: при изменении состояние пересчитывается с нуля
+STATE_VERSION = 3
+
+
+def row_hashes(df: pd.DataFrame) -> np.ndarray:
+    """
+    Хеши отдельных строк (векторный hash_pandas_object, без учета индекса).
+    """
+    return np.asarray(pd.util.hash_pandas_object(df, index=False), dtype=np.uint64)
+
+
+def hashes_digest(hashes: np.ndarray) -> str:
+    """
+    Хеш последовательности хешей строк: хеш любого среза строк считается без повторного хеширования DataFrame.
+    """
+    return hashlib.blake2b(np.ascontiguousarray(hashes).tobytes(), digest_size=16).hexdigest()
+
+
+def rows_digest(df: pd.DataFrame) -> str:
+    """
+    Хеш содержимого строк.
+    """
+    return hashes_digest(row_hashes(df))
+
+
+def default_state_path(file_path: str) -> str:
+    """
+    Путь к файлу состояния инкрементальных сводок (в директории кеша, вне очистки версий кеша).
+    """
+    return os.path.join(get_cache_dir(file_path), f"incremental_{os.path.basename(file_path)}.pkl")
+
+
+class IncrementalState:
+    """
+    Накопленные сводки по уже обработанным операциям и водяной знак для поиска новых строк.
+
+    Хранятся: агрегат по картам (суммы и топ операций, см. CardAggregate), суммы и число операций
+    по (категория, месяц) в копейках, число обработанных строк и хеш их содержимого.
+    """
+
+    def __init__(self, top_n: int = 5) -> None:
+        self.version = STATE_VERSION
+        self.rows = 0
+        self.digest = rows_digest(pd.DataFrame())
+        self.cards = CardAggregate(top_n)
+        self.category_months: dict = {}
+
+    def fold(self, df: pd.DataFrame) -> None:
+        """
+        Добавление новых операций в сводки (без пересчета уже обработанных).
+        """
+        if df.empty:
+            return
+        self.cards.update(df)
+        if "category" in df.columns and "data_payment" in df.columns:
+            months = parse_dates(df["data_payment"]).astype("datetime64[M]")
+            if "transaction_amount" in df.columns:
+                kopecks = to_kopecks(df["transaction_amount"])
+            else:
+                kopecks = np.zeros(len(df), dtype=np.int64)
+            grouped = pd.DataFrame(
+                {"category": df["category"].to_numpy(), "month": months, "kopecks": kopecks}
+            ).groupby(["category", "month"], sort=False)["kopecks"].agg(["sum", "count"])
+            for (category, month), (total, count) in grouped.iterrows():
+                key = (category, pd.Timestamp(month).strftime("%Y-%m"))
+                previous = self.category_months.get(key, (0, 0))
+                self.category_months[key] = (previous[0] + int(total), previous[1] + int(count))
+
+    def category_month_summary(self) -> list:
+        """
+        Суммы трат по категориям и месяцам.
+
+        Returns:
+            Список словарей {"category", "month", "total", "count"} по возрастанию месяца.
+        """
+        return [
+            {"category": category, "month": month, "total": total / 100, "count": count}
+            for (category, month), (total, count) in sorted(self.category_months.items(), key=lambda item: item[0][::-1])
+        ]
+
+
+def _load_state(state_path: str) -> Optional[IncrementalState]:
+    try:
+        state = pd.read_pickle(state_path)
+    except FileNotFoundError:
+        return None
+    except Exception as e:
+        logger.warning("Не удалось прочитать состояние %s: %s", state_path, str(e))
+        return None
+    if not isinstance(state, IncrementalState) or getattr(state, "version", None) != STATE_VERSION:
+        return None
+    return state
+
+
+def _save_state(state: IncrementalState, state_path: str) -> None:
+    try:
+        os.makedirs(os.path.dirname(state_path) or ".", exist_ok=True)
+        pd.to_pickle(state, state_path + ".tmp")
+        os.replace(state_path + ".tmp", state_path)
+    except Exception as e:
+        logger.warning("Не удалось сохранить состояние %s: %s", state_path, str(e))
+
+
+def find_delta(df: pd.DataFrame, state: IncrementalState, hashes: Optional[np.ndarray] = None) -> Optional[pd.DataFrame]:
+    """
+    Новые строки относительно водяного знака.
+
+    Обработанные ранее строки должны остаться без изменений в начале файла (новые дописаны в конец)
+    или в конце файла (новые добавлены сверху, как в выгрузке банка от новых к старым).
+
+    Args:
+        df: Операции.
+        state: Сохраненное состояние.
+        hashes: Уже посчитанные хеши строк df (см. row_hashes).
+
+    Returns:
+        DataFrame новых строк или None, если исторические строки изменились и нужен полный пересчет.
+    """
+    if len(df) < state.rows:
+        return None
+    if hashes is None:
+        hashes = row_hashes(df)
+    if hashes_digest(hashes[: state.rows]) == state.digest:
+        return df.iloc[state.rows :]
+    if hashes_digest(hashes[len(df) - state.rows :]) == state.digest:
+        return df.iloc[: len(df) - state.rows]
+    return None
+
+
+def update_incremental(
+    file_path: str, state_path: Optional[str] = None, df: Optional[pd.DataFrame] = None, top_n: int = 5
+) -> IncrementalState:
+    """
+    Обновление сохраненных сводок только по новым операциям.
+
+    Если состояния нет или исторические строки изменились, сводки пересчитываются с нуля.
+
+    Args:
+        file_path: Путь к файлу операций.
+        state_path: Путь к файлу состояния (по умолчанию - в директории кеша).
+        df: Уже загруженные операции (по умолчанию - из store.load_operations).
+        top_n: Размер топа операций.
+
+    Returns:
+        Актуальное состояние сводок.
+    """
+    state_path = state_path or default_state_path(file_path)
+    if df is None:
+        df = load_operations(file_path)
+
+    # Строки хешируются один раз: и для поиска новых строк, и для нового водяного знака
+    hashes = row_hashes(df)
+    saved = _load_state(state_path)
+    delta = find_delta(df, saved, hashes) if saved is not None and saved.cards.top_n == top_n else None
+    if saved is None or delta is None:
+        logger.info("Инкрементальные сводки пересчитываются полностью: %s строк", len(df))
+        state = IncrementalState(top_n)
+        delta = df
+    else:
+        state = saved
+        logger.info("Инкрементальные сводки: новых строк %s", len(delta))
+        if delta.empty:
+            return state
+
+    state.fold(delta)
+    state.rows = len(df)
+    state.digest = hashes_digest(hashes)
+    _save_state(state, state_path)
+    return state
+
+
+def get_category_month_summary(file_path: str, state_path: Optional[str] = None) -> Any:
+    """
+    Суммы трат по категориям и месяцам с инкрементальным обновлением.
+    """
+    return update_incremental(file_path, state_path).category_month_summary()
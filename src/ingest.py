@@ -0,0 +1,152 @@
+"""
+Загрузка архива выписок: несколько файлов операций объединяются в одно хранилище.
+
+Запуск из корня проекта:
+
+    python -m src.ingest "data/statements/*.xlsx" --output data/operations_merged.pkl --workers 8
+
+Полученный файл .pkl передается как file_path в get_card_summary, simple_search, main_reports и т.д.
+"""
+
+import argparse
+import glob
+import logging
+import os
+from concurrent.futures import ProcessPoolExecutor
+from typing import Any, Optional
+
+import pandas as pd
+
+from src.instrumentation import annotate, instrumented
+from src.schema import normalize_operations
+from src.store import read_operations_file
+
+logger = logging.getLogger(__name__)
+
+# Объединенное хранилище по умолчанию
+DEFAULT_MERGED_FILE = os.path.join(
+    os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "data", "operations_merged.pkl"
+)
+
+STATEMENT_EXTENSIONS = (".xls", ".xlsx", ".csv")
+
+
+def find_statement_files(source: str) -> list:
+    """
+    Файлы выписок по пути к директории, glob-шаблону или пути к одному файлу.
+
+    Returns:
+        Отсортированный список путей к файлам .xls, .xlsx и .csv.
+    """
+    if os.path.isdir(source):
+        paths = [os.path.join(source, name) for name in os.listdir(source)]
+    elif os.path.isfile(source):
+        paths = [source]
+    else:
+        paths = glob.glob(source, recursive=True)
+    return sorted(path for path in paths if os.path.isfile(path) and path.lower().endswith(STATEMENT_EXTENSIONS))
+
+
+def parse_statement(file_path: str) -> pd.DataFrame:
+    """
+    Разбор одного файла выписки и приведение к канонической схеме (выполняется в отдельном процессе).
+    """
+    df = normalize_operations(read_operations_file(file_path))
+    logger.info("Файл %s: %s операций", file_path, len(df))
+    return df
+
+
+def deduplicate(frames: list) -> pd.DataFrame:
+    """
+    Объединение выписок без повторов операций из пересекающихся периодов.
+
+    Одинаковые строки внутри одного файла - это разные операции (например, две одинаковые покупки),
+    поэтому строка считается повтором, только если в другом файле уже встретилось столько же
+    ее копий: ключ - хеш содержимого строки и номер ее копии внутри файла.
+    """
+    frames = [frame for frame in frames if not frame.empty]
+    if not frames:
+        return pd.DataFrame()
+    merged = pd.concat(frames, ignore_index=True, sort=False)
+    hashes = pd.util.hash_pandas_object(merged, index=False).to_numpy()
+    file_number = [number for number, frame in enumerate(frames) for _ in range(len(frame))]
+    occurrence = pd.DataFrame({"hash": hashes, "file": file_number}).groupby(["file", "hash"]).cumcount().to_numpy()
+    duplicated = pd.DataFrame({"hash": hashes, "occurrence": occurrence}).duplicated().to_numpy()
+    return merged.loc[~duplicated].reset_index(drop=True)
+
+
+def sort_operations(df: pd.DataFrame) -> pd.DataFrame:
+    """
+    Операции от новых к старым, как в выгрузке банка (строки без даты - в конце).
+    """
+    if "date_operation" not in df.columns:
+        return df
+    dates = pd.to_datetime(df["date_operation"], format="%d.%m.%Y %H:%M:%S", errors="coerce")
+    order = dates.sort_values(ascending=False, na_position="last", kind="stable").index
+    return df.loc[order].reset_index(drop=True)
+
+
+@instrumented("ingest", rows=len)
+def merge_statements(files: list, max_workers: Optional[int] = None) -> pd.DataFrame:
+    """
+    Параллельный разбор файлов выписок пулом процессов и объединение без повторов.
+
+    Разбор xls/xlsx упирается в процессор и GIL, поэтому файлы разбираются в отдельных процессах;
+    при одном файле или max_workers=1 - в текущем процессе.
+
+    Args:
+        files: Пути к файлам выписок.
+        max_workers: Число процессов (по умолчанию - число ядер).
+
+    Returns:
+        DataFrame операций от новых к старым.
+    """
+    workers = min(max_workers or os.cpu_count() or 1, len(files))
+    if workers > 1:
+        with ProcessPoolExecutor(max_workers=workers) as executor:
+            frames = list(executor.map(parse_statement, files))
+    else:
+        frames = [parse_statement(file_path) for file_path in files]
+    annotate(files=len(files), workers=workers, parsed_rows=sum(len(frame) for frame in frames))
+    return sort_operations(deduplicate(frames))
+
+
+def ingest(source: str, output_file: str = DEFAULT_MERGED_FILE, max_workers: Optional[int] = None) -> str:
+    """
+    Объединение выписок из директории или по glob-шаблону в одно хранилище.
+
+    Args:
+        source: Директория, glob-шаблон или путь к файлу.
+        output_file: Путь к объединенному хранилищу (.pkl).
+        max_workers: Число процессов разбора.
+
+    Returns:
+        Путь к объединенному хранилищу.
+
+    Raises:
+        FileNotFoundError: Если файлов выписок не найдено.
+    """
+    files = find_statement_files(source)
+    if not files:
+        raise FileNotFoundError(f"Файлы выписок не найдены: {source}")
+    merged = merge_statements(files, max_workers)
+
+    os.makedirs(os.path.dirname(os.path.abspath(output_file)), exist_ok=True)
+    merged.to_pickle(output_file + ".tmp")
+    os.replace(output_file + ".tmp", output_file)
+    logger.info("Объединено %s файлов, %s операций: %s", len(files), len(merged), output_file)
+    return output_file
+
+
+def main(argv: Optional[Any] = None) -> None:
+    parser = argparse.ArgumentParser(description="Объединение выписок в одно хранилище операций")
+    parser.add_argument("source", help="директория или glob-шаблон файлов выписок")
+    parser.add_argument("--output", default=DEFAULT_MERGED_FILE, help="путь к объединенному хранилищу (.pkl)")
+    parser.add_argument("--workers", type=int, help="число процессов (по умолчанию - число ядер)")
+    args = parser.parse_args(argv)
+    print(ingest(args.source, args.output, args.workers))
+
+
+if __name__ == "__main__":
+    logging.basicConfig(level=logging.INFO, format="%(asctime)s - %(levelname)s - %(message)s")
+    main()
@@ -0,0 +1,202 @@
+import cProfile
+import contextvars
+import functools
+import io
+import json
+import logging
+import os
+import pstats
+import threading
+import time
+import tracemalloc
+from collections import deque
+from contextlib import contextmanager
+from typing import Any, Callable, Iterator, Optional
+
+logger = logging.getLogger(__name__)
+
+# Включение профилирования стадий (cProfile + tracemalloc) через переменную окружения
+PROFILE_ENV = "INSTRUMENTATION_PROFILE"
+
+# Собранные метрики стадий {"stage", "seconds", ...}; хранятся последние MAX_METRICS записей
+MAX_METRICS = 10000
+_metrics: deque = deque(maxlen=MAX_METRICS)
+_metrics_lock = threading.Lock()
+
+# Профили стадий: имя стадии -> pstats.Stats
+_profiles: dict = {}
+
+_profiling = os.getenv(PROFILE_ENV, "").lower() in ("1", "true", "yes")
+_current_stage: contextvars.ContextVar = contextvars.ContextVar("current_stage", default=None)
+_local = threading.local()
+
+
+def enable_profiling(enabled: bool = True) -> None:
+    """
+    Включение или отключение профилирования стадий (cProfile и пик памяти tracemalloc).
+    """
+    global _profiling
+    _profiling = enabled
+    if enabled and not tracemalloc.is_tracing():
+        tracemalloc.start()
+    elif not enabled and tracemalloc.is_tracing():
+        tracemalloc.stop()
+
+
+def annotate(**fields: Any) -> None:
+    """
+    Добавление полей (число строк, прочитанные байты и т.п.) к метрикам текущей стадии.
+    Вне стадии ничего не делает.
+    """
+    record = _current_stage.get()
+    if record is not None:
+        record.update(fields)
+
+
+@contextmanager
+def stage_timer(stage: str, **fields: Any) -> Iterator[dict]:
+    """
+    Замер длительности стадии.
+
+    По завершении метрики стадии сохраняются (см. get_metrics) и пишутся в лог одной JSON-строкой.
+    При включенном профилировании внешняя стадия потока профилируется cProfile,
+    а в метрики добавляется пик выделенной памяти (peak_alloc_mb).
+
+    Args:
+        stage: Имя стадии.
+        **fields: Дополнительные поля метрик.
+
+    Yields:
+        Словарь метрик стадии (можно дополнять внутри блока).
+    """
+    record = {"stage": stage, **fields}
+    token = _current_stage.set(record)
+    depth = getattr(_local, "depth", 0)
+    _local.depth = depth + 1
+
+    profiler = None
+    if _profiling and depth == 0:
+        profiler = cProfile.Profile()
+        try:
+            profiler.enable()
+        except ValueError:
+            profiler = None
+        if tracemalloc.is_tracing():
+            tracemalloc.reset_peak()
+
+    started = time.perf_counter()
+    try:
+        yield record
+    except Exception as e:
+        record["error"] = type(e).__name__
+        raise
+    finally:
+        record["seconds"] = round(time.perf_counter() - started, 6)
+        if profiler is not None:
+            profiler.disable()
+            _store_profile(stage, profiler)
+            if tracemalloc.is_tracing():
+                record["peak_alloc_mb"] = round(tracemalloc.get_traced_memory()[1] / 2**20, 3)
+        _local.depth = depth
+        _current_stage.reset(token)
+        with _metrics_lock:
+            _metrics.append(record)
+        logger.info(json.dumps(record, ensure_ascii=False, default=str))
+
+
+def _store_profile(stage: str, profiler: cProfile.Profile) -> None:
+    """
+    Накопление профиля стадии (несколько вызовов одной стадии суммируются).
+    """
+    with _metrics_lock:
+        if stage in _profiles:
+            _profiles[stage].add(profiler)
+        else:
+            _profiles[stage] = pstats.Stats(profiler)
+
+
+def instrumented(stage: Optional[str] = None, rows: Optional[Callable[[Any], int]] = None) -> Callable:
+    """
+    Декоратор: вызов функции выполняется как стадия stage_timer.
+
+    Args:
+        stage: Имя стадии (по умолчанию - имя функции).
+        rows: Функция, вычисляющая число строк по результату (например, len).
+    """
+
+    def decorator(func: Callable) -> Callable:
+        name = stage or func.__name__
+
+        @functools.wraps(func)
+        def wrapper(*args: Any, **kwargs: Any) -> Any:
+            with stage_timer(name) as record:
+                result = func(*args, **kwargs)
+                if rows is not None and "rows" not in record:
+                    try:
+                        record["rows"] = rows(result)
+                    except Exception:
+                        pass
+                return result
+
+        return wrapper
+
+    return decorator
+
+
+def get_metrics() -> list:
+    """
+    Копия собранных метрик стадий в порядке завершения.
+    """
+    with _metrics_lock:
+        return [dict(record) for record in _metrics]
+
+
+def metrics_summary() -> dict:
+    """
+    Сводка по стадиям: число вызовов, суммарное и максимальное время, суммарное число строк и байт.
+    """
+    summary: dict = {}
+    for record in get_metrics():
+        item = summary.setdefault(record["stage"], {"calls": 0, "total_seconds": 0.0, "max_seconds": 0.0})
+        item["calls"] += 1
+        item["total_seconds"] = round(item["total_seconds"] + record["seconds"], 6)
+        item["max_seconds"] = max(item["max_seconds"], record["seconds"])
+        for field in ("rows", "bytes_read"):
+            if isinstance(record.get(field), int):
+                item[field] = item.get(field, 0) + record[field]
+    return summary
+
+
+def clear_metrics() -> None:
+    """
+    Очистка собранных метрик и профилей.
+    """
+    with _metrics_lock:
+        _metrics.clear()
+        _profiles.clear()
+
+
+def write_profile_report(output_file: str, limit: int = 20) -> None:
+    """
+    Отчет по стадиям: сводка метрик и топ функций cProfile для каждой профилированной стадии.
+
+    Args:
+        output_file: Путь к файлу отчета.
+        limit: Число функций в профиле каждой стадии.
+    """
+    with open(output_file, "w", encoding="utf-8") as f:
+        f.write(json.dumps(metrics_summary(), ensure_ascii=False, indent=2))
+        f.write("\n")
+        with _metrics_lock:
+            profiles = dict(_profiles)
+        for stage, stats in profiles.items():
+            stream = io.StringIO()
+            stats.stream = stream
+            stats.sort_stats("cumulative").print_stats(limit)
+            f.write(f"\n===== {stage} =====\n")
+            f.write(stream.getvalue())
+    logger.info("Отчет профилирования записан в файл %s", output_file)
+
+
+if _profiling:
+    enable_profiling()
@@ -1,9 +1,11 @@
 import json
 import logging
+import os
+import sys
 from datetime import datetime
-from reports import main_reports
-from services import simple_search
-from utils import get_card_summary, get_stock_prices
+from typing import Optional
+
+from src.paths import DEFAULT_OPERATIONS_FILE
 
 # Настройка логгера
 logging.basicConfig(level=logging.INFO, format="%(asctime)s - %(levelname)s - %(message)s")
@@ -18,43 +20,49 @@ def main() -> None:
     - Используется функция simple_search для выполнения поиска транзакций в файле XLSX.
     - Используется функция get_card_summary для получения сводной информации о картах из файла XLS.
     - Используется функция get_stock_prices для получения текущих цен на акции.
+    - Первые три стадии и запрос курсов валют выполняются параллельно через run_dashboard.
     - Используется функция main_reports для выполнения отчетов
+
+    С аргументами командной строки (python -m src.main summary ...) вместо диалога запускается CLI (см. cli.py).
     """
+    # Тяжелые модули (pandas, requests) импортируются только для диалогового режима
+    from src.dashboard import STOCK_SYMBOLS, run_dashboard
+    from src.instrumentation import PROFILE_ENV, metrics_summary, write_profile_report
+    from src.reports import main_reports
+
     try:
-        # Пример использования функций из utils.py
-        file_path = "../data/operations.xls"
+        # Сначала собираем ввод пользователя, затем стадии выполняются параллельно (см. dashboard.py)
+        file_path = DEFAULT_OPERATIONS_FILE
         user_request = input("Введите запрос для поиска: ")
         output_file = "search_results.json"
-        simple_search(user_request, file_path, output_file)
-        print(f"Результаты поиска сохранены в файл: {output_file}")
 
-        # Пример использования функций из views.py
-        user_date_input = input("Введите дату в формате DD.MM.YYYY (Нажмите Enter чтобы использовать текущую дату): ")
+        analysis_date: Optional[datetime] = None
+        user_date_input = input("Введите дату в формате DD.MM.YYYY (Нажмите Enter чтобы использовать все операции): ")
         if user_date_input.strip():
             try:
                 analysis_date = datetime.strptime(user_date_input, "%d.%m.%Y")
             except ValueError:
-                logger.error("Неверный формат даты. Используется текущая дата.")
-                analysis_date = datetime.now()
-        else:
-            analysis_date = datetime.now()
-
-        file_path = "../data/operations.xls"
-        result = get_card_summary(file_path, analysis_date)
+                logger.error("Неверный формат даты. Используются все операции.")
 
-        stock_symbols = ["AAPL", "AMZN", "GOOGL", "MSFT", "TSLA"]
-        stock_prices = get_stock_prices(stock_symbols)
-
-        result["stock_prices"] = stock_prices
+        result = run_dashboard(file_path, user_request, output_file, analysis_date, STOCK_SYMBOLS)
+        print(f"Результаты поиска сохранены в файл: {output_file}")
 
         print(json.dumps(result, ensure_ascii=False, indent=2))
 
         # Пример использования функций из reports.py
-        main_reports()
+        main_reports(file_path)
+
+        logger.info("Метрики стадий: %s", json.dumps(metrics_summary(), ensure_ascii=False))
+        if os.getenv(PROFILE_ENV):
+            write_profile_report("profile_report.txt")
 
     except Exception as e:
         logger.exception("Ошибка при выполнении программы: %s", str(e))
 
 
 if __name__ == "__main__":
+    if len(sys.argv) > 1:
+        from src.cli import main as cli_main
+
+        sys.exit(cli_main(sys.argv[1:]))
     main()
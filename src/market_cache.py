@@ -0,0 +1,275 @@
+import logging
+import os
+import shelve
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Callable, Optional
+
+logger = logging.getLogger(__name__)
+
+# Время жизни данных по источникам, в секундах
+CURRENCY_RATES_TTL = 6 * 60 * 60  # курсы ЦБ меняются раз в сутки
+STOCK_QUOTES_TTL = 15 * 60
+
+# Сколько времени после истечения TTL можно отдавать устаревшее значение, обновляя его в фоне
+CURRENCY_RATES_STALE_TTL = 24 * 60 * 60
+STOCK_QUOTES_STALE_TTL = 60 * 60
+
+# Путь к дисковому кешу (shelve); если не задан, кеш хранится только в памяти процесса
+MARKET_CACHE_PATH_ENV = "MARKET_CACHE_PATH"
+
+FRESH = "fresh"
+STALE = "stale"
+EXPIRED = "expired"
+MISS = "miss"
+
+
+class MemoryBackend:
+    """
+    Хранилище в памяти процесса с вытеснением давно не использованных записей (LRU).
+    """
+
+    def __init__(self, maxsize: int = 1024) -> None:
+        self.maxsize = maxsize
+        self._data: OrderedDict = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key: str) -> Optional[tuple]:
+        with self._lock:
+            entry = self._data.get(key)
+            if entry is not None:
+                self._data.move_to_end(key)
+            return entry
+
+    def set(self, key: str, entry: tuple) -> None:
+        with self._lock:
+            self._data[key] = entry
+            self._data.move_to_end(key)
+            while len(self._data) > self.maxsize:
+                self._data.popitem(last=False)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._data.clear()
+
+
+class ShelveBackend:
+    """
+    Дисковое хранилище на shelve поверх LRU в памяти: переживает перезапуск процесса.
+    """
+
+    def __init__(self, path: str, maxsize: int = 1024) -> None:
+        self.path = path
+        self._memory = MemoryBackend(maxsize)
+        self._lock = threading.Lock()
+
+    def get(self, key: str) -> Optional[tuple]:
+        entry = self._memory.get(key)
+        if entry is not None:
+            return entry
+        with self._lock:
+            try:
+                with shelve.open(self.path, "r") as db:
+                    entry = db.get(key)
+            except Exception:
+                return None
+        if entry is not None:
+            self._memory.set(key, entry)
+        return entry
+
+    def set(self, key: str, entry: tuple) -> None:
+        self._memory.set(key, entry)
+        with self._lock:
+            try:
+                with shelve.open(self.path) as db:
+                    db[key] = entry
+            except Exception as e:
+                logger.warning("Не удалось сохранить кеш %s: %s", self.path, str(e))
+
+    def clear(self) -> None:
+        self._memory.clear()
+        with self._lock:
+            try:
+                with shelve.open(self.path, "n"):
+                    pass
+            except Exception as e:
+                logger.warning("Не удалось очистить кеш %s: %s", self.path, str(e))
+
+
+def default_backend() -> Any:
+    """
+    Хранилище по умолчанию: shelve, если задан MARKET_CACHE_PATH, иначе память процесса.
+    """
+    path = os.getenv(MARKET_CACHE_PATH_ENV)
+    return ShelveBackend(path) if path else MemoryBackend()
+
+
+class TTLCache:
+    """
+    Кеш с временем жизни записей, фоновым обновлением устаревших значений
+    (stale-while-revalidate) и выдачей устаревшего значения при ошибке источника.
+    """
+
+    def __init__(self, name: str, ttl: float, stale_ttl: float = 0, backend: Any = None) -> None:
+        self.name = name
+        self.ttl = ttl
+        self.stale_ttl = stale_ttl
+        self.backend = backend if backend is not None else default_backend()
+        self.stats = {"hits": 0, "stale_hits": 0, "misses": 0, "errors": 0, "stale_on_error": 0}
+        self._refreshing: set = set()
+        self._lock = threading.Lock()
+
+    def _count(self, counter: str) -> None:
+        with self._lock:
+            self.stats[counter] += 1
+
+    def lookup(self, key: str) -> tuple:
+        """
+        Поиск значения по ключу.
+
+        Returns:
+            Кортеж (состояние, значение): состояние "fresh", "stale", "expired" или "miss".
+        """
+        entry = self.backend.get(f"{self.name}:{key}")
+        if entry is None:
+            return MISS, None
+        stored_at, value = entry
+        age = time.time() - stored_at
+        if age < self.ttl:
+            return FRESH, value
+        if age < self.ttl + self.stale_ttl:
+            return STALE, value
+        return EXPIRED, value
+
+    def set(self, key: str, value: Any) -> None:
+        """
+        Сохранение значения с текущим временем.
+        """
+        self.backend.set(f"{self.name}:{key}", (time.time(), value))
+
+    def refresh_in_background(self, keys: list, fetch_many: Callable[[list], dict]) -> None:
+        """
+        Фоновое обновление значений; ключи, которые уже обновляются, пропускаются.
+        """
+        with self._lock:
+            keys = [key for key in keys if key not in self._refreshing]
+            self._refreshing.update(keys)
+        if not keys:
+            return
+
+        def refresh() -> None:
+            try:
+                for key, value in fetch_many(keys).items():
+                    self.set(key, value)
+            except Exception as e:
+                self._count("errors")
+                logger.warning("Не удалось обновить %s %s: %s", self.name, keys, str(e))
+            finally:
+                with self._lock:
+                    self._refreshing.difference_update(keys)
+
+        threading.Thread(target=refresh, daemon=True).start()
+
+    def get_or_fetch_many(self, keys: list, fetch_many: Callable[[list], dict]) -> dict:
+        """
+        Значения для набора ключей: из кеша, а недостающие - одним вызовом fetch_many.
+
+        Свежие значения отдаются сразу; устаревшие - сразу, с обновлением в фоне;
+        отсутствующие и просроченные запрашиваются у источника. Если источник не вернул
+        значение (или упал), а в кеше есть просроченное, отдается оно.
+
+        Args:
+            keys: Ключи.
+            fetch_many: Функция, получающая значения из источника: список ключей -> словарь
+                ключ -> значение (ключи, которые получить не удалось, в словаре отсутствуют).
+
+        Returns:
+            Словарь ключ -> значение; ключи, для которых значения нет, отсутствуют.
+        """
+        result = {}
+        stale_keys = []
+        missing = {}
+        for key in keys:
+            state, value = self.lookup(key)
+            if state == FRESH:
+                self._count("hits")
+                result[key] = value
+            elif state == STALE:
+                self._count("stale_hits")
+                result[key] = value
+                stale_keys.append(key)
+            else:
+                self._count("misses")
+                missing[key] = (state, value)
+
+        if stale_keys:
+            self.refresh_in_background(stale_keys, fetch_many)
+        if not missing:
+            return result
+
+        try:
+            fetched = fetch_many(list(missing))
+        except Exception as e:
+            logger.warning("Источник %s недоступен: %s", self.name, str(e))
+            fetched = {}
+        for key, (state, value) in missing.items():
+            if key in fetched:
+                self.set(key, fetched[key])
+                result[key] = fetched[key]
+                continue
+            self._count("errors")
+            if state == EXPIRED:
+                self._count("stale_on_error")
+                logger.warning("Источник %s недоступен, используется устаревшее значение %s", self.name, key)
+                result[key] = value
+        return result
+
+    def get_or_fetch(self, key: str, fetch: Callable[[], Any]) -> Any:
+        """
+        Значение из кеша или из источника (см. get_or_fetch_many).
+
+        Raises:
+            Исключение fetch, если отдать нечего.
+        """
+        errors = []
+
+        def fetch_many(keys: list) -> dict:
+            try:
+                return {key: fetch()}
+            except Exception as e:
+                errors.append(e)
+                raise
+
+        result = self.get_or_fetch_many([key], fetch_many)
+        if key not in result:
+            raise errors[0] if errors else LookupError(key)
+        return result[key]
+
+    def clear(self) -> None:
+        """
+        Очистка кеша и счетчиков.
+        """
+        self.backend.clear()
+        with self._lock:
+            for counter in self.stats:
+                self.stats[counter] = 0
+
+
+currency_rates_cache = TTLCache("currency_rates", CURRENCY_RATES_TTL, CURRENCY_RATES_STALE_TTL)
+stock_quotes_cache = TTLCache("stock_quotes", STOCK_QUOTES_TTL, STOCK_QUOTES_STALE_TTL)
+
+
+def get_cache_stats() -> dict:
+    """
+    Счетчики попаданий и промахов кешей рыночных данных для мониторинга.
+    """
+    return {cache.name: dict(cache.stats) for cache in (currency_rates_cache, stock_quotes_cache)}
+
+
+def clear_market_caches() -> None:
+    """
+    Очистка кешей рыночных данных.
+    """
+    currency_rates_cache.clear()
+    stock_quotes_cache.clear()
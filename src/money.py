@@ -0,0 +1,101 @@
+from typing import Any, NamedTuple, Optional
+
+import numpy as np
+import pandas as pd
+
+KOPECKS_PER_RUBLE = 100
+
+
+class CashbackRule(NamedTuple):
+    """
+    Правило кешбэка: reward копеек за каждые полные step копеек трат (округление вниз).
+    """
+
+    step: int = 100 * KOPECKS_PER_RUBLE
+    reward: int = 1 * KOPECKS_PER_RUBLE
+
+
+# Правила кешбэка по категориям; ключ None - правило для остальных категорий (1 рубль за каждые 100 рублей)
+DEFAULT_CASHBACK_RULES: dict = {None: CashbackRule()}
+
+
+def to_kopecks(amounts: Any) -> np.ndarray:
+    """
+    Суммы в рублях (float) в целые копейки; пустые значения - 0.
+    """
+    values = pd.to_numeric(pd.Series(amounts), errors="coerce").fillna(0).to_numpy(dtype=np.float64)
+    return np.asarray(np.round(values * KOPECKS_PER_RUBLE), dtype=np.int64)
+
+
+def to_rubles(kopecks: Any) -> float:
+    """
+    Сумма в копейках (целое) в рубли для вывода в JSON.
+    """
+    return int(kopecks) / KOPECKS_PER_RUBLE
+
+
+def split_spending(kopecks: np.ndarray) -> tuple:
+    """
+    Разделение операций на траты и поступления (возвраты, пополнения).
+
+    Returns:
+        Кортеж массивов (траты, поступления) в копейках, оба неотрицательные.
+    """
+    spent = np.where(kopecks < 0, -kopecks, 0)
+    refunds = np.where(kopecks > 0, kopecks, 0)
+    return spent, refunds
+
+
+def cashback_kopecks(categories: Any, spent: Any, rules: Optional[dict] = None) -> np.ndarray:
+    """
+    Кешбэк по группам трат: для каждой группы правило выбирается по ее категории.
+
+    Args:
+        categories: Категории групп.
+        spent: Траты групп в копейках.
+        rules: Правила по категориям (по умолчанию - DEFAULT_CASHBACK_RULES).
+
+    Returns:
+        Массив кешбэка в копейках по группам.
+    """
+    rules = DEFAULT_CASHBACK_RULES if rules is None else rules
+    categories = pd.Series(categories, dtype=object)
+    spent = np.asarray(spent, dtype=np.int64)
+    default = rules.get(None, CashbackRule())
+    steps = np.full(len(spent), default.step, dtype=np.int64)
+    rewards = np.full(len(spent), default.reward, dtype=np.int64)
+    for category, rule in rules.items():
+        if category is None:
+            continue
+        mask = (categories == category).to_numpy()
+        steps[mask] = rule.step
+        rewards[mask] = rule.reward
+    result = np.zeros(len(spent), dtype=np.int64)
+    active = steps > 0
+    result[active] = (spent[active] // steps[active]) * rewards[active]
+    return result
+
+
+def group_money(cards: Any, categories: Any, kopecks: np.ndarray) -> pd.DataFrame:
+    """
+    Суммы операций по парам (карта, категория) целочисленным сложением.
+
+    Args:
+        cards: Номера карт (пустые - операции без карты).
+        categories: Категории (пустые - без категории).
+        kopecks: Суммы операций в копейках.
+
+    Returns:
+        DataFrame с индексом (card, category) и колонками net, spent, refunds (int64) в порядке первого появления.
+    """
+    spent, refunds = split_spending(kopecks)
+    frame = pd.DataFrame(
+        {
+            "card": pd.Series(cards, dtype=object).to_numpy(),
+            "category": pd.Series(categories, dtype=object).to_numpy(),
+            "net": kopecks,
+            "spent": spent,
+            "refunds": refunds,
+        }
+    )
+    return frame.groupby(["card", "category"], sort=False, dropna=False)[["net", "spent", "refunds"]].sum()
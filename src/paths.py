@@ -0,0 +1,34 @@
+import os
+from typing import Any, Optional
+
+# Модуль использует только стандартную библиотеку: его импортирует CLI до загрузки pandas
+
+# Файл операций по умолчанию (путь не зависит от текущей рабочей директории)
+DEFAULT_OPERATIONS_FILE = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "data", "operations.xls")
+
+# Директория дискового кеша (по умолчанию - ".cache" рядом с исходным файлом)
+CACHE_DIR_ENV = "OPERATIONS_CACHE_DIR"
+
+
+def source_key(file_path: Any) -> Optional[tuple]:
+    """
+    Ключ версии исходного файла: (абсолютный путь, mtime в наносекундах, размер).
+
+    Args:
+        file_path: Путь к файлу операций.
+
+    Returns:
+        Кортеж-ключ или None, если файл недоступен.
+    """
+    try:
+        stat = os.stat(file_path)
+    except (OSError, TypeError, ValueError):
+        return None
+    return os.path.abspath(file_path), stat.st_mtime_ns, stat.st_size
+
+
+def get_cache_dir(file_path: Any) -> str:
+    """
+    Директория дискового кеша для заданного файла операций.
+    """
+    return os.environ.get(CACHE_DIR_ENV) or os.path.join(os.path.dirname(os.path.abspath(file_path)), ".cache")
@@ -0,0 +1,153 @@
+import logging
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Optional
+
+import requests
+
+from src.instrumentation import stage_timer
+from src.transport import FixtureNotFoundError, get_transport
+
+logger = logging.getLogger(__name__)
+
+ALPHAVANTAGE_URL = "https://www.alphavantage.co/query"
+
+# Параметры запросов по умолчанию
+DEFAULT_TIMEOUT = 10.0
+DEFAULT_MAX_WORKERS = 5
+DEFAULT_MAX_RETRIES = 3
+DEFAULT_BACKOFF = 0.5
+
+# HTTP-статусы, после которых запрос стоит повторить
+RETRY_STATUSES = {429, 500, 502, 503, 504}
+
+NOT_AVAILABLE = "Not available"
+
+
+class RateLimiter:
+    """
+    Ограничитель частоты запросов: не больше requests_per_minute стартов запросов в минуту.
+    """
+
+    def __init__(self, requests_per_minute: Optional[float] = None) -> None:
+        self.interval = 60.0 / requests_per_minute if requests_per_minute else 0.0
+        self._next_slot = 0.0
+        self._lock = threading.Lock()
+
+    def wait(self) -> None:
+        """
+        Ожидание очередного разрешенного слота для запроса.
+        """
+        if not self.interval:
+            return
+        with self._lock:
+            now = time.monotonic()
+            slot = max(now, self._next_slot)
+            self._next_slot = slot + self.interval
+        if slot > now:
+            time.sleep(slot - now)
+
+
+class RetryableError(Exception):
+    """
+    Временная ошибка провайдера, после которой запрос можно повторить.
+    """
+
+
+def fetch_quote(
+    symbol: str,
+    api_key: str,
+    base_url: str = ALPHAVANTAGE_URL,
+    session: Any = None,
+    timeout: float = DEFAULT_TIMEOUT,
+    max_retries: int = DEFAULT_MAX_RETRIES,
+    backoff: float = DEFAULT_BACKOFF,
+    rate_limiter: Optional[RateLimiter] = None,
+) -> dict:
+    """
+    Получение котировки одной акции с таймаутом и повторами с экспоненциальной задержкой.
+
+    Args:
+        symbol: Тикер акции.
+        api_key: Ключ API Alpha Vantage.
+        base_url: Адрес API.
+        session: HTTP-сессия или транспорт с методом get (по умолчанию - транспорт процесса, см. transport.py).
+        timeout: Таймаут одного запроса в секундах.
+        max_retries: Число повторов после первой неудачной попытки.
+        backoff: Базовая задержка перед повтором в секундах (удваивается с каждой попыткой).
+        rate_limiter: Ограничитель частоты запросов.
+
+    Returns:
+        Словарь {"symbol": тикер, "price": цена или "Not available"}.
+    """
+    session = session or get_transport()
+    params = {"function": "GLOBAL_QUOTE", "symbol": symbol, "apikey": api_key}
+    for attempt in range(max_retries + 1):
+        if rate_limiter is not None:
+            rate_limiter.wait()
+        try:
+            with stage_timer("http_alpha_vantage", symbol=symbol, attempt=attempt) as record:
+                response = session.get(base_url, params=params, timeout=timeout)
+                record["status"] = response.status_code
+            if response.status_code in RETRY_STATUSES:
+                raise RetryableError(f"HTTP {response.status_code}")
+            data = response.json()
+            if "Note" in data or "Information" in data:
+                # Так Alpha Vantage сообщает о превышении лимита запросов
+                raise RetryableError(data.get("Note") or data.get("Information"))
+            if "Global Quote" in data:
+                return {"symbol": symbol, "price": float(data["Global Quote"]["05. price"])}
+            return {"symbol": symbol, "price": NOT_AVAILABLE}
+        except (requests.RequestException, RetryableError) as e:
+            if attempt == max_retries:
+                logger.error("Не удалось получить цену %s: %s", symbol, str(e))
+                break
+            delay = backoff * 2**attempt
+            logger.warning("Ошибка при получении цены %s (%s), повтор через %.1f с", symbol, str(e), delay)
+            time.sleep(delay)
+        except FixtureNotFoundError as e:
+            logger.error("Нет записанного ответа для %s: %s", symbol, str(e))
+            break
+        except (KeyError, TypeError, ValueError) as e:
+            logger.error("Некорректный ответ для %s: %s", symbol, str(e))
+            break
+    return {"symbol": symbol, "price": NOT_AVAILABLE}
+
+
+def fetch_quotes(
+    symbols: Any,
+    api_key: str,
+    base_url: str = ALPHAVANTAGE_URL,
+    max_workers: int = DEFAULT_MAX_WORKERS,
+    requests_per_minute: Optional[float] = None,
+    **kwargs: Any,
+) -> list:
+    """
+    Параллельное получение котировок с ограничением числа одновременных запросов.
+
+    Args:
+        symbols: Список тикеров.
+        api_key: Ключ API Alpha Vantage.
+        base_url: Адрес API.
+        max_workers: Максимальное число одновременных запросов.
+        requests_per_minute: Лимит запросов в минуту по тарифу провайдера (None - без ограничения).
+        **kwargs: Параметры fetch_quote (timeout, max_retries, backoff).
+
+    Returns:
+        Список словарей {"symbol", "price"} в порядке исходных тикеров.
+    """
+    symbols = list(symbols)
+    if not symbols:
+        return []
+    session = get_transport(max_workers)
+    rate_limiter = RateLimiter(requests_per_minute)
+    with ThreadPoolExecutor(max_workers=min(max_workers, len(symbols))) as executor:
+        return list(
+            executor.map(
+                lambda symbol: fetch_quote(
+                    symbol, api_key, base_url, session=session, rate_limiter=rate_limiter, **kwargs
+                ),
+                symbols,
+            )
+        )
@@ -1,61 +1,233 @@
-import json
 import logging
 from datetime import datetime, timedelta
-from typing import Any
+from typing import Any, Iterable, Iterator, Optional
 
+import numpy as np
 import pandas as pd
 
+from src.chunked import iter_operation_batches
+from src.cube import load_cube
+from src.database import BACKEND_MEMORY, BACKEND_SQLITE, BACKENDS, load_database
+from src.date_index import CategoryDateIndex, build_category_date_index, parse_dates
+from src.instrumentation import annotate, instrumented
+from src.store import DEFAULT_OPERATIONS_FILE, load_artifact, load_operations
+from src.writers import FORMAT_JSON, iter_records, write_json_stream
+
 logger = logging.getLogger(__name__)
 
+# Длина периода отчета по умолчанию (3 месяца)
+REPORT_PERIOD_DAYS = 90
+
 
 def read_transactions_xlsx(file_path: str) -> pd.DataFrame:
     """
     Чтение финансовых операций из XLSX-файла.
     """
-    logger.info(f"Чтение данных из файла {file_path}")
     try:
-        return pd.read_excel(file_path)  # Читаем файл Excel с помощью Pandas
+        return load_operations(file_path)  # Файл разбирается один раз за процесс
     except FileNotFoundError:
         logger.error(f"Файл {file_path} не найден")
         return pd.DataFrame()  # Возвращаем пустой DataFrame в случае ошибки
 
 
-def filter_transactions_by_category_and_date(transactions: pd.DataFrame, category: str, start_date: str) -> Any:
+def report_period(start_date: str, days: int = REPORT_PERIOD_DAYS, end_date: Optional[str] = None) -> tuple:
+    """
+    Границы периода отчета [начало, конец) по датам в формате DD.MM.YYYY.
+
+    Args:
+        start_date: Дата начала периода.
+        days: Длина периода в днях, если конец не задан.
+        end_date: Дата конца периода (не включительно).
+
+    Returns:
+        Кортеж (начало, конец) из datetime.
+    """
+    start = datetime.strptime(start_date, "%d.%m.%Y")
+    end = datetime.strptime(end_date, "%d.%m.%Y") if end_date else start + timedelta(days=days)
+    return start, end
+
+
+def select_transactions_by_category_and_date(
+    transactions: pd.DataFrame,
+    category: str,
+    start_date: str,
+    days: int = REPORT_PERIOD_DAYS,
+    end_date: Optional[str] = None,
+    index: Optional[CategoryDateIndex] = None,
+) -> pd.DataFrame:
+    """
+    Выборка транзакций по категории и дате в виде DataFrame (без преобразования в словари).
+
+    С готовым индексом (см. read_category_date_index) выборка - двоичный поиск по отсортированным датам.
+    Без индекса выполняется один проход маской и сортируются только найденные строки: строить индекс
+    (полную сортировку) ради одного запроса дороже. Результат упорядочен по дате платежа.
+    """
+    start, end = report_period(start_date, days, end_date)
+    if index is not None:
+        return transactions.iloc[index.select(category, start, end)]
+    if "category" not in transactions.columns or "data_payment" not in transactions.columns:
+        return transactions.iloc[:0]
+    dates = parse_dates(transactions["data_payment"])
+    positions = np.flatnonzero(category_period_mask(transactions, dates, category, start, end))
+    return transactions.iloc[positions[np.argsort(dates[positions], kind="stable")]]
+
+
+def filter_transactions_by_category_and_date(
+    transactions: pd.DataFrame,
+    category: str,
+    start_date: str,
+    days: int = REPORT_PERIOD_DAYS,
+    end_date: Optional[str] = None,
+) -> Any:
     """
     Фильтрация транзакций по категории и дате.
 
     Args:
         transactions: DataFrame с транзакциями.
         category: Категория для фильтрации.
-        start_date: Дата начала 3-месячного периода в формате 'YYYY-MM-DD'.
+        start_date: Дата начала периода в формате 'DD.MM.YYYY'.
+        days: Длина периода в днях (по умолчанию 90 - три месяца).
+        end_date: Дата конца периода в формате 'DD.MM.YYYY' (не включительно), вместо days.
 
     Returns:
         Список словарей с транзакциями, соответствующими запросу.
     """
-    end_date = datetime.strptime(start_date, "%d.%m.%Y") + timedelta(days=90)
-    filtered_transactions = transactions[
-        (transactions["category"] == category)
-        & (transactions["data_payment"] >= start_date)
-        & (transactions["data_payment"] < end_date.strftime("d.%m.%Y"))
-    ]
-    return filtered_transactions.to_dict("records")
+    return select_transactions_by_category_and_date(transactions, category, start_date, days, end_date).to_dict(
+        "records"
+    )
 
 
-def main_reports() -> None:
+def category_period_mask(df: pd.DataFrame, dates: np.ndarray, category: str, start: Any, end: Any) -> np.ndarray:
     """
-    Главная функция модуля.
+    Маска операций категории с датой платежа (dates, см. date_index.parse_dates) в полуинтервале [start, end).
     """
-    operations = read_transactions_xlsx("../data/operations.xls")
-    category = input("Введите категорию трат (первая буква - заглавная): ")
-    start_date = input("Введите дату начала периода длинной в 3 месяца(DD.MM.YYYY): ")
+    bounds = np.array([pd.Timestamp(start), pd.Timestamp(end)], dtype="datetime64[ns]")
+    mask = (df["category"] == category).to_numpy(dtype=bool, na_value=False) & (dates >= bounds[0]) & (dates < bounds[1])
+    return np.asarray(mask, dtype=bool)
 
-    filtered_operations = filter_transactions_by_category_and_date(operations, category, start_date)
 
-    with open("filter.json", "w", encoding="utf-8") as f:
-        json.dump(filtered_operations, f, indent=4, ensure_ascii=False)
+def filter_batches_by_category_and_date(
+    batches: Iterable[pd.DataFrame], category: str, start: datetime, end: datetime
+) -> Iterator[dict]:
+    """
+    Фильтрация порций операций по категории и периоду [start, end) с выдачей найденных записей по мере чтения.
 
-    logger.info("Отфильтрованные операции записаны в файл filter.json")
-    print("Отфильтрованные операции записаны в файл filter.json")
+    Args:
+        batches: Порции операций (см. chunked.iter_operation_batches).
+        category: Категория для фильтрации.
+        start: Начало периода.
+        end: Конец периода (не включительно).
+
+    Yields:
+        Словарь с данными операции.
+    """
+    for batch in batches:
+        if "category" not in batch.columns or "data_payment" not in batch.columns:
+            continue
+        mask = category_period_mask(batch, parse_dates(batch["data_payment"]), category, start, end)
+        yield from iter_records(batch, np.flatnonzero(mask))
+
+
+def read_category_date_index(file_path: str, operations: pd.DataFrame) -> CategoryDateIndex:
+    """
+    Индекс по категории и дате платежа из кеша рядом с данными (строится при изменении файла).
+    """
+    try:
+        index: CategoryDateIndex = load_artifact(file_path, "category_dates", build_category_date_index)
+        return index
+    except Exception as e:
+        logger.error(f"Ошибка при построении индекса для файла {file_path}: {e}")
+        return CategoryDateIndex(operations)
+
+
+def category_period_summary(
+    category: str,
+    start_date: str,
+    days: int = REPORT_PERIOD_DAYS,
+    end_date: Optional[str] = None,
+    card: Optional[str] = None,
+    file_path: str = DEFAULT_OPERATIONS_FILE,
+) -> dict:
+    """
+    Итоги трат по категории за период по предрасчитанному кубу (см. cube.SpendingCube), без просмотра операций.
+
+    Returns:
+        Словарь {"category", "start", "end", "total", "spent", "count", "monthly"}.
+    """
+    start, end = report_period(start_date, days, end_date)
+    cube = load_cube(file_path)
+    return {
+        "category": category,
+        "start": start.strftime("%d.%m.%Y"),
+        "end": end.strftime("%d.%m.%Y"),
+        **cube.query(category, start, end, card),
+        "monthly": cube.monthly(category, start, end, card),
+    }
+
+
+def write_category_report(
+    category: str,
+    start_date: str,
+    file_path: str = DEFAULT_OPERATIONS_FILE,
+    output_file: str = "filter.json",
+    output_format: str = FORMAT_JSON,
+    indent: Optional[int] = 4,
+    compress: bool = False,
+    days: int = REPORT_PERIOD_DAYS,
+    batch_size: Optional[int] = None,
+    backend: str = BACKEND_MEMORY,
+) -> int:
+    """
+    Запись трат по категории за период в файл без запросов к пользователю.
+
+    Отфильтрованные операции пишутся в файл потоково, порциями (см. writers.write_json_stream).
+    С batch_size файл читается порциями (см. chunked.iter_operation_batches) без загрузки целиком.
+    С backend="sqlite" выборка - запрос к базе SQLite по индексу (category, data_payment), см. database.py.
+
+    Returns:
+        Число записанных операций.
+    """
+    if backend not in BACKENDS:
+        raise ValueError(f"Неизвестный источник данных: {backend}")
+    start, end = report_period(start_date, days)
+
+    if backend == BACKEND_SQLITE:
+        records = iter_records(load_database(file_path).select_category(category, start, end))
+    elif batch_size:
+        records = filter_batches_by_category_and_date(iter_operation_batches(file_path, batch_size), category, start, end)
+    else:
+        operations = read_transactions_xlsx(file_path)
+        index = read_category_date_index(file_path, operations)
+        records = iter_records(operations, index.select(category, start, end))
+    rows = write_json_stream(records, output_file, output_format, indent, compress)
+    annotate(rows=rows)
+
+    logger.info(f"Отфильтрованные операции записаны в файл {output_file}")
+    return rows
+
+
+@instrumented()
+def main_reports(
+    file_path: str = DEFAULT_OPERATIONS_FILE,
+    output_file: str = "filter.json",
+    output_format: str = FORMAT_JSON,
+    indent: Optional[int] = 4,
+    compress: bool = False,
+    days: int = REPORT_PERIOD_DAYS,
+    batch_size: Optional[int] = None,
+    backend: str = BACKEND_MEMORY,
+) -> None:
+    """
+    Главная функция модуля.
+
+    Запрашивает категорию и дату начала периода и записывает отчет через write_category_report.
+    """
+    category = input("Введите категорию трат (первая буква - заглавная): ")
+    start_date = input("Введите дату начала периода длинной в 3 месяца(DD.MM.YYYY): ")
+    write_category_report(
+        category, start_date, file_path, output_file, output_format, indent, compress, days, batch_size, backend
+    )
+    print(f"Отфильтрованные операции записаны в файл {output_file}")
 
 
 if __name__ == "__main__":
@@ -0,0 +1,164 @@
+import logging
+
+import numpy as np
+import pandas as pd
+
+logger = logging.getLogger(__name__)
+
+# Версия схемы; входит в имена файлов кеша, чтобы кеш старой схемы не читался
+SCHEMA_VERSION = 1
+
+# Заголовки выгрузки банка -> имена колонок, принятые в проекте
+COLUMN_ALIASES = {
+    "Дата операции": "date_operation",
+    "Дата платежа": "data_payment",
+    "Номер карты": "card_number",
+    "Статус": "status",
+    "Сумма операции": "transaction_amount",
+    "Валюта операции": "currency_operation",
+    "Сумма платежа": "payment_amount",
+    "Валюта платежа": "payment_currency",
+    "Кэшбэк": "cashback",
+    "Категория": "category",
+    "MCC": "MCC",
+    "Описание": "description",
+    "Бонусы (включая кэшбэк)": "bonuses_including_cashback",
+    "Округление на инвесткопилку": "rounding_investment_bank",
+    "Сумма операции с округлением": "amount_rounding_operation",
+}
+
+# Колонки канонической схемы в порядке выгрузки банка
+CANONICAL_COLUMNS = tuple(COLUMN_ALIASES.values())
+
+# Форматы дат выгрузки: по ним даты разбираются при загрузке и выводятся обратно в JSON
+DATE_FORMATS = {
+    "date_operation": "%d.%m.%Y %H:%M:%S",
+    "data_payment": "%d.%m.%Y",
+}
+
+AMOUNT_COLUMNS = (
+    "transaction_amount",
+    "payment_amount",
+    "cashback",
+    "MCC",
+    "bonuses_including_cashback",
+    "rounding_investment_bank",
+    "amount_rounding_operation",
+)
+
+# Строковые колонки с небольшим числом различных значений хранятся как pandas.Categorical
+CATEGORICAL_COLUMNS = ("card_number", "status", "currency_operation", "payment_currency", "category")
+
+TEXT_COLUMNS = CATEGORICAL_COLUMNS + ("description",)
+
+
+def normalize_column_names(df: pd.DataFrame) -> pd.DataFrame:
+    """
+    Приведение заголовков к именам канонической схемы (пробелы по краям, русские заголовки выгрузки банка).
+    """
+    return df.rename(columns=lambda name: COLUMN_ALIASES.get(str(name).strip(), str(name).strip()))
+
+
+def clean_text(values: pd.Series) -> pd.Series:
+    """
+    Строковая колонка без пробелов по краям; пустые строки и пропуски - NaN.
+    """
+    text = values.astype("string").str.strip()
+    text = text.mask(text.eq("").fillna(False))
+    return pd.Series(text.to_numpy(dtype=object, na_value=np.nan), index=values.index)
+
+
+def mask_card_numbers(values: pd.Series) -> pd.Series:
+    """
+    Маскирование номеров карт до вида "*1234" (последние 4 цифры); значения без цифр остаются как есть.
+    """
+    if pd.api.types.is_numeric_dtype(values):
+        values = values.astype("Int64")
+    text = clean_text(values)
+    digits = text.astype("string").str.replace(r"\D", "", regex=True).str[-4:]
+    has_digits = digits.str.len().fillna(0).to_numpy() > 0
+    masked = ("*" + digits).to_numpy(dtype=object, na_value=np.nan)
+    return pd.Series(np.where(has_digits, masked, text.to_numpy(dtype=object)), index=values.index)
+
+
+def parse_amounts(values: pd.Series) -> pd.Series:
+    """
+    Суммы в float64; строки вида "1 234,50" разбираются, нечисловые значения - NaN.
+    """
+    if not pd.api.types.is_numeric_dtype(values):
+        text = values.astype("string").str.replace(r"\s", "", regex=True).str.replace(",", ".", regex=False)
+        values = pd.Series(text.to_numpy(dtype=object, na_value=np.nan), index=values.index)
+    return pd.to_numeric(values, errors="coerce").astype(np.float64)
+
+
+def parse_datetimes(values: pd.Series, date_format: str) -> pd.Series:
+    """
+    Разбор дат выгрузки в datetime64[ns]; уже разобранные даты не трогаются, некорректные - NaT.
+    """
+    if pd.api.types.is_datetime64_any_dtype(values):
+        return values
+    parsed = pd.to_datetime(values, format=date_format, errors="coerce")
+    # Даты без времени (например, из xls) разбираются форматом только даты
+    missing = parsed.isna() & values.notna()
+    if missing.any() and " " in date_format:
+        parsed[missing] = pd.to_datetime(values[missing], format=date_format.split(" ")[0], errors="coerce")
+    return parsed.astype("datetime64[ns]")
+
+
+def normalize_operations(df: pd.DataFrame) -> pd.DataFrame:
+    """
+    Приведение операций к канонической схеме за один векторный проход.
+
+    Заголовки выгрузки переименовываются (COLUMN_ALIASES), даты разбираются в datetime64,
+    суммы - в float64, номера карт маскируются до "*1234", строки очищаются от пробелов
+    (пустые - NaN), повторяющиеся строковые значения хранятся как категории.
+    Уже нормализованный DataFrame проходит без изменений данных, так что функцию можно
+    применять повторно (например, к объединенному хранилищу из ingest.py).
+
+    Args:
+        df: Операции в том виде, в каком они прочитаны из файла.
+
+    Returns:
+        Новый DataFrame в канонической схеме.
+    """
+    df = normalize_column_names(df)
+    if df.columns.duplicated().any():
+        df = df.loc[:, ~df.columns.duplicated()]
+    columns = {}
+    for name in df.columns:
+        values = df[name]
+        if name in DATE_FORMATS:
+            values = parse_datetimes(values, DATE_FORMATS[name])
+        elif name in AMOUNT_COLUMNS:
+            values = parse_amounts(values)
+        elif name in TEXT_COLUMNS and not isinstance(values.dtype, pd.CategoricalDtype):
+            values = mask_card_numbers(values) if name == "card_number" else clean_text(values)
+            if name in CATEGORICAL_COLUMNS:
+                values = values.astype("category")
+        columns[name] = values
+    normalized = pd.DataFrame(columns, index=df.index)
+    logger.info("Операции приведены к канонической схеме: %s строк, %s колонок", len(normalized), len(columns))
+    return normalized
+
+
+def format_dates(df: pd.DataFrame) -> pd.DataFrame:
+    """
+    Колонки дат канонической схемы обратно в строки формата выгрузки (для вывода в JSON); NaT - NaN.
+    """
+    formatted = {
+        name: df[name].dt.strftime(DATE_FORMATS[name])
+        for name in DATE_FORMATS
+        if name in df.columns and pd.api.types.is_datetime64_any_dtype(df[name])
+    }
+    return df.assign(**formatted) if formatted else df
+
+
+def format_date(value: object, field: str = "data_payment") -> object:
+    """
+    Одна дата канонической схемы в строку формата выгрузки; прочие значения возвращаются как есть.
+    """
+    if value is pd.NaT:
+        return None
+    if isinstance(value, (pd.Timestamp, np.datetime64)):
+        return None if pd.isna(value) else pd.Timestamp(value).strftime(DATE_FORMATS[field])
+    return value
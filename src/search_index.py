@@ -0,0 +1,150 @@
+import logging
+from typing import Any, Iterable, Optional
+
+import numpy as np
+import pandas as pd
+
+from src.transactions import Transactions
+
+logger = logging.getLogger(__name__)
+
+# Поля, по которым выполняется поиск
+SEARCH_FIELDS = ("description", "category")
+
+# Оценки релевантности совпадения
+SCORE_EXACT = 3
+SCORE_WORD_PREFIX = 2
+SCORE_SUBSTRING = 1
+
+
+def trigrams(text: str) -> set:
+    """
+    Множество триграмм строки.
+    """
+    return {text[i : i + 3] for i in range(len(text) - 2)}
+
+
+def match_score(text: Any, query: str) -> int:
+    """
+    Оценка вхождения запроса (в нижнем регистре) в значение поля: полное совпадение,
+    совпадение с начала слова, любое вхождение; 0 - нет вхождения или значение пустое.
+    """
+    if not isinstance(text, str):
+        return 0
+    text = text.lower()
+    position = text.find(query)
+    if position < 0:
+        return 0
+    if text == query:
+        return SCORE_EXACT
+    if position == 0 or not text[position - 1].isalnum():
+        return SCORE_WORD_PREFIX
+    return SCORE_SUBSTRING
+
+
+class SearchIndex:
+    """
+    Инвертированный индекс триграмм по текстовым полям операций.
+
+    Индексируются уникальные значения полей (описания и категории сильно повторяются),
+    для каждого значения хранится массив номеров строк. Поиск подстроки сводится
+    к пересечению списков триграмм запроса и проверке только найденных кандидатов.
+    Источник - DataFrame операций или transactions.Transactions: у него в нижний регистр
+    переводятся только словари значений, а не значения каждой строки.
+    """
+
+    def __init__(self, df: Any, fields: Iterable[str] = SEARCH_FIELDS) -> None:
+        self.row_count = len(df)
+        self.texts: list = []
+        self.rows: list = []
+        postings: dict = {}
+
+        for field in fields:
+            if field not in df.columns:
+                continue
+            if isinstance(df, Transactions):
+                codes, uniques = df.lowercase_codes(field)
+            else:
+                codes, uniques = pd.factorize(df[field].astype("string").str.lower())
+            order = np.argsort(codes, kind="stable")
+            bounds = np.searchsorted(codes[order], np.arange(len(uniques) + 1))
+            for code, text in enumerate(uniques):
+                text_id = len(self.texts)
+                self.texts.append(text)
+                self.rows.append(order[bounds[code] : bounds[code + 1]])
+                for gram in trigrams(text):
+                    postings.setdefault(gram, []).append(text_id)
+
+        self.postings = {gram: np.array(ids, dtype=np.int64) for gram, ids in postings.items()}
+        logger.info("Поисковый индекс построен: %s значений, %s триграмм", len(self.texts), len(self.postings))
+
+    def _candidates(self, query: str) -> Any:
+        """
+        Номера значений, которые могут содержать запрос.
+        """
+        if len(query) < 3:
+            return range(len(self.texts))
+        lists = []
+        for gram in trigrams(query):
+            ids = self.postings.get(gram)
+            if ids is None:
+                return []
+            lists.append(ids)
+        lists.sort(key=len)
+        result = lists[0]
+        for ids in lists[1:]:
+            result = np.intersect1d(result, ids, assume_unique=True)
+            if not len(result):
+                break
+        return result
+
+    def search(self, query: str, limit: Optional[int] = None) -> np.ndarray:
+        """
+        Поиск строк, у которых запрос входит в одно из индексированных полей (без учета регистра).
+
+        Результаты ранжируются: полное совпадение поля, затем совпадение с начала слова,
+        затем любое вхождение; при равной оценке сохраняется порядок строк в файле.
+
+        Args:
+            query: Строка запроса.
+            limit: Максимальное число результатов (None - без ограничения).
+
+        Returns:
+            Массив позиций строк в DataFrame операций.
+        """
+        query = query.lower()
+        if not query:
+            matched = np.arange(self.row_count)
+            return matched[:limit] if limit is not None else matched
+
+        scores = np.zeros(self.row_count, dtype=np.int8)
+        for text_id in self._candidates(query):
+            score = match_score(self.texts[text_id], query)
+            if not score:
+                continue
+            rows = self.rows[text_id]
+            scores[rows] = np.maximum(scores[rows], score)
+
+        matched = np.flatnonzero(scores)
+        matched = matched[np.argsort(-scores[matched], kind="stable")]
+        return matched[:limit] if limit is not None else matched
+
+    def search_many(self, queries: Iterable[str], limit: Optional[int] = None) -> dict:
+        """
+        Пакетный поиск: несколько запросов за один вызов по одному индексу.
+
+        Args:
+            queries: Строки запросов.
+            limit: Максимальное число результатов на запрос.
+
+        Returns:
+            Словарь запрос -> массив позиций строк.
+        """
+        return {query: self.search(query, limit) for query in queries}
+
+
+def build_search_index(df: Any) -> SearchIndex:
+    """
+    Построение поискового индекса по полям SEARCH_FIELDS (по DataFrame или Transactions).
+    """
+    return SearchIndex(df)
@@ -0,0 +1,213 @@
+"""
+HTTP-сервис с прогретыми в памяти операциями и индексами.
+
+Запуск из корня проекта:
+
+    python -m src.server --port 8000
+
+Эндпоинты (GET, ответ - JSON):
+
+    /summary?rates=1                              сводка по картам и топ операций (rates=1 - с курсами валют)
+    /search?q=такси&limit=10&fuzzy=1              поиск по описанию и категории (fuzzy=1 - нечеткий)
+    /report?category=Такси&date=01.01.2024&days=90  траты по категории за период
+    /health                                       версия загруженного файла и число операций
+"""
+
+import argparse
+import json
+import logging
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Any, Optional
+from urllib.parse import parse_qs, urlparse
+
+import pandas as pd
+
+from src.date_index import CategoryDateIndex
+from src.fuzzy_search import FuzzyIndex
+from src.instrumentation import instrumented
+from src.reports import REPORT_PERIOD_DAYS, select_transactions_by_category_and_date
+from src.store import DEFAULT_OPERATIONS_FILE, load_operations, source_key
+from src.utils import CardAggregate, format_top_transactions, get_currency_rate, get_greeting
+from src.writers import iter_records
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_HOST = "127.0.0.1"
+DEFAULT_PORT = 8000
+
+
+class Snapshot:
+    """
+    Неизменяемый набор данных одной версии файла: операции, поисковый индекс,
+    индекс по категории и дате и готовая сводка по картам.
+    """
+
+    def __init__(self, key: Optional[tuple], df: pd.DataFrame) -> None:
+        self.key = key
+        self.df = df
+        self.search_index = FuzzyIndex(df)
+        self.category_index = CategoryDateIndex(df)
+        self.cards, self.top_transactions = CardAggregate().update(df).result()
+
+
+class OperationsData:
+    """
+    Операции файла, загружаемые один раз и перезагружаемые при изменении файла (mtime или размер).
+
+    Запросы читают текущий снимок без блокировок; перезагрузку выполняет один поток,
+    остальные до ее окончания ждут на блокировке, а не читают файл повторно.
+    """
+
+    def __init__(self, file_path: str = DEFAULT_OPERATIONS_FILE) -> None:
+        self.file_path = file_path
+        self._snapshot: Optional[Snapshot] = None
+        self._lock = threading.Lock()
+
+    @instrumented("server_reload")
+    def _load(self, key: Optional[tuple]) -> Snapshot:
+        logger.info("Загрузка операций из файла %s", self.file_path)
+        return Snapshot(key, load_operations(self.file_path))
+
+    def current(self) -> Snapshot:
+        """
+        Актуальный снимок данных (при изменении файла - перезагруженный).
+        """
+        key = source_key(self.file_path)
+        snapshot = self._snapshot
+        if snapshot is not None and snapshot.key == key:
+            return snapshot
+        with self._lock:
+            if self._snapshot is None or self._snapshot.key != key:
+                self._snapshot = self._load(key)
+            return self._snapshot
+
+
+def _param(query: dict, name: str, default: Any = None) -> Any:
+    values = query.get(name)
+    return values[0] if values else default
+
+
+def card_summary(data: OperationsData, with_rates: bool = False) -> dict:
+    """
+    Сводка по картам и топ операций в формате get_card_summary.
+    """
+    snapshot = data.current()
+    return {
+        "greeting": get_greeting(),
+        "cards": snapshot.cards,
+        "top_transactions": format_top_transactions(snapshot.top_transactions),
+        "currency_rates": get_currency_rate() if with_rates else [],
+    }
+
+
+def search(data: OperationsData, user_request: str, limit: Optional[int] = None, fuzzy: bool = False) -> list:
+    """
+    Поиск транзакций (как simple_search, но без записи в файл).
+    """
+    snapshot = data.current()
+    index = snapshot.search_index
+    positions = index.fuzzy_search(user_request, limit) if fuzzy else index.search(user_request, limit)
+    return list(iter_records(snapshot.df, positions))
+
+
+def category_report(data: OperationsData, category: str, start_date: str, days: int = REPORT_PERIOD_DAYS) -> list:
+    """
+    Транзакции категории за период (как main_reports, но без записи в файл).
+    """
+    snapshot = data.current()
+    selected = select_transactions_by_category_and_date(
+        snapshot.df, category, start_date, days, index=snapshot.category_index
+    )
+    return list(iter_records(selected))
+
+
+class OperationsHandler(BaseHTTPRequestHandler):
+    """
+    Обработчик запросов; данные берутся из server.data (OperationsData).
+    """
+
+    def do_GET(self) -> None:
+        url = urlparse(self.path)
+        query = parse_qs(url.query)
+        data = self.server.data  # type: ignore[attr-defined]
+        try:
+            if url.path == "/summary":
+                body: Any = card_summary(data, _param(query, "rates") == "1")
+            elif url.path == "/search":
+                limit = _param(query, "limit")
+                body = search(data, _param(query, "q", ""), int(limit) if limit else None, _param(query, "fuzzy") == "1")
+            elif url.path == "/report":
+                category = _param(query, "category")
+                start_date = _param(query, "date")
+                if not category or not start_date:
+                    self._send_json(400, {"error": "Нужны параметры category и date (DD.MM.YYYY)"})
+                    return
+                body = category_report(data, category, start_date, int(_param(query, "days", REPORT_PERIOD_DAYS)))
+            elif url.path == "/health":
+                snapshot = data.current()
+                body = {"file": data.file_path, "version": snapshot.key, "rows": len(snapshot.df)}
+            else:
+                self._send_json(404, {"error": f"Неизвестный адрес {url.path}"})
+                return
+        except ValueError as e:
+            self._send_json(400, {"error": str(e)})
+            return
+        except Exception as e:
+            logger.exception("Ошибка при обработке запроса %s: %s", self.path, str(e))
+            self._send_json(500, {"error": str(e)})
+            return
+        self._send_json(200, body)
+
+    def _send_json(self, status: int, body: Any) -> None:
+        payload = json.dumps(body, ensure_ascii=False, default=str).encode("utf-8")
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json; charset=utf-8")
+        self.send_header("Content-Length", str(len(payload)))
+        self.end_headers()
+        self.wfile.write(payload)
+
+    def log_message(self, format: str, *args: Any) -> None:
+        logger.debug(format, *args)
+
+
+def make_server(
+    file_path: str = DEFAULT_OPERATIONS_FILE, host: str = DEFAULT_HOST, port: int = DEFAULT_PORT
+) -> ThreadingHTTPServer:
+    """
+    Создание многопоточного HTTP-сервера; операции загружаются сразу, до первого запроса.
+
+    Args:
+        file_path: Путь к файлу операций.
+        host: Адрес.
+        port: Порт (0 - любой свободный).
+
+    Returns:
+        Сервер с атрибутом data (OperationsData); запуск - serve_forever().
+    """
+    server = ThreadingHTTPServer((host, port), OperationsHandler)
+    server.data = OperationsData(file_path)  # type: ignore[attr-defined]
+    server.data.current()  # type: ignore[attr-defined]
+    return server
+
+
+def main(argv: Optional[list] = None) -> None:
+    parser = argparse.ArgumentParser(description="HTTP-сервис анализа операций")
+    parser.add_argument("--file", default=DEFAULT_OPERATIONS_FILE, help="файл операций")
+    parser.add_argument("--host", default=DEFAULT_HOST)
+    parser.add_argument("--port", type=int, default=DEFAULT_PORT)
+    args = parser.parse_args(argv)
+
+    server = make_server(args.file, args.host, args.port)
+    logger.info("Сервис запущен на http://%s:%s", args.host, server.server_address[1])
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+
+
+if __name__ == "__main__":
+    logging.basicConfig(level=logging.INFO, format="%(asctime)s - %(levelname)s - %(message)s")
+    main()
@@ -1,58 +1,155 @@
 import json
 import logging
-from typing import Any
+from typing import Any, Iterable, Iterator, Optional
+import numpy as np
 import pandas as pd
 
+from src.chunked import iter_operation_batches
+from src.database import BACKEND_MEMORY, BACKEND_SQLITE, BACKENDS, load_database
+from src.fuzzy_search import FuzzyIndex, build_fuzzy_index
+from src.instrumentation import annotate, instrumented
+from src.search_index import SEARCH_FIELDS, SearchIndex, build_search_index
+from src.store import DEFAULT_OPERATIONS_FILE, load_artifact
+from src.transactions import Transactions, load_transactions
+from src.writers import FORMAT_JSON, iter_records, write_json_stream
+
 # Настройка логгера
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
 
-def read_transactions_xlsx_file(file_path: str) -> list:
+def read_transactions_xlsx_file(file_path: str) -> Transactions:
     """
-    Чтение транзакций из файла XLSX и возврат данных в формате списка словарей.
+    Чтение транзакций из файла XLSX в компактное представление (см. transactions.Transactions);
+    строки доступны как словари через ленивые представления.
     """
     try:
-        df = pd.read_excel(file_path)
-        return df.to_dict(orient="records")
+        return load_transactions(file_path)
     except pd.errors.EmptyDataError:
         logger.error(f"Файл {file_path} пустой или не содержит данных")
-        return []
     except FileNotFoundError:
         logger.error(f"Файл {file_path} не найден")
-        return []
     except Exception as e:
         logger.error(f"Ошибка при чтении файла {file_path}: {e}")
-        return []
+    return Transactions.from_frame(pd.DataFrame())
+
+
+def read_search_index(file_path: str, fuzzy: bool = False) -> tuple:
+    """
+    Загрузка операций (transactions.Transactions) и поискового индекса по ним
+    (с fuzzy - индекса нечеткого поиска FuzzyIndex).
+
+    Индекс строится по словарям значений Transactions один раз и хранится в кеше рядом с данными;
+    при изменении файла он перестраивается.
+    """
+    try:
+        transactions = load_transactions(file_path)
+        if fuzzy:
+            return transactions, load_artifact(file_path, "fuzzy_search", lambda df: build_fuzzy_index(transactions))
+        return transactions, load_artifact(file_path, "search", lambda df: build_search_index(transactions))
+    except FileNotFoundError:
+        logger.error(f"Файл {file_path} не найден")
+    except Exception as e:
+        logger.error(f"Ошибка при чтении файла {file_path}: {e}")
+    transactions = Transactions.from_frame(pd.DataFrame())
+    return transactions, FuzzyIndex(transactions) if fuzzy else SearchIndex(transactions)
+
+
+def read_database_search(file_path: str, user_request: str, limit: Optional[int] = None) -> pd.DataFrame:
+    """
+    Поиск транзакций запросом к базе SQLite (база строится при первом обращении к версии файла).
+    """
+    try:
+        return load_database(file_path).search(user_request, limit)
+    except FileNotFoundError:
+        logger.error(f"Файл {file_path} не найден")
+    except Exception as e:
+        logger.error(f"Ошибка при поиске в базе для файла {file_path}: {e}")
+    return pd.DataFrame()
+
+
+def search_batches(batches: Iterable[pd.DataFrame], user_request: str, limit: Optional[int] = None) -> Iterator[dict]:
+    """
+    Поиск по порциям операций без построения индекса: каждая порция проверяется векторно и сразу отдается.
+
+    Результаты идут в порядке строк файла (без ранжирования).
+    """
+    found = 0
+    for batch in batches:
+        mask = pd.Series(False, index=batch.index)
+        for field in SEARCH_FIELDS:
+            if field in batch.columns:
+                mask |= batch[field].astype("string").str.contains(user_request, case=False, regex=False, na=False)
+        positions = np.flatnonzero(mask.to_numpy())
+        if limit is not None:
+            positions = positions[: limit - found]
+        found += len(positions)
+        yield from iter_records(batch, positions)
+        if limit is not None and found >= limit:
+            return
 
 
-def simple_search(user_request: str, file_path: str, output_file: str) -> None:
+@instrumented()
+def simple_search(
+    user_request: str,
+    file_path: str,
+    output_file: str,
+    limit: Optional[int] = None,
+    output_format: str = FORMAT_JSON,
+    indent: Optional[int] = 4,
+    compress: bool = False,
+    batch_size: Optional[int] = None,
+    fuzzy: bool = False,
+    backend: str = BACKEND_MEMORY,
+) -> None:
     """
     Функция выполняет простой поиск по данным транзакций и записывает результат в файл JSON.
+
+    Поиск идет по описанию и категории без учета регистра через индекс триграмм;
+    результаты упорядочены по релевантности, limit ограничивает их число.
+    Найденные транзакции пишутся в файл потоково, порциями (см. writers.write_json_stream):
+    output_format - "json" или "jsonl", indent=None - компактная запись, compress - сжатие gzip.
+    С batch_size файл читается порциями (см. chunked.iter_operation_batches) и просматривается без индекса,
+    так что объем памяти не зависит от размера файла; результаты тогда идут в порядке строк файла.
+    С fuzzy=True поиск нечеткий (см. fuzzy_search.FuzzyIndex): учитываются словоформы и опечатки;
+    он всегда идет по индексу, batch_size при этом не используется.
+    С backend="sqlite" поиск выполняется запросом к базе SQLite (см. database.OperationsDatabase.search)
+    с полнотекстовым индексом FTS5; результаты и их порядок те же, что у индекса в памяти.
     """
     logger.info("start simple_search")
-    python_data = read_transactions_xlsx_file(file_path)
-    data = []
-    for transaction in python_data:
-        # Поиск по описанию и категории (учитывая регистр)
-        if (user_request.lower() in str(transaction.get("Описание", "")).lower()) or (
-            user_request.lower() in str(transaction.get("Категория", "")).lower()
-        ):
-            data.append(transaction)
-
-        # Обработка пустых значений (NaN) в данных
-        for key, value in transaction.items():
-            if pd.isna(value):
-                transaction[key] = None
-
-    # Запись результатов поиска в файл JSON
+    if backend not in BACKENDS:
+        raise ValueError(f"Неизвестный источник данных: {backend}")
+    if fuzzy:
+        transactions, index = read_search_index(file_path, fuzzy=True)
+        records = transactions.iter_records(index.fuzzy_search(user_request, limit))
+    elif backend == BACKEND_SQLITE:
+        records = iter_records(read_database_search(file_path, user_request, limit))
+    elif batch_size:
+        records = search_batches(iter_operation_batches(file_path, batch_size), user_request, limit)
+    else:
+        transactions, index = read_search_index(file_path)
+        records = transactions.iter_records(index.search(user_request, limit))
+
+    # Потоковая запись результатов поиска в файл
+    annotate(rows=write_json_stream(records, output_file, output_format, indent, compress))
+    logger.info(f"Результаты поиска сохранены в файл: {output_file}")
+
+
+def batch_search(user_requests: Iterable[str], file_path: str, output_file: str, limit: Optional[int] = None) -> None:
+    """
+    Пакетный поиск: несколько запросов за один вызов, результат - JSON-объект запрос -> транзакции.
+    """
+    logger.info("start batch_search")
+    transactions, index = read_search_index(file_path)
+    data = {query: transactions.to_records(positions) for query, positions in index.search_many(user_requests, limit).items()}
+
     with open(output_file, "w", encoding="utf-8") as f:
         json.dump(data, f, ensure_ascii=False, indent=4)
     logger.info(f"Результаты поиска сохранены в файл: {output_file}")
 
 
 if __name__ == "__main__":
-    file_path = "../data/operations.xls"  # Путь к вашему файлу с данными
+    file_path = DEFAULT_OPERATIONS_FILE  # Путь к вашему файлу с данными
     user_request = input("Введите запрос для поиска: ")
     output_file = "search_results.json"  # Путь к файлу, куда будут сохранены результаты поиска
     simple_search(user_request, file_path, output_file)
@@ -0,0 +1,165 @@
+"""
+Снимок операций в виде столбцов NumPy (.npy), отображаемых в память.
+
+Запуск из корня проекта:
+
+    python -m src.snapshot data/operations.xls --output data/operations.snapshot
+
+Директория снимка передается как file_path в get_card_summary, simple_search, main_reports и т.д.
+Столбцы открываются через np.load(mmap_mode="r") без чтения и копирования: несколько процессов,
+работающих с одним снимком, делят страницы файлов в кеше ОС, а не держат каждый свою копию операций.
+"""
+
+import argparse
+import json
+import logging
+import os
+import shutil
+from typing import Any, Optional
+
+import numpy as np
+import pandas as pd
+
+from src.schema import SCHEMA_VERSION
+
+logger = logging.getLogger(__name__)
+
+# Версия формата снимка
+SNAPSHOT_VERSION = 1
+
+MANIFEST_FILE = "manifest.json"
+
+# Виды столбцов: числа и даты хранятся как есть, строки - кодами категорий и списком значений в манифесте
+KIND_ARRAY = "array"
+KIND_CATEGORICAL = "categorical"
+
+
+def default_snapshot_path(file_path: str) -> str:
+    """
+    Путь к снимку по умолчанию: рядом с файлом операций, с расширением .snapshot.
+    """
+    return os.path.splitext(os.path.abspath(file_path))[0] + ".snapshot"
+
+
+def is_snapshot(path: Any) -> bool:
+    """
+    Является ли путь директорией снимка (есть манифест).
+    """
+    return os.path.isfile(os.path.join(str(path), MANIFEST_FILE))
+
+
+def _column_parts(values: pd.Series) -> tuple:
+    """
+    Массив для записи в .npy и категории (для строковых столбцов) или None.
+    """
+    if isinstance(values.dtype, pd.CategoricalDtype):
+        return values.cat.codes.to_numpy(), [str(category) for category in values.cat.categories]
+    if pd.api.types.is_numeric_dtype(values) or pd.api.types.is_datetime64_any_dtype(values):
+        return values.to_numpy(), None
+    # Прочие (строковые) столбцы сохраняются как категории; пропуски - код -1
+    return _column_parts(values.astype("string").astype("category"))
+
+
+def write_snapshot(df: pd.DataFrame, snapshot_dir: str) -> str:
+    """
+    Запись операций в снимок: по одному файлу .npy на столбец и манифест.
+
+    Снимок сначала пишется во временную директорию и подменяет прежний целиком, поэтому
+    процессы, уже отобразившие старые файлы в память, продолжают работать со своей версией.
+
+    Args:
+        df: Операции в канонической схеме (см. schema.normalize_operations).
+        snapshot_dir: Директория снимка.
+
+    Returns:
+        Путь к директории снимка.
+    """
+    snapshot_dir = os.path.abspath(snapshot_dir)
+    tmp_dir = snapshot_dir + ".tmp"
+    shutil.rmtree(tmp_dir, ignore_errors=True)
+    os.makedirs(tmp_dir)
+
+    columns = []
+    for number, name in enumerate(df.columns):
+        array, categories = _column_parts(df[name])
+        file_name = f"{number}.npy"
+        np.save(os.path.join(tmp_dir, file_name), np.ascontiguousarray(array), allow_pickle=False)
+        column = {"name": str(name), "file": file_name, "kind": KIND_ARRAY}
+        if categories is not None:
+            column.update(kind=KIND_CATEGORICAL, categories=categories)
+        columns.append(column)
+
+    manifest = {"version": SNAPSHOT_VERSION, "schema_version": SCHEMA_VERSION, "rows": len(df), "columns": columns}
+    with open(os.path.join(tmp_dir, MANIFEST_FILE), "w", encoding="utf-8") as f:
+        json.dump(manifest, f, ensure_ascii=False)
+
+    old_dir = snapshot_dir + ".old"
+    shutil.rmtree(old_dir, ignore_errors=True)
+    if os.path.exists(snapshot_dir):
+        os.replace(snapshot_dir, old_dir)
+    os.replace(tmp_dir, snapshot_dir)
+    shutil.rmtree(old_dir, ignore_errors=True)
+    logger.info("Снимок записан: %s строк, %s столбцов: %s", len(df), len(columns), snapshot_dir)
+    return snapshot_dir
+
+
+def read_snapshot(snapshot_dir: str) -> pd.DataFrame:
+    """
+    Открытие снимка: столбцы отображаются в память только для чтения, без копирования.
+
+    Числовые столбцы и даты DataFrame ссылаются прямо на отображенные файлы, у строковых
+    столбцов (pandas.Categorical) отображены коды. Полученный DataFrame нельзя изменять на месте.
+
+    Args:
+        snapshot_dir: Директория снимка.
+
+    Returns:
+        DataFrame операций в канонической схеме.
+
+    Raises:
+        ValueError: Если снимок записан в другом формате или другой версии схемы.
+    """
+    with open(os.path.join(snapshot_dir, MANIFEST_FILE), encoding="utf-8") as f:
+        manifest = json.load(f)
+    if manifest.get("version") != SNAPSHOT_VERSION or manifest.get("schema_version") != SCHEMA_VERSION:
+        raise ValueError(f"Снимок {snapshot_dir} записан в другой версии формата, его нужно пересоздать")
+
+    columns = {}
+    for column in manifest["columns"]:
+        array = np.load(os.path.join(snapshot_dir, column["file"]), mmap_mode="r", allow_pickle=False)
+        if column["kind"] == KIND_CATEGORICAL:
+            columns[column["name"]] = pd.Categorical.from_codes(array, categories=column["categories"], validate=False)
+        else:
+            columns[column["name"]] = array
+    df = pd.DataFrame(columns, index=pd.RangeIndex(manifest["rows"]), copy=False)
+    logger.info("Снимок открыт: %s строк: %s", len(df), snapshot_dir)
+    return df
+
+
+def export_snapshot(file_path: str, snapshot_dir: Optional[str] = None) -> str:
+    """
+    Экспорт файла операций (Excel, .csv, .pkl) в снимок.
+
+    Args:
+        file_path: Путь к файлу операций.
+        snapshot_dir: Директория снимка (по умолчанию - рядом с файлом, см. default_snapshot_path).
+
+    Returns:
+        Путь к директории снимка.
+    """
+    from src.store import load_operations
+
+    return write_snapshot(load_operations(file_path), snapshot_dir or default_snapshot_path(file_path))
+
+
+def main(argv: Optional[Any] = None) -> None:
+    parser = argparse.ArgumentParser(description="Экспорт операций в снимок, отображаемый в память")
+    parser.add_argument("file", help="файл операций")
+    parser.add_argument("--output", help="директория снимка (по умолчанию - рядом с файлом, .snapshot)")
+    args = parser.parse_args(argv)
+    print(export_snapshot(args.file, args.output))
+
+
+if __name__ == "__main__":
+    logging.basicConfig(level=logging.INFO, format="%(asctime)s - %(levelname)s - %(message)s")
+    main()
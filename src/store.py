@@ -0,0 +1,199 @@
+import logging
+import os
+import threading
+from typing import Any, Callable
+
+import pandas as pd
+
+from src.instrumentation import annotate, instrumented
+from src.paths import CACHE_DIR_ENV, DEFAULT_OPERATIONS_FILE, get_cache_dir, source_key  # noqa: F401
+from src.schema import SCHEMA_VERSION, normalize_operations
+from src.snapshot import is_snapshot, read_snapshot
+
+logger = logging.getLogger(__name__)
+
+# Кеш в памяти процесса: (абсолютный путь, вид данных) -> (ключ файла, объект)
+_memory_cache: dict = {}
+
+# Блокировка построения: параллельные стадии не должны разбирать один и тот же файл дважды
+_build_lock = threading.RLock()
+
+
+def cache_path(key: tuple, suffix: str) -> str:
+    """
+    Путь к файлу кеша для версии исходного файла.
+
+    Args:
+        key: Ключ версии файла из source_key.
+        suffix: Расширение файла кеша (например, "pkl").
+
+    Returns:
+        Путь вида <cache_dir>/<имя файла>.<mtime>.<size>.v<версия схемы>.<suffix>.
+    """
+    path, mtime_ns, size = key
+    return os.path.join(get_cache_dir(path), f"{os.path.basename(path)}.{mtime_ns}.{size}.v{SCHEMA_VERSION}.{suffix}")
+
+
+def _remove_stale_cache(key: tuple) -> None:
+    """
+    Удаление файлов кеша, оставшихся от прежних версий исходного файла или схемы.
+    """
+    path, mtime_ns, size = key
+    cache_dir = get_cache_dir(path)
+    prefix = os.path.basename(path) + "."
+    current_prefix = f"{prefix}{mtime_ns}.{size}.v{SCHEMA_VERSION}."
+    try:
+        names = os.listdir(cache_dir)
+    except OSError:
+        return
+    for name in names:
+        if name.startswith(prefix) and not name.startswith(current_prefix):
+            try:
+                os.remove(os.path.join(cache_dir, name))
+            except OSError:
+                pass
+
+
+def _read_disk_cache(key: tuple, suffix: str) -> Any:
+    """
+    Чтение объекта из дискового кеша, если он есть для этой версии файла.
+    """
+    path = cache_path(key, suffix)
+    if not os.path.exists(path):
+        return None
+    try:
+        obj = pd.read_pickle(path)
+    except Exception as e:
+        logger.warning("Не удалось прочитать кеш %s: %s", path, str(e))
+        return None
+    logger.info("Данные загружены из кеша %s", path)
+    return obj
+
+
+def _write_disk_cache(key: tuple, suffix: str, obj: Any) -> None:
+    """
+    Сохранение объекта в дисковый кеш. Ошибки записи не прерывают работу.
+    """
+    path = cache_path(key, suffix)
+    try:
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        tmp_path = path + ".tmp"
+        pd.to_pickle(obj, tmp_path)
+        os.replace(tmp_path, path)
+        _remove_stale_cache(key)
+    except Exception as e:
+        logger.warning("Не удалось сохранить кеш %s: %s", path, str(e))
+
+
+def _cached(key: tuple, suffix: str, build: Callable[[], Any], use_disk_cache: bool) -> Any:
+    """
+    Объект из кеша в памяти, затем из дискового кеша; при промахе - построение через build.
+    """
+    cached = _memory_cache.get((key[0], suffix))
+    if cached is not None and cached[0] == key:
+        return cached[1]
+
+    with _build_lock:
+        cached = _memory_cache.get((key[0], suffix))
+        if cached is not None and cached[0] == key:
+            return cached[1]
+
+        obj = _read_disk_cache(key, suffix) if use_disk_cache else None
+        if obj is None:
+            obj = build()
+            if use_disk_cache:
+                _write_disk_cache(key, suffix, obj)
+
+        _memory_cache[(key[0], suffix)] = (key, obj)
+    return obj
+
+
+def read_operations_file(file_path: Any) -> pd.DataFrame:
+    """
+    Чтение файла операций по расширению: .pkl (объединенное хранилище, см. ingest.py), .csv или Excel.
+    """
+    suffix = os.path.splitext(str(file_path))[1].lower()
+    if suffix == ".pkl":
+        return pd.read_pickle(file_path)
+    if suffix == ".csv":
+        return pd.read_csv(file_path)
+    return pd.read_excel(file_path)
+
+
+def read_canonical(file_path: Any) -> pd.DataFrame:
+    """
+    Чтение операций в канонической схеме: снимок (см. snapshot.py) открывается как есть, остальные файлы нормализуются.
+    """
+    if is_snapshot(file_path):
+        return read_snapshot(file_path)
+    return normalize_operations(read_operations_file(file_path))
+
+
+@instrumented(rows=len)
+def load_operations(file_path: Any = DEFAULT_OPERATIONS_FILE, use_disk_cache: bool = True) -> pd.DataFrame:
+    """
+    Загрузка операций из Excel-файла (а также .csv, объединенного хранилища .pkl или снимка .snapshot) с кешированием.
+
+    Операции приводятся к канонической схеме (см. schema.normalize_operations): английские имена колонок,
+    даты в datetime64, суммы в float64, маскированные номера карт. В кеш попадает уже нормализованный
+    DataFrame, поэтому разбор и очистка значений выполняются один раз на версию файла.
+
+    Файл разбирается не более одного раза за процесс: повторные вызовы возвращают тот же DataFrame,
+    пока не изменятся mtime или размер файла. Между запусками результат хранится в дисковом кеше,
+    поэтому повторный запуск не обращается к xlrd/openpyxl вовсе.
+    Возвращаемый DataFrame общий для всех вызывающих и не должен изменяться на месте.
+
+    Args:
+        file_path: Путь к файлу операций.
+        use_disk_cache: Использовать ли дисковый кеш.
+
+    Returns:
+        DataFrame с операциями.
+
+    Raises:
+        FileNotFoundError и ошибки pandas при чтении файла.
+    """
+    key = source_key(file_path)
+    if key is None:
+        # Файл недоступен для stat - кешировать нечего, читаем напрямую
+        return read_canonical(file_path)
+
+    def build() -> pd.DataFrame:
+        logger.info("Чтение данных из файла %s", file_path)
+        annotate(bytes_read=key[2], parsed=True)
+        return read_canonical(file_path)
+
+    # Объединенное хранилище и снимок уже в канонической схеме и читаются быстро - копия в дисковом кеше не нужна
+    use_disk_cache = use_disk_cache and not str(file_path).lower().endswith(".pkl") and not is_snapshot(file_path)
+    return _cached(key, "pkl", build, use_disk_cache)
+
+
+def load_artifact(
+    file_path: Any, name: str, build: Callable[[pd.DataFrame], Any], use_disk_cache: bool = True
+) -> Any:
+    """
+    Производный объект (индекс, агрегаты), построенный по операциям и закешированный рядом с ними.
+
+    Кеш артефакта привязан к той же версии исходного файла, что и кеш операций,
+    поэтому при изменении файла он сбрасывается вместе с ними.
+
+    Args:
+        file_path: Путь к файлу операций.
+        name: Имя артефакта, используется в имени файла кеша.
+        build: Функция, строящая артефакт по DataFrame операций.
+        use_disk_cache: Использовать ли дисковый кеш.
+
+    Returns:
+        Построенный или загруженный из кеша артефакт.
+    """
+    key = source_key(file_path)
+    if key is None:
+        return build(load_operations(file_path))
+    return _cached(key, f"{name}.pkl", lambda: build(load_operations(file_path, use_disk_cache)), use_disk_cache)
+
+
+def clear_memory_cache() -> None:
+    """
+    Очистка кеша операций в памяти процесса.
+    """
+    _memory_cache.clear()
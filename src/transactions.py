@@ -0,0 +1,312 @@
+import logging
+import sys
+from typing import Any, Iterator, Optional
+
+import numpy as np
+import pandas as pd
+
+from src.money import split_spending, to_kopecks, to_rubles
+from src.schema import DATE_FORMATS, format_date, parse_datetimes
+from src.store import DEFAULT_OPERATIONS_FILE, load_artifact
+
+logger = logging.getLogger(__name__)
+
+# Поле суммы операции: хранится в целых копейках int64
+AMOUNT_FIELD = "transaction_amount"
+# Пустая сумма: отличается от нуля при выводе, в суммах считается нулем
+MISSING_KOPECKS = np.iinfo(np.int64).min
+
+# Поля, по которым считаются сводки по картам (если поля нет в источнике - значения пустые)
+CARD_FIELD = "card_number"
+CATEGORY_FIELD = "category"
+
+
+def _encode(values: pd.Series) -> tuple:
+    """
+    Категориальное кодирование: коды (-1 для пустых значений) и массив уникальных значений.
+
+    Колонки pandas.Categorical (см. schema.CATEGORICAL_COLUMNS) не перекодируются: берутся их коды и категории.
+    """
+    if isinstance(values.dtype, pd.CategoricalDtype):
+        return np.asarray(values.cat.codes), np.asarray(values.cat.categories, dtype=object)
+    codes, uniques = pd.factorize(values.astype(object))
+    return codes.astype(np.int32), np.asarray(uniques, dtype=object)
+
+
+class TransactionRow:
+    """
+    Ленивое представление одной операции: значения берутся из столбцов по запросу.
+
+    Поддерживает get/[]/in/keys как словарь записи, поэтому код, написанный для списков словарей
+    (например, format_top_transactions), работает с ним без изменений.
+    """
+
+    __slots__ = ("_transactions", "_position")
+
+    def __init__(self, transactions: "Transactions", position: int) -> None:
+        self._transactions = transactions
+        self._position = position
+
+    def __getitem__(self, key: str) -> Any:
+        if key not in self._transactions.columns:
+            raise KeyError(key)
+        return self._transactions.value(key, self._position)
+
+    def __contains__(self, key: object) -> bool:
+        return key in self._transactions.columns
+
+    def get(self, key: str, default: Any = None) -> Any:
+        if key not in self._transactions.columns:
+            return default
+        value = self._transactions.value(key, self._position)
+        return default if value is None else value
+
+    def keys(self) -> list:
+        return list(self._transactions.columns)
+
+    def to_dict(self) -> dict:
+        return {key: self[key] for key in self.keys()}
+
+    def __repr__(self) -> str:
+        return f"TransactionRow({self.to_dict()!r})"
+
+
+class Transactions:
+    """
+    Компактное хранение операций в виде набора столбцов (struct of arrays).
+
+    Сумма операции хранится в целых копейках int64 (см. money.py), даты канонической схемы - в datetime64,
+    прочие числовые поля - массивами как есть, остальные поля (номера карт, категории, описания,
+    статусы...) - как коды со словарем значений.
+    По сравнению со списком словарей из to_dict("records") это на порядок меньше памяти на строку,
+    а сводки по картам и поиск считаются по кодам, без раскодирования значений каждой строки.
+    Строка выдается лениво (TransactionRow) или словарем в формате writers.iter_records.
+    """
+
+    def __init__(self, columns: dict, dictionaries: dict) -> None:
+        # Поле -> массив значений или кодов, в порядке колонок источника
+        self.columns = columns
+        # Поле -> массив уникальных значений (только для закодированных полей)
+        self.dictionaries = dictionaries
+
+    @classmethod
+    def from_frame(cls, df: pd.DataFrame) -> "Transactions":
+        """
+        Построение из DataFrame операций (каноническая схема или записи с датами в формате выгрузки).
+        """
+        columns: dict = {}
+        dictionaries: dict = {}
+        for field in df.columns:
+            values = df[field]
+            if field == AMOUNT_FIELD:
+                amounts = pd.to_numeric(values, errors="coerce")
+                columns[field] = np.where(amounts.isna().to_numpy(), MISSING_KOPECKS, to_kopecks(amounts))
+            elif field in DATE_FORMATS:
+                columns[field] = parse_datetimes(values, DATE_FORMATS[field]).to_numpy(dtype="datetime64[ns]")
+            elif pd.api.types.is_numeric_dtype(values) and not pd.api.types.is_bool_dtype(values):
+                columns[field] = values.to_numpy()
+            else:
+                columns[field], dictionaries[field] = _encode(values)
+        return cls(columns, dictionaries)
+
+    @classmethod
+    def from_records(cls, records: Any) -> "Transactions":
+        """
+        Построение из списка словарей (записей to_dict("records")).
+        """
+        return cls.from_frame(pd.DataFrame.from_records(list(records)))
+
+    def __len__(self) -> int:
+        return len(next(iter(self.columns.values()))) if self.columns else 0
+
+    def __getitem__(self, position: Any) -> Any:
+        if isinstance(position, slice):
+            return self.take(np.arange(len(self))[position])
+        if position < 0:
+            position += len(self)
+        if not 0 <= position < len(self):
+            raise IndexError(position)
+        return TransactionRow(self, position)
+
+    def __iter__(self) -> Iterator[TransactionRow]:
+        for position in range(len(self)):
+            yield TransactionRow(self, position)
+
+    @property
+    def nbytes(self) -> int:
+        """
+        Объем памяти столбцов в байтах, включая объекты словарей значений.
+        """
+        total = sum(values.nbytes for values in self.columns.values())
+        for values in self.dictionaries.values():
+            total += values.nbytes + sum(sys.getsizeof(value) for value in values)
+        return int(total)
+
+    def codes(self, field: str) -> np.ndarray:
+        """
+        Коды значений закодированного поля (-1 - пустое значение; поля нет в источнике - все -1).
+        """
+        if field in self.dictionaries:
+            return np.asarray(self.columns[field])
+        return np.full(len(self), -1, dtype=np.int32)
+
+    def dictionary(self, field: str) -> np.ndarray:
+        """
+        Уникальные значения закодированного поля (пустой массив, если поля нет в источнике).
+        """
+        values: np.ndarray = self.dictionaries.get(field, np.array([], dtype=object))
+        return values
+
+    def kopecks(self) -> np.ndarray:
+        """
+        Суммы операций в копейках; пустые суммы - 0.
+        """
+        if AMOUNT_FIELD not in self.columns:
+            return np.zeros(len(self), dtype=np.int64)
+        amounts = self.columns[AMOUNT_FIELD]
+        return np.asarray(np.where(amounts == MISSING_KOPECKS, 0, amounts), dtype=np.int64)
+
+    def value(self, field: str, position: int) -> Any:
+        """
+        Значение поля операции в формате writers.iter_records: даты - строками выгрузки, пропуски - None.
+        """
+        value = self.columns[field][position]
+        if field == AMOUNT_FIELD:
+            return None if value == MISSING_KOPECKS else to_rubles(value)
+        if field in DATE_FORMATS:
+            return format_date(value, field)
+        if field in self.dictionaries:
+            return None if value < 0 else self.dictionaries[field][value]
+        return None if pd.isna(value) else value.item()
+
+    def take(self, positions: Any) -> "Transactions":
+        """
+        Подмножество операций по позициям (словари значений общие с исходным набором).
+        """
+        return Transactions({field: values[positions] for field, values in self.columns.items()}, self.dictionaries)
+
+    def iter_records(self, positions: Any = None) -> Iterator[dict]:
+        """
+        Построчная выдача операций словарями, как writers.iter_records для DataFrame.
+        """
+        for position in range(len(self)) if positions is None else positions:
+            yield TransactionRow(self, int(position)).to_dict()
+
+    def to_records(self, positions: Any = None) -> list:
+        """
+        Операции в виде списка словарей (для выдачи в JSON).
+        """
+        return list(self.iter_records(positions))
+
+    def card_totals(self) -> dict:
+        """
+        Суммы операций по картам в копейках, точным целочисленным сложением (np.add.at по int64, без float).
+
+        Returns:
+            Словарь номер карты (None - без карты) -> сумма в копейках, в порядке первого появления карты.
+        """
+        shifted = self.codes(CARD_FIELD).astype(np.int64) + 1  # 0 - операции без карты
+        cards = self.dictionary(CARD_FIELD)
+        sums = np.zeros(len(cards) + 1, dtype=np.int64)
+        np.add.at(sums, shifted, self.kopecks())
+        first_seen = np.unique(shifted, return_index=True)[1]
+        return {None if code == 0 else cards[code - 1]: int(sums[code]) for code in shifted[np.sort(first_seen)]}
+
+    def card_positions(self) -> dict:
+        """
+        Позиции операций каждой карты (None - без карты) в порядке первого появления карты.
+        """
+        codes = self.codes(CARD_FIELD)
+        cards = self.dictionary(CARD_FIELD)
+        order = np.argsort(codes, kind="stable")
+        unique, starts = np.unique(codes[order], return_index=True)
+        groups = np.split(order, starts[1:])
+        first_seen = np.argsort([group[0] for group in groups], kind="stable")
+        return {None if unique[index] < 0 else cards[unique[index]]: groups[index] for index in first_seen}
+
+    def card_money(self) -> pd.DataFrame:
+        """
+        Суммы операций по парам (карта, категория) в копейках - в формате money.group_money,
+        но группировка идет по кодам столбцов, значения раскодируются только для групп.
+
+        Returns:
+            DataFrame с индексом (card, category) и колонками net, spent, refunds (int64) в порядке первого появления.
+        """
+        card_codes = self.codes(CARD_FIELD).astype(np.int64) + 1
+        category_codes = self.codes(CATEGORY_FIELD).astype(np.int64) + 1
+        cards, categories = self.dictionary(CARD_FIELD), self.dictionary(CATEGORY_FIELD)
+        keys, first_seen, groups = np.unique(
+            card_codes * (len(categories) + 1) + category_codes, return_index=True, return_inverse=True
+        )
+        kopecks = self.kopecks()
+        spent, refunds = split_spending(kopecks)
+        sums = np.zeros((3, len(keys)), dtype=np.int64)
+        for row, values in enumerate((kopecks, spent, refunds)):
+            np.add.at(sums[row], groups, values)
+
+        order = np.argsort(first_seen, kind="stable")
+        card_index, category_index = np.divmod(keys[order], len(categories) + 1)
+        index = pd.MultiIndex.from_arrays(
+            [
+                [None if code == 0 else cards[code - 1] for code in card_index],
+                [None if code == 0 else categories[code - 1] for code in category_index],
+            ],
+            names=["card", "category"],
+        )
+        return pd.DataFrame({"net": sums[0][order], "spent": sums[1][order], "refunds": sums[2][order]}, index=index)
+
+    def top_positions(self, top_n: int = 5) -> np.ndarray:
+        """
+        Позиции top_n операций с наибольшей по модулю суммой (частичная сортировка argpartition);
+        при равных суммах - в порядке строк.
+        """
+        amounts = np.abs(self.kopecks())
+        if len(amounts) > top_n:
+            candidates = np.argpartition(-amounts, top_n - 1)[:top_n]
+            # В top_n попадают и все строки с суммой, равной наименьшей из top_n, чтобы порядок при равенстве был по строкам
+            candidates = np.flatnonzero(amounts >= amounts[candidates].min())
+        else:
+            candidates = np.arange(len(amounts))
+        return candidates[np.lexsort((candidates, -amounts[candidates]))][:top_n]
+
+    def lowercase_codes(self, field: str) -> tuple:
+        """
+        Коды значений поля без учета регистра: как pandas.factorize по значениям в нижнем регистре,
+        но в нижний регистр переводятся только уникальные значения.
+
+        Returns:
+            Кортеж (коды строк, -1 - пустое значение; массив уникальных значений в нижнем регистре).
+        """
+        lower_codes, uniques = pd.factorize(pd.Series(self.dictionary(field), dtype=object).astype("string").str.lower())
+        codes = self.codes(field)
+        return np.where(codes >= 0, lower_codes[np.maximum(codes, 0)] if len(lower_codes) else -1, -1), uniques
+
+    def search(self, query: str, limit: Optional[int] = None) -> np.ndarray:
+        """
+        Позиции операций, у которых запрос входит в описание или категорию (без учета регистра), в порядке строк.
+
+        Подстрока ищется только среди уникальных значений, затем выбираются строки с подходящими кодами.
+        """
+        query = query.lower()
+        mask = np.zeros(len(self), dtype=bool)
+        for field in (CATEGORY_FIELD, "description"):
+            matching = [code for code, value in enumerate(self.dictionary(field)) if query in str(value).lower()]
+            if matching:
+                mask |= np.isin(self.codes(field), matching)
+        positions = np.flatnonzero(mask)
+        return positions[:limit] if limit is not None else positions
+
+
+def build_transactions(df: pd.DataFrame) -> Transactions:
+    """
+    Построение компактного представления операций.
+    """
+    return Transactions.from_frame(df)
+
+
+def load_transactions(file_path: Any = DEFAULT_OPERATIONS_FILE) -> Transactions:
+    """
+    Компактное представление операций файла, закешированное рядом с данными (см. store.load_artifact).
+    """
+    transactions: Transactions = load_artifact(file_path, "transactions", build_transactions)
+    return transactions
@@ -0,0 +1,283 @@
+"""
+Транспорт HTTP-запросов к внешним API (курсы ЦБ и котировки Alpha Vantage).
+
+Транспорт - объект с методом get(url, params=None, timeout=None), который возвращает ответ
+с status_code, json() и raise_for_status(), как requests. Режим выбирается переменными окружения:
+
+    MARKET_TRANSPORT=http      - сеть (по умолчанию)
+    MARKET_TRANSPORT=record    - сеть с записью ответов в MARKET_FIXTURES_DIR
+    MARKET_TRANSPORT=replay    - только ответы из MARKET_FIXTURES_DIR, без сети
+    MARKET_LATENCY=0.2         - добавленная задержка каждого запроса в секундах
+    MARKET_FAILURE_RATE=0.1    - доля запросов, завершающихся ответом 503
+
+В тестах и нагрузочных прогонах транспорт задается напрямую через set_transport.
+"""
+
+import copy
+import hashlib
+import json
+import logging
+import os
+import random
+import threading
+import time
+from typing import Any, Optional
+from urllib.parse import urlparse
+
+import requests
+from requests.adapters import HTTPAdapter
+
+logger = logging.getLogger(__name__)
+
+TRANSPORT_ENV = "MARKET_TRANSPORT"
+FIXTURES_DIR_ENV = "MARKET_FIXTURES_DIR"
+LATENCY_ENV = "MARKET_LATENCY"
+FAILURE_RATE_ENV = "MARKET_FAILURE_RATE"
+
+MODE_HTTP = "http"
+MODE_RECORD = "record"
+MODE_REPLAY = "replay"
+MODES = (MODE_HTTP, MODE_RECORD, MODE_REPLAY)
+
+# Записанные ответы API, поставляемые с проектом
+DEFAULT_FIXTURES_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "data", "fixtures")
+
+DEFAULT_POOL_SIZE = 5
+
+# Параметры, не влияющие на ответ: не входят в ключ записи и не сохраняются на диск
+SECRET_PARAMS = {"apikey"}
+
+_session: Optional[requests.Session] = None
+_session_lock = threading.Lock()
+
+_transport: Any = None
+_transport_lock = threading.Lock()
+
+
+def get_session(pool_size: int = DEFAULT_POOL_SIZE) -> requests.Session:
+    """
+    Общая HTTP-сессия с пулом keep-alive соединений.
+
+    Args:
+        pool_size: Размер пула соединений на хост.
+
+    Returns:
+        Сессия requests, разделяемая всеми потоками процесса.
+    """
+    global _session
+    with _session_lock:
+        if _session is None:
+            session = requests.Session()
+            adapter = HTTPAdapter(pool_connections=pool_size, pool_maxsize=pool_size)
+            session.mount("http://", adapter)
+            session.mount("https://", adapter)
+            _session = session
+        return _session
+
+
+class HttpTransport:
+    """
+    Запросы по сети через общую сессию (см. get_session).
+    """
+
+    def __init__(self, session: Optional[requests.Session] = None) -> None:
+        self.session = session
+
+    def get(self, url: str, params: Optional[dict] = None, timeout: Optional[float] = None) -> Any:
+        session = self.session or get_session()
+        return session.get(url, params=params, timeout=timeout)
+
+
+class FixtureResponse:
+    """
+    Ответ, восстановленный из записи: status_code, json() и raise_for_status() как у requests.Response.
+    """
+
+    def __init__(self, url: str, status_code: int, body: Any) -> None:
+        self.url = url
+        self.status_code = status_code
+        self._body = body
+
+    def json(self) -> Any:
+        # Копия, чтобы вызывающий код не мог изменить запись, общую для всех потоков
+        return copy.deepcopy(self._body)
+
+    def raise_for_status(self) -> None:
+        if self.status_code >= 400:
+            raise requests.HTTPError(f"HTTP {self.status_code} для {self.url}")
+
+
+class FixtureNotFoundError(LookupError):
+    """
+    Для запроса нет записанного ответа (режим replay).
+    """
+
+
+def fixture_name(url: str, params: Optional[dict] = None) -> str:
+    """
+    Имя файла записи для запроса: хост и хеш адреса и параметров (без SECRET_PARAMS).
+    """
+    public = sorted((str(key), str(value)) for key, value in (params or {}).items() if key not in SECRET_PARAMS)
+    digest = hashlib.sha1(json.dumps([url, public], ensure_ascii=False).encode("utf-8")).hexdigest()[:16]
+    return f"{urlparse(url).hostname or 'local'}-{digest}.json"
+
+
+class ReplayTransport:
+    """
+    Ответы из записей на диске, без обращения к сети.
+
+    Записи читаются один раз и затем отдаются из памяти, поэтому транспорт выдерживает
+    нагрузочные прогоны с тысячами запросов в секунду.
+    """
+
+    def __init__(self, fixtures_dir: str = DEFAULT_FIXTURES_DIR) -> None:
+        self.fixtures_dir = fixtures_dir
+        self._fixtures: dict = {}
+        self._lock = threading.Lock()
+
+    def _load(self, name: str) -> Optional[dict]:
+        with self._lock:
+            if name not in self._fixtures:
+                path = os.path.join(self.fixtures_dir, name)
+                if not os.path.exists(path):
+                    return None
+                with open(path, encoding="utf-8") as f:
+                    self._fixtures[name] = json.load(f)
+            fixture: dict = self._fixtures[name]
+            return fixture
+
+    def get(self, url: str, params: Optional[dict] = None, timeout: Optional[float] = None) -> FixtureResponse:
+        name = fixture_name(url, params)
+        fixture = self._load(name)
+        if fixture is None:
+            raise FixtureNotFoundError(f"Нет записанного ответа {name} для {url} {params or ''}")
+        return FixtureResponse(url, fixture["status_code"], fixture["body"])
+
+
+class RecordingTransport:
+    """
+    Запросы через другой транспорт с сохранением успешных ответов в записи для ReplayTransport.
+    """
+
+    def __init__(self, inner: Any = None, fixtures_dir: str = DEFAULT_FIXTURES_DIR) -> None:
+        self.inner = inner or HttpTransport()
+        self.fixtures_dir = fixtures_dir
+
+    def get(self, url: str, params: Optional[dict] = None, timeout: Optional[float] = None) -> Any:
+        response = self.inner.get(url, params=params, timeout=timeout)
+        if response.status_code < 400:
+            try:
+                body = response.json()
+            except ValueError:
+                logger.warning("Ответ %s не JSON и не записан", url)
+                return response
+            self.save(url, params, response.status_code, body)
+        return response
+
+    def save(self, url: str, params: Optional[dict], status_code: int, body: Any) -> str:
+        """
+        Запись ответа в файл (атомарно: через временный файл).
+
+        Returns:
+            Путь к файлу записи.
+        """
+        os.makedirs(self.fixtures_dir, exist_ok=True)
+        path = os.path.join(self.fixtures_dir, fixture_name(url, params))
+        public = {key: value for key, value in (params or {}).items() if key not in SECRET_PARAMS}
+        fixture = {"url": url, "params": public, "status_code": status_code, "body": body}
+        tmp_path = f"{path}.{threading.get_ident()}.tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump(fixture, f, ensure_ascii=False, indent=2)
+        os.replace(tmp_path, path)
+        logger.info("Ответ %s записан в %s", url, path)
+        return path
+
+
+class SimulatedTransport:
+    """
+    Имитация сети поверх другого транспорта: задержка ответа и доля отказов.
+
+    Задержка равна latency плюс случайная добавка до jitter секунд. Если она больше таймаута
+    запроса, запрос ждет таймаут и завершается requests.Timeout, как настоящий медленный сервер.
+    С вероятностью failure_rate вместо ответа возвращается HTTP 503.
+    """
+
+    def __init__(
+        self,
+        inner: Any,
+        latency: float = 0.0,
+        jitter: float = 0.0,
+        failure_rate: float = 0.0,
+        seed: Optional[int] = None,
+    ) -> None:
+        self.inner = inner
+        self.latency = latency
+        self.jitter = jitter
+        self.failure_rate = failure_rate
+        self._random = random.Random(seed)
+        self._lock = threading.Lock()
+
+    def get(self, url: str, params: Optional[dict] = None, timeout: Optional[float] = None) -> Any:
+        with self._lock:
+            delay = self.latency + self._random.uniform(0, self.jitter)
+            failed = self._random.random() < self.failure_rate
+        if timeout is not None and delay > timeout:
+            time.sleep(timeout)
+            raise requests.Timeout(f"Таймаут {timeout} с для {url}")
+        time.sleep(delay)
+        if failed:
+            return FixtureResponse(url, 503, {})
+        return self.inner.get(url, params=params, timeout=timeout)
+
+
+def transport_from_env(pool_size: int = DEFAULT_POOL_SIZE) -> Any:
+    """
+    Транспорт по переменным окружения MARKET_TRANSPORT, MARKET_FIXTURES_DIR, MARKET_LATENCY и MARKET_FAILURE_RATE.
+
+    Raises:
+        ValueError: Если режим MARKET_TRANSPORT неизвестен.
+    """
+    mode = os.getenv(TRANSPORT_ENV) or MODE_HTTP
+    fixtures_dir = os.getenv(FIXTURES_DIR_ENV) or DEFAULT_FIXTURES_DIR
+    if mode == MODE_HTTP:
+        transport: Any = HttpTransport(get_session(pool_size))
+    elif mode == MODE_RECORD:
+        transport = RecordingTransport(HttpTransport(get_session(pool_size)), fixtures_dir)
+    elif mode == MODE_REPLAY:
+        transport = ReplayTransport(fixtures_dir)
+    else:
+        raise ValueError(f"Неизвестный режим {TRANSPORT_ENV}={mode}; доступны: {', '.join(MODES)}")
+
+    latency = float(os.getenv(LATENCY_ENV) or 0)
+    failure_rate = float(os.getenv(FAILURE_RATE_ENV) or 0)
+    if latency or failure_rate:
+        transport = SimulatedTransport(transport, latency=latency, failure_rate=failure_rate)
+    logger.info("Транспорт внешних API: %s", type(transport).__name__)
+    return transport
+
+
+def get_transport(pool_size: int = DEFAULT_POOL_SIZE) -> Any:
+    """
+    Транспорт процесса: заданный через set_transport или, при первом вызове, по переменным окружения.
+
+    Args:
+        pool_size: Размер пула соединений сессии (для сетевых режимов).
+    """
+    global _transport
+    with _transport_lock:
+        if _transport is None:
+            _transport = transport_from_env(pool_size)
+        return _transport
+
+
+def set_transport(transport: Any) -> Any:
+    """
+    Замена транспорта процесса (None - снова выбрать по переменным окружения).
+
+    Returns:
+        Прежний транспорт, чтобы его можно было вернуть.
+    """
+    global _transport
+    with _transport_lock:
+        previous, _transport = _transport, transport
+    return previous
@@ -1,81 +1,251 @@
 import logging
 import os  # Добавлен импорт модуля os
-from datetime import datetime
-from typing import Any
+from typing import Any, Optional
+import numpy as np
 import pandas as pd
-import requests
+
+from src.chunked import iter_operation_batches
+from src.date_index import DATE_FORMAT, parse_dates
+from src.greeting import get_greeting
+from src.instrumentation import annotate, instrumented
+from src.market_cache import currency_rates_cache, stock_quotes_cache
+from src.money import cashback_kopecks, group_money, split_spending, to_kopecks, to_rubles
+from src.quotes import DEFAULT_MAX_WORKERS, DEFAULT_TIMEOUT, NOT_AVAILABLE, fetch_quotes
+from src.schema import format_date
+from src.store import load_operations
+from src.transactions import Transactions, load_transactions
+from src.transport import get_transport
 
 # Настройка логгера для модуля utils
 logger = logging.getLogger(__name__)
 
+# Ежедневные курсы ЦБ РФ в формате JSON
+CBR_DAILY_URL = "https://www.cbr-xml-daily.ru/daily_json.js"
+
 
-def read_xls_file(file_path: Any) -> list:
+@instrumented(rows=len)
+def read_xls_file(file_path: Any) -> Transactions:
     """
-    Read the XLS file and return the data as a list of dictionaries.
+    Read the XLS file and return the operations as a compact columnar container.
 
     Args:
         file_path (Any): Path to the XLS file.
 
     Returns:
-        list: List of dictionaries representing the data from the XLS file.
+        Transactions: Operations from the XLS file; rows are dict-like views (see transactions.TransactionRow).
     """
     try:
-        df = pd.read_excel(file_path)
-        return df.to_dict(orient="records")
+        return load_transactions(file_path)
     except Exception as e:
         logger.error("Ошибка при чтении файла %s: %s", file_path, str(e))
-        return []
+        return Transactions.from_frame(pd.DataFrame())
 
 
+@instrumented()
 def process_cards(data: Any) -> tuple:
     """
     Process the card data to return a summary.
 
+    Card totals are exact integer-kopeck sums over the columns; no per-row dicts are built.
+
     Args:
-        data (Any): Input data to process.
+        data (Any): Input data to process: Transactions (see read_xls_file) or a list of dictionaries.
 
     Returns:
-        tuple: A tuple containing a dictionary of cards and a list of top transactions.
+        tuple: A tuple containing a dictionary of cards ("total_amount" in rubles and the card's
+            "transactions" as a Transactions subset) and the top 5 transactions by absolute amount.
     """
+    transactions = data if isinstance(data, Transactions) else Transactions.from_records(data)
+    annotate(rows=len(transactions))
+    totals = transactions.card_totals()
     cards = {}
-    for row in data:
-        card_number = str(row.get("card_number", "unknown"))
-        amount = row.get("transaction_amount", 0)
+    for card, positions in transactions.card_positions().items():
+        card_number = "unknown" if card is None else str(card)
+        cards[card_number] = {"total_amount": to_rubles(totals[card]), "transactions": transactions.take(positions)}
 
-        if pd.isna(card_number):
-            card_number = "unknown"
+    top_transactions = transactions.take(transactions.top_positions(5))
 
-        if card_number not in cards:
-            cards[card_number] = {"total_amount": 0, "transactions": []}
+    return cards, top_transactions
 
-        cards[card_number]["total_amount"] += amount
-        cards[card_number]["transactions"].append(row)
 
-    top_transactions = sorted(data, key=lambda x: abs(x.get("transaction_amount", 0)), reverse=True)[:5]
+class CardAggregate:
+    """
+    Mergeable partial card aggregate: per-card money totals and the current top-N rows.
 
-    return cards, top_transactions
+    Batches of operations are folded in with update (one vectorized groupby per batch),
+    partial aggregates of different batches or workers are combined with merge.
+    Amounts are kept as exact integer kopecks (see money.py): spending per card and category
+    (cashback rules are applied per category) and refunds per card are tracked separately.
+    Memory stays bounded by the number of cards and categories plus top_n rows, not by the input size.
+    """
+
+    def __init__(self, top_n: int = 5) -> None:
+        self.top_n = top_n
+        self.totals: dict = {}
+        self.spent: dict = {}
+        self.refunds: dict = {}
+        self.top = pd.DataFrame()
+
+    def _merge_top(self, rows: pd.DataFrame) -> None:
+        combined = rows.reset_index(drop=True) if self.top.empty else pd.concat([self.top, rows], ignore_index=True)
+        if combined.empty:
+            return
+        top_positions = combined["transaction_amount"].fillna(0).abs().nlargest(self.top_n, keep="first").index
+        self.top = combined.iloc[top_positions].reset_index(drop=True)
+
+    def add_sums(self, sums: pd.DataFrame) -> "CardAggregate":
+        """
+        Fold per (card, category) kopeck sums into the aggregate.
+
+        Args:
+            sums (pd.DataFrame): Output of money.group_money.
+
+        Returns:
+            CardAggregate: The aggregate itself, for chaining.
+        """
+        for (card_number, category), net, spent, refunds in sums.itertuples(name=None):
+            card = None if pd.isna(card_number) else str(card_number)
+            category = None if pd.isna(category) else category
+            self.totals[card] = self.totals.get(card, 0) + int(net)
+            self.refunds[card] = self.refunds.get(card, 0) + int(refunds)
+            self.spent[(card, category)] = self.spent.get((card, category), 0) + int(spent)
+        return self
+
+    def update(self, df: pd.DataFrame) -> "CardAggregate":
+        """
+        Fold a batch of operations into the aggregate.
+
+        Args:
+            df (pd.DataFrame): Operations frame with "card_number", "transaction_amount"
+                and (optionally) "category" columns.
+
+        Returns:
+            CardAggregate: The aggregate itself, for chaining.
+        """
+        if df.empty or "transaction_amount" not in df.columns:
+            return self
+
+        missing = pd.Series([None] * len(df), dtype=object)
+        self.add_sums(
+            group_money(
+                df["card_number"] if "card_number" in df.columns else missing,
+                df["category"] if "category" in df.columns else missing,
+                to_kopecks(df["transaction_amount"]),
+            )
+        )
+
+        amounts = df["transaction_amount"].fillna(0)
+        top_positions = amounts.abs().reset_index(drop=True).nlargest(self.top_n, keep="first").index
+        self._merge_top(df.iloc[top_positions])
+        return self
+
+    def merge(self, other: "CardAggregate") -> "CardAggregate":
+        """
+        Combine with a partial aggregate computed over later operations.
+
+        Args:
+            other (CardAggregate): Another partial aggregate.
+
+        Returns:
+            CardAggregate: The aggregate itself, for chaining.
+        """
+        for totals, other_totals in ((self.totals, other.totals), (self.refunds, other.refunds), (self.spent, other.spent)):
+            for key, total in other_totals.items():
+                totals[key] = totals.get(key, 0) + total
+        if not other.top.empty:
+            self._merge_top(other.top)
+        return self
+
+    def card_summary(self, cashback_rules: Optional[dict] = None) -> list:
+        """
+        Per-card spending, refunds and cashback.
+
+        Args:
+            cashback_rules (Optional[dict], optional): Cashback rules by category
+                (see money.DEFAULT_CASHBACK_RULES). Defaults to None.
+
+        Returns:
+            list: Dictionaries with "last_digits", "total_spent" (spending as a positive amount),
+                "refunds" and "cashback", in rubles.
+        """
+        keys = list(self.spent)
+        cashback = cashback_kopecks([category for _, category in keys], [self.spent[key] for key in keys], cashback_rules)
+        spent_by_card: dict = {}
+        cashback_by_card: dict = {}
+        for (card, _), spent, card_cashback in zip(keys, self.spent.values(), cashback):
+            spent_by_card[card] = spent_by_card.get(card, 0) + spent
+            cashback_by_card[card] = cashback_by_card.get(card, 0) + int(card_cashback)
+
+        summary = []
+        for card in self.totals:
+            card_number = "unknown" if card is None else card
+            summary.append(
+                {
+                    "last_digits": card_number[-4:] if card_number != "unknown" else "unknown",
+                    "total_spent": to_rubles(spent_by_card.get(card, 0)),
+                    "refunds": to_rubles(self.refunds.get(card, 0)),
+                    "cashback": to_rubles(cashback_by_card.get(card, 0)),
+                }
+            )
+        return summary
+
+    def result(self, cashback_rules: Optional[dict] = None) -> tuple:
+        """
+        Final card summary and top transactions.
+
+        Args:
+            cashback_rules (Optional[dict], optional): Cashback rules by category. Defaults to None.
+
+        Returns:
+            tuple: A tuple containing the card summary list and a list of top transaction records.
+        """
+        return self.card_summary(cashback_rules), self.top.to_dict(orient="records")
+
+
+def aggregate_cards(df: pd.DataFrame, top_n: int = 5, cashback_rules: Optional[dict] = None) -> tuple:
+    """
+    Aggregate card totals and pick the top transactions in a single vectorized pass.
+
+    Unlike process_cards, no per-row dicts are built: totals come from a groupby over
+    the source frame and the top-N rows are selected with nlargest.
+
+    Args:
+        df (pd.DataFrame): Operations frame with "card_number" and "transaction_amount" columns.
+        top_n (int, optional): Number of top transactions by absolute amount. Defaults to 5.
+        cashback_rules (Optional[dict], optional): Cashback rules by category. Defaults to None.
+
+    Returns:
+        tuple: A tuple containing the card summary list and a list of top transaction records.
+    """
+    return CardAggregate(top_n).update(df).result(cashback_rules)
 
 
-def summarize_cards(cards: Any) -> list:
+def summarize_cards(cards: Any, cashback_rules: Optional[dict] = None) -> list:
     """
     Create a summary of the card data.
 
+    Spending and refunds are summed separately in exact integer kopecks; cashback follows
+    the per-category rules (1 ruble per full 100 rubles spent by default).
+
     Args:
-        cards (Any): Input card data to summarize.
+        cards (Any): Input card data to summarize: Transactions or the dict built by process_cards.
+        cashback_rules (Optional[dict], optional): Cashback rules by category. Defaults to None.
 
     Returns:
         list: List of dictionaries containing summarized card information.
     """
-    summary = []
+    if isinstance(cards, Transactions):
+        return CardAggregate().add_sums(cards.card_money()).card_summary(cashback_rules)
+
+    aggregate = CardAggregate()
     for card_number, info in cards.items():
-        summary.append(
-            {
-                "last_digits": card_number[-4:] if card_number != "unknown" else "unknown",
-                "total_spent": round(info["total_amount"], 2),
-                "cashback": round(info["total_amount"] * 0.01, 2),  # Assuming cashback is 1% of total spent
-            }
-        )
-    return summary
+        rows = info.get("transactions")
+        if not isinstance(rows, Transactions):
+            card = None if card_number == "unknown" else card_number
+            rows = rows or [{"transaction_amount": info["total_amount"]}]
+            rows = Transactions.from_records([{**row, "card_number": card} for row in rows])
+        aggregate.add_sums(rows.card_money())
+    return aggregate.card_summary(cashback_rules)
 
 
 def format_top_transactions(top_transactions: Any) -> list:
@@ -83,7 +253,8 @@ def format_top_transactions(top_transactions: Any) -> list:
     Format the top transactions.
 
     Args:
-        top_transactions (Any): Input top transactions to format.
+        top_transactions (Any): Input top transactions to format: dictionaries or row views
+            (for example, the Transactions returned by process_cards).
 
     Returns:
         list: List of dictionaries containing formatted transaction information.
@@ -92,7 +263,7 @@ def format_top_transactions(top_transactions: Any) -> list:
     for transaction in top_transactions:
         formatted_transactions.append(
             {
-                "date": transaction.get("data_payment", "unknown"),
+                "date": format_date(transaction.get("data_payment", "unknown")),
                 "amount": transaction.get("transaction_amount", 0),
                 "category": transaction.get("category", "unknown"),
                 "description": transaction.get("description", "unknown"),
@@ -101,37 +272,47 @@ def format_top_transactions(top_transactions: Any) -> list:
     return formatted_transactions
 
 
-def get_greeting() -> str:
+@instrumented("http_cbr_daily")
+def fetch_currency_rate() -> list:
     """
-    Return a greeting based on the current time.
+    Fetch USD and EUR exchange rates from the Central Bank of Russia, bypassing the cache.
+
+    The request goes through the process transport (see transport.get_transport), so it can be
+    served from recorded fixtures or a latency/failure simulator instead of the network.
 
     Returns:
-        str: Greeting message based on the current time of the day.
+        list: List of dictionaries containing currency rates.
+
+    Raises:
+        Exception: Network or response format errors.
     """
-    current_hour = datetime.now().hour
-    if 6 <= current_hour < 12:
-        return "Доброе утро"
-    elif 12 <= current_hour < 18:
-        return "Добрый день"
-    elif 18 <= current_hour < 22:
-        return "Добрый вечер"
-    else:
-        return "Доброй ночи"
+    response = get_transport().get(CBR_DAILY_URL, timeout=DEFAULT_TIMEOUT)
+    response.raise_for_status()
+    data = response.json()
+    usd_rate = data["Valute"]["USD"]["Value"]
+    eur_rate = data["Valute"]["EUR"]["Value"]
+    return [{"currency": "USD", "rate": usd_rate}, {"currency": "EUR", "rate": eur_rate}]
 
 
-def get_currency_rate() -> list:
+@instrumented()
+def get_currency_rate(use_cache: bool = True) -> list:
     """
     Get USD and EUR exchange rates from the Central Bank of Russia.
 
+    Rates are served from the TTL cache (see market_cache) when possible.
+
+    Args:
+        use_cache (bool, optional): Whether to use the market data cache. Defaults to True.
+
     Returns:
         list: List of dictionaries containing currency rates.
     """
     try:
-        response = requests.get("https://www.cbr-xml-daily.ru/daily_json.js")
-        data = response.json()
-        usd_rate = data["Valute"]["USD"]["Value"]
-        eur_rate = data["Valute"]["EUR"]["Value"]
-        return [{"currency": "USD", "rate": usd_rate}, {"currency": "EUR", "rate": eur_rate}]
+        if use_cache:
+            rates: list = currency_rates_cache.get_or_fetch("cbr_daily", fetch_currency_rate)
+        else:
+            rates = fetch_currency_rate()
+        return rates
     except Exception as e:
         logger.error("Ошибка при получении курсов валют: %s", str(e))
         return []
@@ -154,12 +335,25 @@ def load_api_key() -> Any:
         return None
 
 
-def get_stock_prices(symbols: Any) -> list:
+@instrumented(rows=len)
+def get_stock_prices(
+    symbols: Any,
+    max_workers: int = DEFAULT_MAX_WORKERS,
+    requests_per_minute: Optional[float] = None,
+    use_cache: bool = True,
+) -> list:
     """
     Get stock prices for given symbols using Alpha Vantage API.
 
+    Quotes are fetched concurrently over a shared keep-alive session, with per-request
+    timeouts and retries (see quotes.fetch_quotes).
+
     Args:
         symbols (Any): List of stock symbols.
+        max_workers (int, optional): Maximum number of concurrent requests.
+        requests_per_minute (Optional[float], optional): Provider rate limit. Defaults to
+            the ALPHAVANTAGE_RATE_LIMIT environment variable, or no limit if it is not set.
+        use_cache (bool, optional): Whether to use the market data cache. Defaults to True.
 
     Returns:
         list: List of dictionaries containing stock symbols and their prices.
@@ -169,42 +363,189 @@ def get_stock_prices(symbols: Any) -> list:
         if not api_key:
             raise ValueError("API key not found. Make sure to set ALPHAVANTAGE_API_KEY in your .env file.")
 
-        prices = []
-        base_url = "https://www.alphavantage.co/query"
-        for symbol in symbols:
-            params = {"function": "GLOBAL_QUOTE", "symbol": symbol, "apikey": api_key}
-            response = requests.get(base_url, params=params)
-            data = response.json()
+        if requests_per_minute is None and os.getenv("ALPHAVANTAGE_RATE_LIMIT"):
+            requests_per_minute = float(os.getenv("ALPHAVANTAGE_RATE_LIMIT", ""))
 
-            if "Global Quote" in data:
-                price = float(data["Global Quote"]["05. price"])
-                prices.append({"symbol": symbol, "price": price})
-            else:
-                prices.append({"symbol": symbol, "price": "Not available"})
+        def fetch_many(missing: list) -> dict:
+            quotes = fetch_quotes(missing, api_key, max_workers=max_workers, requests_per_minute=requests_per_minute)
+            return {quote["symbol"]: quote["price"] for quote in quotes if quote["price"] != NOT_AVAILABLE}
 
-        return prices
+        symbols = list(symbols)
+        prices = stock_quotes_cache.get_or_fetch_many(symbols, fetch_many) if use_cache else fetch_many(symbols)
+        return [{"symbol": symbol, "price": prices.get(symbol, NOT_AVAILABLE)} for symbol in symbols]
 
     except Exception as e:
         logger.error("Ошибка при получении цен на акции: %s", str(e))
         return []
 
 
-def get_card_summary(file_path: Any, analysis_date: Any=None) -> dict:
+def month_to_date(analysis_date: Any) -> tuple:
+    """
+    Month-to-date period of an analysis date.
+
+    Args:
+        analysis_date (Any): Analysis date (datetime, Timestamp or "DD.MM.YYYY" string).
+
+    Returns:
+        tuple: Period bounds (start, end) as datetime64[ns]: the first day of the month (inclusive)
+            and the day after the analysis date (exclusive).
+    """
+    if isinstance(analysis_date, str):
+        analysis_date = pd.to_datetime(analysis_date, format=DATE_FORMAT)
+    day = pd.Timestamp(analysis_date).normalize()
+    return np.datetime64(day.replace(day=1), "ns"), np.datetime64(day + pd.Timedelta(days=1), "ns")
+
+
+def filter_month_to_date(df: pd.DataFrame, analysis_date: Any) -> pd.DataFrame:
+    """
+    Operations paid from the start of the analysis date's month up to the analysis date inclusive.
+
+    Args:
+        df (pd.DataFrame): Operations frame with a "data_payment" column.
+        analysis_date (Any): Analysis date.
+
+    Returns:
+        pd.DataFrame: Matching operations in file order.
+    """
+    if df.empty or "data_payment" not in df.columns:
+        return df.iloc[:0]
+    start, end = month_to_date(analysis_date)
+    dates = parse_dates(df["data_payment"])
+    return df.iloc[np.flatnonzero((dates >= start) & (dates < end))]
+
+
+def aggregate_cards_by_dates(
+    df: pd.DataFrame, analysis_dates: Any, top_n: int = 5, cashback_rules: Optional[dict] = None
+) -> list:
+    """
+    Month-to-date card summaries for many analysis dates in a single sorted sweep.
+
+    Operations are sorted by payment date once; per (card, category) running sums of net amount,
+    spending, refunds and counts are snapshotted at every period boundary, so the sums of any period
+    are the difference of two snapshots. Only the top transactions and the card order are taken
+    from the rows of each period. The result for each date equals aggregate_cards over
+    filter_month_to_date(df, date).
+
+    Args:
+        df (pd.DataFrame): Operations frame.
+        analysis_dates (Any): Analysis dates.
+        top_n (int, optional): Number of top transactions by absolute amount. Defaults to 5.
+        cashback_rules (Optional[dict], optional): Cashback rules by category. Defaults to None.
+
+    Returns:
+        list: A (card summary, top transaction records) tuple per analysis date, in input order.
+    """
+    analysis_dates = list(analysis_dates)
+    if df.empty or "data_payment" not in df.columns or "transaction_amount" not in df.columns:
+        return [([], []) for _ in analysis_dates]
+
+    missing = pd.Series([None] * len(df), dtype=object)
+    cards = (df["card_number"] if "card_number" in df.columns else missing).to_numpy(dtype=object)
+    categories = (df["category"] if "category" in df.columns else missing).to_numpy(dtype=object)
+    group_codes = (
+        pd.DataFrame({"card": cards, "category": categories})
+        .groupby(["card", "category"], sort=False, dropna=False)
+        .ngroup()
+        .to_numpy()
+    )
+    group_count = int(group_codes.max()) + 1 if len(group_codes) else 0
+    group_first = np.unique(group_codes, return_index=True)[1]
+    card_codes = pd.factorize(pd.Series(cards, dtype=object))[0]
+
+    dates = parse_dates(df["data_payment"])
+    valid = np.flatnonzero(~np.isnat(dates))
+    order = valid[np.argsort(dates[valid], kind="stable")]
+    sorted_dates = dates[order]
+    kopecks = to_kopecks(df["transaction_amount"])
+    spent, refunds = split_spending(kopecks)
+    measures = np.stack([kopecks, spent, refunds, np.ones(len(df), dtype=np.int64)])
+    abs_amounts = df["transaction_amount"].fillna(0).abs().to_numpy()
+
+    periods = [month_to_date(analysis_date) for analysis_date in analysis_dates]
+    bounds = [tuple(np.searchsorted(sorted_dates, np.array(period, dtype="datetime64[ns]"))) for period in periods]
+
+    # Проход по операциям в порядке дат с накоплением сумм групп и снимками на границах периодов
+    snapshots = {}
+    running = np.zeros((4, group_count), dtype=np.int64)
+    previous = 0
+    for boundary in sorted({boundary for pair in bounds for boundary in pair}):
+        segment = order[previous:boundary]
+        for measure, values in zip(running, measures):
+            np.add.at(measure, group_codes[segment], values[segment])
+        snapshots[boundary] = running.copy()
+        previous = boundary
+
+    results = []
+    for lo, hi in bounds:
+        sums = snapshots[hi] - snapshots[lo]
+        rows = np.sort(order[lo:hi])
+        card_rank = {code: rank for rank, code in enumerate(pd.unique(card_codes[rows]))}
+        present = np.flatnonzero(sums[3])
+        present = present[np.argsort([card_rank[card_codes[group_first[group]]] for group in present], kind="stable")]
+        first_rows = group_first[present]
+        aggregate = CardAggregate(top_n).add_sums(
+            pd.DataFrame(
+                {"net": sums[0, present], "spent": sums[1, present], "refunds": sums[2, present]},
+                index=pd.MultiIndex.from_arrays([cards[first_rows], categories[first_rows]]),
+            )
+        )
+        top_rows = rows[np.argsort(-abs_amounts[rows], kind="stable")[:top_n]]
+        aggregate.top = df.iloc[top_rows].reset_index(drop=True)
+        results.append(aggregate.result(cashback_rules))
+    return results
+
+
+@instrumented()
+def get_card_summary(
+    file_path: Any,
+    analysis_date: Any = None,
+    currency_rates: Optional[list] = None,
+    batch_size: Optional[int] = None,
+    incremental: bool = False,
+    cashback_rules: Optional[dict] = None,
+) -> dict:
     """
     Get the card summary from the XLS file.
 
     Args:
         file_path (Any): Path to the XLS file.
-        analysis_date (Any, optional): Analysis date. Defaults to None.
+        analysis_date (Any, optional): Analysis date: only operations paid from the start of its month
+            up to the date inclusive are summarized (month-to-date). Defaults to None (all operations).
+        currency_rates (Optional[list], optional): Already fetched currency rates.
+            Defaults to None, in which case they are fetched with get_currency_rate.
+        batch_size (Optional[int], optional): Read the file in batches of this many rows and fold
+            them into a CardAggregate, for statements that do not fit in memory. Defaults to None
+            (the whole file is loaded through the store).
+        incremental (bool, optional): Fold only operations added since the previous run into
+            persisted running totals (see incremental.update_incremental). Defaults to False.
+        cashback_rules (Optional[dict], optional): Cashback rules by category
+            (see money.DEFAULT_CASHBACK_RULES). Defaults to None.
 
     Returns:
         dict: Dictionary containing the card summary information.
     """
-    data = read_xls_file(file_path)
-    cards, top_transactions = process_cards(data)
-    summary = summarize_cards(cards)
+    aggregate = CardAggregate()
+    if incremental and analysis_date is not None:
+        logger.warning("Инкрементальные сводки считаются по всем операциям, для даты анализа файл читается целиком")
+        incremental = False
+    try:
+        if incremental:
+            from src.incremental import update_incremental
+
+            aggregate = update_incremental(file_path).cards
+        elif batch_size:
+            for batch in iter_operation_batches(file_path, batch_size):
+                aggregate.update(batch if analysis_date is None else filter_month_to_date(batch, analysis_date))
+        else:
+            operations = load_operations(file_path)
+            aggregate.update(operations if analysis_date is None else filter_month_to_date(operations, analysis_date))
+    except Exception as e:
+        logger.error("Ошибка при чтении файла %s: %s", file_path, str(e))
+
+    summary, top_transactions = aggregate.result(cashback_rules)
     formatted_top_transactions = format_top_transactions(top_transactions)
-    currency_rates = get_currency_rate()
+    if currency_rates is None:
+        currency_rates = get_currency_rate()
 
     result = {
         "greeting": get_greeting(),
@@ -214,3 +555,49 @@ def get_card_summary(file_path: Any, analysis_date: Any=None) -> dict:
     }
 
     return result
+
+
+@instrumented()
+def get_card_summaries(
+    file_path: Any,
+    analysis_dates: Any,
+    currency_rates: Optional[list] = None,
+    cashback_rules: Optional[dict] = None,
+) -> dict:
+    """
+    Get month-to-date card summaries for many analysis dates with one load and one sweep.
+
+    Args:
+        file_path (Any): Path to the XLS file.
+        analysis_dates (Any): Analysis dates (datetime or "DD.MM.YYYY" strings).
+        currency_rates (Optional[list], optional): Already fetched currency rates.
+            Defaults to None, in which case they are fetched once with get_currency_rate.
+        cashback_rules (Optional[dict], optional): Cashback rules by category. Defaults to None.
+
+    Returns:
+        dict: "DD.MM.YYYY" date -> summary in the get_card_summary format.
+    """
+    analysis_dates = list(analysis_dates)
+    try:
+        operations = load_operations(file_path)
+    except Exception as e:
+        logger.error("Ошибка при чтении файла %s: %s", file_path, str(e))
+        operations = pd.DataFrame()
+    annotate(rows=len(operations), dates=len(analysis_dates))
+
+    if currency_rates is None:
+        currency_rates = get_currency_rate()
+    greeting = get_greeting()
+
+    result = {}
+    for analysis_date, (summary, top_transactions) in zip(
+        analysis_dates, aggregate_cards_by_dates(operations, analysis_dates, cashback_rules=cashback_rules)
+    ):
+        key = analysis_date if isinstance(analysis_date, str) else pd.Timestamp(analysis_date).strftime(DATE_FORMAT)
+        result[key] = {
+            "greeting": greeting,
+            "cards": summary,
+            "top_transactions": format_top_transactions(top_transactions),
+            "currency_rates": currency_rates,
+        }
+    return result
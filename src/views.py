@@ -1,12 +1,10 @@
 import json
 import logging
 import os
-from typing import Any
+from typing import Any, Optional
 from datetime import datetime
 
-from dotenv import load_dotenv
-
-from src.utils import get_card_summary, get_stock_prices
+from src.paths import DEFAULT_OPERATIONS_FILE
 
 # Настройка логгера
 logging.basicConfig(level=logging.INFO, format="%(asctime)s - %(levelname)s - %(message)s")
@@ -17,6 +15,8 @@ def load_api_key() -> Any:
     """
     Load API key from .env file.
     """
+    from dotenv import load_dotenv
+
     load_dotenv()
     return os.getenv("ALPHAVANTAGE_API_KEY")
 
@@ -25,22 +25,23 @@ if __name__ == "__main__":
     """
     Main execution block.
 
-    Prompts the user for a date or uses the current date if none is provided.
+    Prompts the user for a date; without one all operations are summarized.
     Then, it processes financial operations from a file and fetches current stock prices.
     Finally, it prints the results in JSON format.
     """
-    # Запрашиваем у пользователя дату или используем текущую дату
-    user_date_input = input("Введите дату в формате DD.MM.YYYY (Нажмите Enter чтобы использовать текущую дату): ")
+    # Запрашиваем у пользователя дату; без даты сводка строится по всем операциям
+    analysis_date: Optional[datetime] = None
+    user_date_input = input("Введите дату в формате DD.MM.YYYY (Нажмите Enter чтобы использовать все операции): ")
     if user_date_input.strip():
         try:
             analysis_date = datetime.strptime(user_date_input, "%d.%m.%Y")
         except ValueError:
-            logger.error("Неверный формат даты. Используется текущая дата.")
-            analysis_date = datetime.now()
-    else:
-        analysis_date = datetime.now()
+            logger.error("Неверный формат даты. Используются все операции.")
+
+    file_path = DEFAULT_OPERATIONS_FILE
 
-    file_path = "../data/operations.xls"
+    # pandas и requests загружаются только при запуске модуля как скрипта
+    from src.utils import get_card_summary, get_stock_prices
 
     try:
         result = get_card_summary(file_path, analysis_date)
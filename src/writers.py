@@ -0,0 +1,95 @@
+import gzip
+import json
+import logging
+from typing import Any, Iterable, Iterator, Optional
+
+import numpy as np
+import pandas as pd
+
+from src.schema import format_dates
+
+logger = logging.getLogger(__name__)
+
+# Размер порции строк, преобразуемых в словари за один раз
+DEFAULT_CHUNK_SIZE = 10000
+
+# Форматы вывода: JSON-массив и JSON Lines (одна запись на строку)
+FORMAT_JSON = "json"
+FORMAT_JSONL = "jsonl"
+
+
+def iter_records(df: pd.DataFrame, positions: Any = None, chunk_size: int = DEFAULT_CHUNK_SIZE) -> Iterator[dict]:
+    """
+    Построчная выдача операций в виде словарей порциями по chunk_size строк.
+
+    Пустые значения (NaN) заменяются на None, даты канонической схемы выводятся в формате выгрузки банка.
+    В памяти одновременно находится не больше одной порции.
+
+    Args:
+        df: DataFrame с операциями.
+        positions: Позиции выбираемых строк (None - все строки).
+        chunk_size: Размер порции.
+
+    Yields:
+        Словарь с данными одной операции.
+    """
+    if positions is None:
+        positions = np.arange(len(df))
+    for start in range(0, len(positions), chunk_size):
+        rows = format_dates(df.iloc[positions[start : start + chunk_size]])
+        yield from rows.astype(object).where(rows.notna(), None).to_dict(orient="records")
+
+
+def open_output(output_file: str, compress: bool = False) -> Any:
+    """
+    Открытие файла результатов на запись; при compress или расширении .gz - со сжатием gzip.
+    """
+    if compress or output_file.endswith(".gz"):
+        return gzip.open(output_file, "wt", encoding="utf-8")
+    return open(output_file, "w", encoding="utf-8")
+
+
+def write_json_stream(
+    records: Iterable[Any],
+    output_file: str,
+    output_format: str = FORMAT_JSON,
+    indent: Optional[int] = 4,
+    compress: bool = False,
+) -> int:
+    """
+    Потоковая запись записей в файл по мере их получения.
+
+    В формате "json" пишется JSON-массив (с indent=4 - байт в байт как json.dump(list, indent=4)),
+    в формате "jsonl" - по одной компактной записи на строку. indent=None дает компактный JSON.
+
+    Args:
+        records: Итерируемый источник записей (например, iter_records).
+        output_file: Путь к файлу результатов.
+        output_format: "json" или "jsonl".
+        indent: Отступ для формата "json"; None - компактная запись.
+        compress: Сжимать ли вывод gzip.
+
+    Returns:
+        Количество записанных записей.
+    """
+    if output_format not in (FORMAT_JSON, FORMAT_JSONL):
+        raise ValueError(f"Неизвестный формат вывода: {output_format}")
+
+    separators = (",", ":") if indent is None or output_format == FORMAT_JSONL else None
+    count = 0
+    with open_output(output_file, compress) as f:
+        if output_format == FORMAT_JSONL:
+            for record in records:
+                f.write(json.dumps(record, ensure_ascii=False, separators=separators, default=str))
+                f.write("\n")
+                count += 1
+            return count
+
+        pad = "\n" + " " * indent if indent is not None else ""
+        f.write("[")
+        for record in records:
+            item = json.dumps(record, ensure_ascii=False, indent=indent, separators=separators, default=str)
+            f.write(("," if count else "") + pad + item.replace("\n", pad))
+            count += 1
+        f.write("\n]" if count and indent is not None else "]")
+    return count
@@ -0,0 +1,93 @@
+from typing import Any, Callable
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from src.store import clear_memory_cache
+
+# Категории и получатели для тестовых операций
+CATEGORIES = {
+    "Супермаркеты": ["Магнит", "Пятёрочка", "Перекресток"],
+    "Транспорт": ["Яндекс Такси", "Метро Санкт-Петербург"],
+    "Рестораны": ["Шоколадница", "Тануки"],
+    "Переводы": ["Владимиров А.", "Светлана Т."],
+    "Аптеки": ["Аптека Вита"],
+}
+
+
+def sample_operations(
+    rows: int, cards: int = 3, seed: int = 0, start: str = "2023-01-01", end: str = "2024-06-30"
+) -> pd.DataFrame:
+    """
+    Небольшая выгрузка операций со случайными, но воспроизводимыми значениями.
+
+    Около 5% операций без карты и без даты платежа, переводы - иногда поступления;
+    строки упорядочены по убыванию времени операции, как в выгрузке банка.
+    """
+    rng = np.random.default_rng(seed)
+    card_numbers = np.array([f"*{1111 * (number + 1) % 10000:04d}" for number in range(cards)], dtype=object)
+    card_column = card_numbers[rng.integers(0, cards, size=rows)]
+    card_column[rng.random(rows) < 0.05] = None
+
+    categories = np.array(list(CATEGORIES), dtype=object)[rng.integers(0, len(CATEGORIES), size=rows)]
+    descriptions = np.array([rng.choice(CATEGORIES[category]) for category in categories], dtype=object)
+
+    amounts = -np.round(rng.uniform(10, 3000, size=rows), 2)
+    incoming = (categories == "Переводы") & (rng.random(rows) < 0.5)
+    amounts[incoming] = -amounts[incoming]
+
+    timestamps = pd.to_datetime(np.sort(rng.integers(pd.Timestamp(start).value, pd.Timestamp(end).value, size=rows))[::-1])
+    payment_dates = timestamps.strftime("%d.%m.%Y").to_numpy(dtype=object)
+    payment_dates[rng.random(rows) < 0.05] = None
+
+    return pd.DataFrame(
+        {
+            "date_operation": timestamps.strftime("%d.%m.%Y %H:%M:%S"),
+            "data_payment": payment_dates,
+            "card_number": card_column,
+            "status": np.where(rng.random(rows) < 0.03, "FAILED", "OK"),
+            "transaction_amount": amounts,
+            "currency_operation": "RUB",
+            "category": categories,
+            "description": descriptions,
+        }
+    )
+
+
+@pytest.fixture(scope="session")
+def make_operations() -> Callable[..., pd.DataFrame]:
+    # Генератор тестовых операций (см. sample_operations), чтобы тесты не зависели от пакета benchmarks
+    return sample_operations
+
+
+@pytest.fixture
+def operations_cache(tmpdir: Any, monkeypatch: Any) -> Any:
+    # Дисковый кеш операций во временной директории; кеш в памяти очищается до и после теста
+    cache_dir = str(tmpdir.join("cache"))
+    monkeypatch.setenv("OPERATIONS_CACHE_DIR", cache_dir)
+    clear_memory_cache()
+    yield cache_dir
+    clear_memory_cache()
+
+
+@pytest.fixture
+def write_operations(tmpdir: Any, operations_cache: Any) -> Callable[..., str]:
+    # Запись операций во временный файл; формат - по расширению имени (.csv, .pkl или Excel)
+    def write(df: pd.DataFrame, name: str = "operations.csv") -> str:
+        file_path = str(tmpdir.join(name))
+        if name.endswith(".csv"):
+            df.to_csv(file_path, index=False)
+        elif name.endswith(".pkl"):
+            df.to_pickle(file_path)
+        else:
+            df.to_excel(file_path, index=False)
+        return file_path
+
+    return write
+
+
+@pytest.fixture
+def operations_file(write_operations: Any, make_operations: Any) -> str:
+    # Файл операций по умолчанию: 2000 случайных операций в .csv
+    return write_operations(make_operations(2000, cards=3, seed=2))
@@ -0,0 +1,112 @@
+import json
+from datetime import datetime
+from typing import Any
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from src.analytics import ANALYTICS, SpendingScan, analytics_report, run_analytics, write_analytics_report
+from src.schema import normalize_operations
+
+
+@pytest.fixture
+def operations() -> pd.DataFrame:
+    return pd.DataFrame(
+        {
+            # 01.01.2024 - понедельник
+            "date_operation": [
+                "01.01.2024 09:15:00",
+                "01.01.2024 21:40:00",
+                "03.01.2024 09:05:00",
+                "07.01.2024 12:00:00",
+                "08.01.2024 09:30:00",
+                None,
+            ],
+            "data_payment": ["01.01.2024", "02.01.2024", "03.01.2024", "07.01.2024", "08.01.2024", "08.01.2024"],
+            "card_number": ["*1111", "*1111", "*2222", "*1111", "*2222", "*2222"],
+            "transaction_amount": [-100.0, -50.5, -300.0, 1000.0, -20.0, -5.0],
+            "category": ["Кафе", "Кафе", "Супермаркеты", "Пополнения", "Кафе", "Транспорт"],
+            "description": ["Кофейня", "Кофейня", "Магнит", "Перевод", "Кофейня", "Метро"],
+        }
+    )
+
+
+def test_by_weekday_and_hour(operations: pd.DataFrame) -> None:
+    results = run_analytics(operations, ["by_weekday", "by_hour"])
+    monday, _, wednesday = results["by_weekday"][:3]
+    assert monday == {"weekday": "Понедельник", "spent": 170.5, "count": 3, "average": 56.83}
+    assert wednesday == {"weekday": "Среда", "spent": 300.0, "count": 1, "average": 300.0}
+    # Пополнение в воскресенье - не трата; операция без даты не попадает в дни недели
+    assert results["by_weekday"][6] == {"weekday": "Воскресенье", "spent": 0.0, "count": 0, "average": 0.0}
+    assert sum(day["spent"] for day in results["by_weekday"]) == 470.5
+
+    hours = {record["hour"]: record for record in results["by_hour"] if record["count"]}
+    assert hours == {9: {"hour": 9, "spent": 420.0, "count": 3}, 21: {"hour": 21, "spent": 50.5, "count": 1}}
+
+
+def test_by_category_and_top_merchants(operations: pd.DataFrame) -> None:
+    results = run_analytics(operations, ["by_category", "top_merchants"], top_n=2)
+    assert results["by_category"] == [
+        {"category": "Супермаркеты", "spent": 300.0, "count": 1, "share": 63.09},
+        {"category": "Кафе", "spent": 170.5, "count": 3, "share": 35.86},
+        {"category": "Транспорт", "spent": 5.0, "count": 1, "share": 1.05},
+    ]
+    assert results["top_merchants"] == [
+        {"merchant": "Магнит", "spent": 300.0, "count": 1},
+        {"merchant": "Кофейня", "spent": 170.5, "count": 3},
+    ]
+
+
+def test_period_filter(operations: pd.DataFrame) -> None:
+    results = run_analytics(
+        normalize_operations(operations), ["by_category"], start=datetime(2024, 1, 2), end=datetime(2024, 1, 8)
+    )
+    assert [(record["category"], record["spent"]) for record in results["by_category"]] == [
+        ("Супермаркеты", 300.0),
+        ("Кафе", 50.5),
+    ]
+
+
+def test_matches_groupby_on_synthetic_data(make_operations: Any) -> None:
+    df = normalize_operations(make_operations(2000, cards=4, seed=4))
+    results = run_analytics(df, ["by_weekday", "by_hour", "by_category"])
+
+    spending = df[df["transaction_amount"] < 0]
+    kopecks = pd.Series(np.round(-spending["transaction_amount"].to_numpy() * 100).astype(np.int64), index=spending.index)
+    by_weekday = kopecks.groupby(spending["date_operation"].dt.weekday).sum()
+    by_hour = kopecks.groupby(spending["date_operation"].dt.hour).sum()
+    by_category = kopecks.groupby(spending["category"].astype(object)).sum()
+
+    assert [round(day["spent"] * 100) for day in results["by_weekday"]] == [int(by_weekday.get(d, 0)) for d in range(7)]
+    assert [round(hour["spent"] * 100) for hour in results["by_hour"]] == [int(by_hour.get(h, 0)) for h in range(24)]
+    assert {record["category"]: round(record["spent"] * 100) for record in results["by_category"]} == by_category.to_dict()
+
+
+def test_registry_shares_scan(operations: pd.DataFrame) -> None:
+    @analytics_report("largest_spending")
+    def largest_spending(scan: SpendingScan) -> list:
+        return [{"spent": int(scan.spent.max()) / 100}]
+
+    try:
+        assert run_analytics(operations, ["largest_spending"]) == {"largest_spending": [{"spent": 300.0}]}
+        assert "largest_spending" in run_analytics(operations)
+    finally:
+        del ANALYTICS["largest_spending"]
+
+    with pytest.raises(ValueError):
+        run_analytics(operations, ["by_month"])
+
+
+def test_write_analytics_report(operations: pd.DataFrame, write_operations: Any, tmpdir: Any) -> None:
+    file_path = write_operations(operations)
+    output_file = str(tmpdir.join("analytics.json"))
+
+    rows = write_analytics_report(file_path, output_file, ["top_merchants", "by_category"], "01.01.2024", days=5, top_n=1)
+    with open(output_file, encoding="utf-8") as f:
+        content = f.read()
+    records = json.loads(content)
+    assert rows == len(records) == 3
+    assert records[0] == {"report": "top_merchants", "merchant": "Магнит", "spent": 300.0, "count": 1}
+    assert [record["report"] for record in records] == ["top_merchants", "by_category", "by_category"]
+    assert content == json.dumps(records, ensure_ascii=False, indent=4)
@@ -0,0 +1,76 @@
+from typing import Any
+
+import pytest
+
+from benchmarks.loadtest import run_load_test
+from benchmarks.run import STAGES, compare_with_baseline, measure, run_benchmarks
+from benchmarks.synthetic import COLUMNS, generate_operations
+
+
+@pytest.fixture(scope="module")
+def synthetic_df() -> Any:
+    return generate_operations(5000, seed=1)
+
+
+def test_generate_operations(synthetic_df: Any) -> None:
+    assert list(synthetic_df.columns) == COLUMNS
+    assert len(synthetic_df) == 5000
+    # Основная карта встречается чаще остальных, часть операций без карты и без даты платежа
+    counts = synthetic_df["card_number"].value_counts()
+    assert counts.iloc[0] > counts.iloc[-1] * 5
+    assert 0.03 < synthetic_df["card_number"].isna().mean() < 0.12
+    assert 0.01 < synthetic_df["data_payment"].isna().mean() < 0.08
+    assert (synthetic_df["transaction_amount"] < 0).mean() > 0.8
+    assert synthetic_df["category"].nunique() > 10
+
+
+def test_generate_operations_deterministic() -> None:
+    assert generate_operations(100, seed=3).equals(generate_operations(100, seed=3))
+
+
+def test_run_benchmarks_small() -> None:
+    results = run_benchmarks([1000], repeat=1)
+    assert set(results) == {f"{name}@1000" for name in STAGES}
+    assert all(metrics["seconds"] >= 0 and metrics["peak_alloc_mb"] >= 0 for metrics in results.values())
+
+
+def test_run_benchmarks_search_without_build_stage() -> None:
+    # Индекс для стадии поиска строится до замера, даже если стадия построения не выбрана
+    results = run_benchmarks([1000], stages=["fuzzy_search", "sqlite_search"], repeat=1)
+    assert set(results) == {"fuzzy_search@1000", "sqlite_search@1000"}
+
+
+def test_measure_stage_rss() -> None:
+    # Пик RSS относится к стадии: большой массив виден в приросте, а не в пике всего процесса
+    results = measure(lambda context: bytearray(64 * 2**20), {"rows": 1}, repeat=1)
+    if results["rss_growth_mb"] is None:
+        pytest.skip("/proc/self недоступен")
+    assert results["rss_growth_mb"] >= 60
+    assert measure(lambda context: None, {"rows": 1}, repeat=1)["rss_growth_mb"] < 60
+
+
+def test_compare_with_baseline() -> None:
+    baseline = {"search@1000": {"seconds": 1.0}, "card_summary@1000": {"seconds": 1.0}}
+    results = {"search@1000": {"seconds": 1.2}, "card_summary@1000": {"seconds": 1.5}, "new@1000": {"seconds": 9.0}}
+    regressions = compare_with_baseline(results, baseline, tolerance=0.25)
+    assert len(regressions) == 1
+    assert regressions[0].startswith("card_summary@1000")
+
+
+def test_compare_with_baseline_rss() -> None:
+    baseline = {"search@1000": {"seconds": 1.0, "rss_growth_mb": 100.0}, "analytics@1000": {"seconds": 1.0, "rss_growth_mb": 1.0}}
+    results = {"search@1000": {"seconds": 1.0, "rss_growth_mb": 200.0}, "analytics@1000": {"seconds": 1.0, "rss_growth_mb": 3.0}}
+    # Без rss_tolerance память не сравнивается; малый прирост (в пределах RSS_NOISE_MB) - не регрессия
+    assert compare_with_baseline(results, baseline, tolerance=0.25) == []
+    regressions = compare_with_baseline(results, baseline, tolerance=0.25, rss_tolerance=0.5)
+    assert len(regressions) == 1
+    assert regressions[0].startswith("search@1000: прирост RSS")
+
+
+def test_run_load_test(tmpdir: Any) -> None:
+    file_path = str(tmpdir.join("operations.pkl"))
+    generate_operations(1000, seed=2).to_pickle(file_path)
+    results = run_load_test(file_path, requests=20, concurrency=5, latency=0.01)
+    assert results["requests"] == 20
+    assert results["degraded"] == 0 and results["errors"] == 0
+    assert results["requests_per_second"] > 0 and results["p95_ms"] >= results["p50_ms"]
@@ -0,0 +1,41 @@
+import os
+from typing import Any
+
+import pandas as pd
+import pytest
+
+from src.chunked import iter_operation_batches
+
+
+@pytest.fixture(scope="module")
+def mock_df() -> Any:
+    return pd.DataFrame(
+        {
+            "card_number": ["*1111", None, "*2222", "*1111", "*2222"],
+            "transaction_amount": [-100.0, 50.0, -25.5, -10.0, 300.0],
+            "description": ["Такси", "Перевод", None, "Магнит", "Кэшбэк"],
+        }
+    )
+
+
+@pytest.mark.parametrize("extension", [".csv", ".xlsx"])
+def test_iter_operation_batches(mock_df: Any, tmpdir: Any, extension: str) -> None:
+    file_path = os.path.join(tmpdir, "operations" + extension)
+    if extension == ".csv":
+        mock_df.to_csv(file_path, index=False)
+    else:
+        mock_df.to_excel(file_path, index=False)
+
+    batches = list(iter_operation_batches(file_path, batch_size=2))
+    assert [len(batch) for batch in batches] == [2, 2, 1]
+
+    result = pd.concat(batches, ignore_index=True)
+    assert list(result.columns) == list(mock_df.columns)
+    assert list(result["transaction_amount"]) == list(mock_df["transaction_amount"])
+    assert result["card_number"].isna().tolist() == mock_df["card_number"].isna().tolist()
+    assert result["description"].isna().tolist() == mock_df["description"].isna().tolist()
+
+
+def test_iter_operation_batches_missing_file() -> None:
+    with pytest.raises(FileNotFoundError):
+        list(iter_operation_batches("missing_operations.xlsx"))
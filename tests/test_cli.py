@@ -0,0 +1,115 @@
+import json
+import os
+import subprocess
+import sys
+from typing import Any
+from unittest.mock import patch
+
+import pandas as pd
+import pytest
+
+from src.cli import main
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+@pytest.fixture
+def operations_file(write_operations: Any) -> Any:
+    df = pd.DataFrame(
+        {
+            "data_payment": ["05.01.2024", "10.01.2024", "15.04.2024"],
+            "card_number": ["*1111", "*2222", "*1111"],
+            "transaction_amount": [-150.0, -300.0, -80.0],
+            "category": ["Такси", "Супермаркеты", "Такси"],
+            "description": ["Яндекс Такси", "Магнит", "Ситимобил"],
+        }
+    )
+    return write_operations(df, "operations.xlsx")
+
+
+def run(capsys: Any, *argv: str) -> Any:
+    assert main(list(argv)) == 0
+    return json.loads(capsys.readouterr().out)
+
+
+def test_summary_cached(operations_file: Any, capsys: Any) -> None:
+    result = run(capsys, "--file", operations_file, "summary", "--no-rates", "--date", "20.01.2024")
+    assert list(result) == ["greeting", "cards", "top_transactions", "currency_rates"]
+    assert [card["last_digits"] for card in result["cards"]] == ["1111", "2222"]
+
+    with patch("src.utils.get_card_summary") as summary:
+        cached = run(capsys, "--file", operations_file, "summary", "--no-rates", "--date", "20.01.2024")
+    summary.assert_not_called()
+    assert cached == result
+
+    # Изменение файла сбрасывает кеш результатов
+    os.utime(operations_file, ns=(0, os.stat(operations_file).st_mtime_ns + 10**9))
+    with patch("src.utils.get_card_summary", return_value={"greeting": "", "cards": []}) as summary:
+        run(capsys, "--file", operations_file, "summary", "--no-rates", "--date", "20.01.2024")
+    summary.assert_called_once()
+
+
+def test_search_and_report(operations_file: Any, capsys: Any, tmpdir: Any) -> None:
+    found = run(capsys, "--file", operations_file, "search", "магнит")
+    assert [record["transaction_amount"] for record in found] == [-300.0]
+
+    report = run(capsys, "--file", operations_file, "--no-cache", "report", "Такси", "01.01.2024", "--days", "30")
+    assert [record["transaction_amount"] for record in report] == [-150.0]
+
+    output_file = str(tmpdir.join("filter.json"))
+    result = run(capsys, "--file", operations_file, "report", "Такси", "01.01.2024", "--days", "120", "--output", output_file)
+    assert result == {"output_file": output_file, "rows": 2}
+    with open(output_file, encoding="utf-8") as f:
+        assert len(json.load(f)) == 2
+
+
+def test_search_and_report_sqlite_backend(operations_file: Any, capsys: Any) -> None:
+    found = run(capsys, "--file", operations_file, "search", "такси", "--backend", "sqlite")
+    assert [record["description"] for record in found] == ["Яндекс Такси", "Ситимобил"]
+
+    report = run(capsys, "--file", operations_file, "report", "Такси", "01.01.2024", "--days", "120", "--backend", "sqlite")
+    assert [record["data_payment"] for record in report] == ["05.01.2024", "15.04.2024"]
+
+
+def test_analytics(operations_file: Any, capsys: Any) -> None:
+    result = run(capsys, "--file", operations_file, "analytics", "--reports", "top_merchants", "--top", "2")
+    assert result == [
+        {"report": "top_merchants", "merchant": "Магнит", "spent": 300.0, "count": 1},
+        {"report": "top_merchants", "merchant": "Яндекс Такси", "spent": 150.0, "count": 1},
+    ]
+    result = run(capsys, "--file", operations_file, "analytics", "--reports", "by_category", "--start-date", "01.04.2024")
+    assert result == [{"report": "by_category", "category": "Такси", "spent": 80.0, "count": 1, "share": 100.0}]
+
+
+def test_fetch_rates(operations_file: Any, capsys: Any) -> None:
+    rates = [{"currency": "USD", "rate": 90.0}]
+    with patch("src.utils.get_currency_rate", return_value=rates):
+        assert run(capsys, "--file", operations_file, "fetch-rates") == {"currency_rates": rates}
+
+
+def test_failed_fetch_not_cached(operations_file: Any, capsys: Any) -> None:
+    # Пустые курсы (сбой сети) не кешируются: следующий вызов снова обращается к источнику
+    rates = [{"currency": "USD", "rate": 90.0}]
+    with patch("src.utils.get_currency_rate", return_value=[]):
+        assert run(capsys, "--file", operations_file, "fetch-rates") == {"currency_rates": []}
+    with patch("src.utils.get_currency_rate", return_value=rates), patch("src.utils.get_stock_prices", return_value=[]):
+        assert run(capsys, "--file", operations_file, "fetch-rates") == {"currency_rates": rates}
+        assert run(capsys, "--file", operations_file, "fetch-rates", "--stocks", "AAPL")["stock_prices"] == []
+    prices = [{"symbol": "AAPL", "price": 190.5}]
+    with patch("src.utils.get_currency_rate", return_value=rates), patch(
+        "src.utils.get_stock_prices", return_value=prices
+    ) as stock_prices:
+        assert run(capsys, "--file", operations_file, "fetch-rates", "--stocks", "AAPL")["stock_prices"] == prices
+    stock_prices.assert_called_once()
+
+
+def test_fast_path_without_pandas(operations_file: Any, capsys: Any) -> None:
+    run(capsys, "--file", operations_file, "search", "такси", "--limit", "1")
+    code = (
+        "import sys; from src.cli import main; "
+        f"main(['--file', {operations_file!r}, 'search', 'такси', '--limit', '1']); "
+        "assert 'pandas' not in sys.modules, 'pandas imported'"
+    )
+    completed = subprocess.run([sys.executable, "-c", code], cwd=ROOT, capture_output=True, text=True, env=os.environ.copy())
+    assert completed.returncode == 0, completed.stderr
+    assert json.loads(completed.stdout)[0]["description"] == "Яндекс Такси"
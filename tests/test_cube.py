@@ -0,0 +1,76 @@
+import os
+from datetime import datetime
+from typing import Any
+from unittest.mock import patch
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from src.cube import CUBE_ARTIFACT, SpendingCube, load_cube
+from src.reports import category_period_summary
+from src.store import clear_memory_cache
+
+
+@pytest.fixture(scope="module")
+def operations(make_operations: Any) -> Any:
+    return make_operations(3000, cards=4, seed=1)
+
+
+def scan(df: pd.DataFrame, category: Any, start: str, end: str, card: Any = None) -> dict:
+    dates = pd.to_datetime(df["data_payment"], format="%d.%m.%Y", errors="coerce")
+    mask = (dates >= datetime.strptime(start, "%d.%m.%Y")) & (dates < datetime.strptime(end, "%d.%m.%Y"))
+    if category is not None:
+        mask &= df["category"] == category
+    if card is not None:
+        mask &= df["card_number"] == card
+    amounts = np.round(df.loc[mask, "transaction_amount"].to_numpy() * 100).astype(np.int64)
+    return {"total": int(amounts.sum()) / 100, "spent": int(-amounts[amounts < 0].sum()) / 100, "count": int(mask.sum())}
+
+
+def test_query_matches_scan(operations: Any) -> None:
+    cube = SpendingCube(operations)
+    card = operations["card_number"].dropna().iloc[0]
+    for category, start, end, card_number in [
+        ("Супермаркеты", "01.02.2023", "02.05.2023", None),
+        ("Транспорт", "15.06.2023", "15.06.2024", card),
+        (None, "01.01.2020", "01.01.2030", None),
+        ("Фастфуд", "10.03.2024", "10.03.2024", None),
+    ]:
+        assert cube.query(category, start, end, card_number) == scan(operations, category, start, end, card_number)
+    assert cube.query("Нет такой категории") == {"total": 0.0, "spent": 0.0, "count": 0}
+
+
+def test_cube_is_sparse(operations: Any) -> None:
+    # Хранятся только встречающиеся тройки (категория, карта, день), а не все сочетания
+    cube = SpendingCube(operations)
+    valid = operations.dropna(subset=["data_payment", "category"])
+    triples = valid[["category", "card_number", "data_payment"]].fillna({"card_number": ""}).drop_duplicates()
+    assert len(cube.entry_keys) == len(triples)
+    assert len(cube.total) == len(triples) + 1
+    assert len(cube.entry_keys) < len(cube.categories) * len(cube.cards) * cube.days
+
+
+def test_monthly_and_top_categories(operations: Any) -> None:
+    cube = SpendingCube(operations)
+    monthly = cube.monthly("Супермаркеты", "15.01.2024", "01.04.2024")
+    assert [item["month"] for item in monthly] == ["2024-01", "2024-02", "2024-03"]
+    assert monthly[0]["count"] == scan(operations, "Супермаркеты", "15.01.2024", "01.02.2024")["count"]
+    assert sum(item["count"] for item in monthly) == scan(operations, "Супермаркеты", "15.01.2024", "01.04.2024")["count"]
+
+    top = cube.top_categories("01.01.2024", "01.07.2024", top_n=3)
+    spent = {category: scan(operations, category, "01.01.2024", "01.07.2024")["spent"] for category in cube.categories}
+    assert [item["category"] for item in top] == sorted(spent, key=lambda category: -spent[category])[:3]
+
+
+def test_load_cube_persisted(operations: Any, write_operations: Any, operations_cache: Any) -> None:
+    file_path = write_operations(operations.head(200), "operations.xlsx")
+    load_cube(file_path)
+    assert any(name.endswith(f".{CUBE_ARTIFACT}.pkl") for name in os.listdir(operations_cache))
+
+    clear_memory_cache()
+    with patch("src.cube.SpendingCube.__init__") as build:
+        summary = category_period_summary("Супермаркеты", "01.01.2023", days=365, file_path=file_path)
+    build.assert_not_called()
+    assert summary["count"] == scan(operations.head(200), "Супермаркеты", "01.01.2023", "01.01.2024")["count"]
+    assert summary["end"] == "01.01.2024"
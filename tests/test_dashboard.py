@@ -0,0 +1,49 @@
+import time
+from typing import Any
+from unittest.mock import patch
+
+import pytest
+
+from src.dashboard import run_dashboard
+from src.main import main
+
+
+def slow(result: Any, delay: float = 0.2) -> Any:
+    def stage(*args: Any, **kwargs: Any) -> Any:
+        time.sleep(delay)
+        return result() if callable(result) else result
+
+    return stage
+
+
+def test_run_dashboard_parallel() -> None:
+    summary = {"greeting": "Добрый день", "cards": [], "top_transactions": [], "currency_rates": []}
+    rates = [{"currency": "USD", "rate": 90.0}]
+    prices = [{"symbol": "AAPL", "price": 190.5}]
+    searches = []
+    with patch("src.dashboard.get_card_summary", side_effect=slow(lambda: dict(summary))), patch(
+        "src.dashboard.simple_search", side_effect=slow(lambda: searches.append(1))
+    ), patch("src.dashboard.get_currency_rate", side_effect=slow(rates)), patch(
+        "src.dashboard.get_stock_prices", side_effect=slow(prices)
+    ):
+        started = time.monotonic()
+        result = run_dashboard("operations.xls", "такси", "out.json", stock_symbols=["AAPL"])
+        elapsed = time.monotonic() - started
+
+    assert list(result) == ["greeting", "cards", "top_transactions", "currency_rates", "stock_prices"]
+    assert result["currency_rates"] == rates
+    assert result["stock_prices"] == prices
+    assert searches == [1]
+    # Четыре стадии по 0.2 с выполняются одновременно
+    assert elapsed < 0.6
+
+
+@pytest.mark.parametrize("date_input", ["", "31-12-2023"])
+def test_main_without_date(date_input: str, tmpdir: Any, monkeypatch: Any) -> None:
+    # Без даты (или с неверной датой) сводка строится по всем операциям, а не за текущий месяц
+    monkeypatch.chdir(tmpdir)
+    with patch("builtins.input", side_effect=["такси", date_input]), patch(
+        "src.dashboard.run_dashboard", return_value={}
+    ) as dashboard, patch("src.reports.main_reports"):
+        main()
+    assert dashboard.call_args.args[3] is None
@@ -0,0 +1,84 @@
+import json
+import os
+import sqlite3
+from datetime import datetime
+from typing import Any
+
+import pytest
+
+from src.database import FTS_TABLE, database_path, load_database
+from src.reports import select_transactions_by_category_and_date, write_category_report
+from src.search_index import SearchIndex
+from src.services import simple_search
+from src.store import load_operations
+from src.writers import iter_records
+
+
+@pytest.mark.parametrize("query", ["магнит", "ТАКСИ", "рестораны", "а", "", "несуществующий", 'ма"г'])
+@pytest.mark.parametrize("limit", [None, 7])
+def test_search_matches_memory_index(operations_file: Any, query: str, limit: Any) -> None:
+    df = load_operations(operations_file)
+    expected = list(iter_records(df, SearchIndex(df).search(query, limit)))
+    assert list(iter_records(load_database(operations_file).search(query, limit))) == expected
+
+
+def test_select_category_matches_index(operations_file: Any) -> None:
+    df = load_operations(operations_file)
+    database = load_database(operations_file)
+    for category, start_date in [("Супермаркеты", "01.02.2023"), ("Транспорт", "15.12.2023"), ("Нет такой", "01.01.2024")]:
+        expected = list(iter_records(select_transactions_by_category_and_date(df, category, start_date)))
+        start = datetime.strptime(start_date, "%d.%m.%Y")
+        end = datetime.fromordinal(start.toordinal() + 90)
+        assert list(iter_records(database.select_category(category, start, end))) == expected
+
+
+def test_queries_use_indexes(operations_file: Any) -> None:
+    db_path = load_database(operations_file).db_path
+    assert db_path == database_path(operations_file)
+    connection = sqlite3.connect(db_path)
+    try:
+        plan = connection.execute(
+            "EXPLAIN QUERY PLAN SELECT * FROM operations WHERE category = ? AND data_payment >= ? AND data_payment < ?",
+            ("Такси", "2024-01-01 00:00:00", "2024-04-01 00:00:00"),
+        ).fetchall()
+        assert "idx_operations_category_date" in str(plan)
+        assert connection.execute(f"SELECT count(*) FROM {FTS_TABLE}").fetchone()[0] == len(load_operations(operations_file))
+    finally:
+        connection.close()
+
+
+def test_query_with_parameters(operations_file: Any) -> None:
+    database = load_database(operations_file)
+    card = load_operations(operations_file)["card_number"].dropna().iloc[0]
+    result = database.query(
+        "SELECT card_number, count(*) AS operations FROM operations WHERE card_number = :card GROUP BY card_number",
+        {"card": card},
+    )
+    assert result.to_dict("records") == [
+        {"card_number": card, "operations": int((load_operations(operations_file)["card_number"] == card).sum())}
+    ]
+
+
+def test_services_and_reports_with_sqlite_backend(operations_file: Any, tmpdir: Any) -> None:
+    for backend in ("memory", "sqlite"):
+        simple_search("магнит", operations_file, str(tmpdir.join(f"search_{backend}.json")), limit=20, backend=backend)
+        write_category_report(
+            "Супермаркеты", "01.03.2024", operations_file, str(tmpdir.join(f"report_{backend}.json")), backend=backend
+        )
+    for name in ("search", "report"):
+        with open(tmpdir.join(f"{name}_memory.json"), encoding="utf-8") as f:
+            expected = json.load(f)
+        with open(tmpdir.join(f"{name}_sqlite.json"), encoding="utf-8") as f:
+            assert json.load(f) == expected
+        assert expected
+
+    with pytest.raises(ValueError):
+        simple_search("магнит", operations_file, str(tmpdir.join("x.json")), backend="duckdb")
+
+
+def test_sqlite_backend_missing_file(tmpdir: Any) -> None:
+    output_file = str(tmpdir.join("search.json"))
+    simple_search("магнит", str(tmpdir.join("missing.xls")), output_file, backend="sqlite")
+    with open(output_file, encoding="utf-8") as f:
+        assert json.load(f) == []
+    assert not os.path.exists(str(tmpdir.join("cache")))
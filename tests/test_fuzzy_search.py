@@ -0,0 +1,69 @@
+from typing import Any
+
+import pandas as pd
+import pytest
+
+from src.fuzzy_search import FuzzyIndex, bounded_edit_distance, stem
+
+
+@pytest.fixture(scope="module")
+def index() -> Any:
+    df = pd.DataFrame(
+        {
+            "description": ["Такси-сервис Везет", "Супермаркет Магнит", "Аптека Ригла", "Пятёрочка", None, "Ситимобил"],
+            "category": ["Транспорт", "Супермаркеты", "Аптеки", "Супермаркеты", "Переводы", "Такси"],
+        }
+    )
+    return FuzzyIndex(df)
+
+
+def test_stem() -> None:
+    assert stem("супермаркеты") == stem("супермаркет") == "супермаркет"
+    assert stem("переводов") == stem("Переводы") == "перевод"
+    assert stem("Пятёрочке") == stem("пятерочка")
+    assert stem("Magnit") == "magnit"
+
+
+def test_bounded_edit_distance() -> None:
+    assert bounded_edit_distance("супермаркт", "супермаркет", 2) == 1
+    assert bounded_edit_distance("магнт", "магнит", 1) == 1
+    assert bounded_edit_distance("аптек", "перевод", 2) == 3
+    assert bounded_edit_distance("ab", "abcdef", 2) == 3
+
+
+def test_fuzzy_word_forms(index: Any) -> None:
+    # "такси" находит и "Такси-сервис", и категорию "Такси"; полное совпадение основы выше
+    assert sorted(index.fuzzy_search("такси")) == [0, 5]
+    assert list(index.fuzzy_search("супермаркеты")) == [1, 3]
+    assert list(index.fuzzy_search("переводов")) == [4]
+    assert list(index.fuzzy_search("аптеки")) == [2]
+    # Обычный поиск подстроки словоформы не находит
+    assert list(index.search("переводов")) == []
+
+
+def test_fuzzy_oblique_case(index: Any) -> None:
+    # Основа формы запроса длиннее основы значения: "магнита" -> "магнит", "Магнит" -> "магн"
+    assert stem("магнита") != stem("Магнит")
+    assert list(index.fuzzy_search("Магнита")) == [1]
+    assert list(index.fuzzy_search("магниту")) == [1]
+    assert list(index.fuzzy_search("аптеку")) == [2]
+
+
+def test_fuzzy_typos_and_ranking(index: Any) -> None:
+    assert list(index.fuzzy_search("супермаркт")) == [1, 3]
+    assert list(index.fuzzy_search("магнт")) == [1]
+    assert list(index.fuzzy_search("пятерочке")) == [3]
+    # Совпадение обоих слов запроса выше совпадения одного
+    assert list(index.fuzzy_search("супермаркет магнит")) == [1, 3]
+    assert list(index.fuzzy_search("супермаркет магнит", limit=1)) == [1]
+    assert list(index.fuzzy_search("zzz")) == []
+
+
+def test_fuzzy_limit_is_prefix(make_operations: Any) -> None:
+    # Результат с limit - начало полного результата: строки переводятся только для первых limit
+    index = FuzzyIndex(make_operations(3000, seed=5))
+    for query in ("магнит", "такси переводы", "аптеку", "zzz"):
+        full = index.fuzzy_search(query)
+        assert len(set(full)) == len(full)
+        for limit in (1, 7, 100):
+            assert list(index.fuzzy_search(query, limit)) == list(full[:limit])
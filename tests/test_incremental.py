@@ -0,0 +1,68 @@
+import os
+from typing import Any
+from unittest.mock import patch
+
+import pandas as pd
+import pytest
+
+from src.incremental import update_incremental
+from src.utils import aggregate_cards
+
+
+@pytest.fixture
+def operations() -> Any:
+    return pd.DataFrame(
+        {
+            "data_payment": ["05.06.2024", "04.06.2024", "28.05.2024", "27.05.2024"],
+            "card_number": ["*1111", "*2222", "*1111", None],
+            "transaction_amount": [-100.0, -200.5, 50.0, -10.0],
+            "category": ["Такси", "Супермаркеты", "Переводы", "Такси"],
+        }
+    )
+
+
+@pytest.fixture
+def state_path(tmpdir: Any) -> Any:
+    return os.path.join(tmpdir, "state.pkl")
+
+
+def test_incremental_appended_rows(operations: Any, state_path: Any) -> None:
+    update_incremental("operations.xls", state_path, df=operations.iloc[:3])
+    new_rows = pd.DataFrame(
+        {"data_payment": ["06.06.2024"], "card_number": ["*2222"], "transaction_amount": [-999.0], "category": ["Такси"]}
+    )
+    grown = pd.concat([operations, new_rows], ignore_index=True)
+
+    folded: list = []
+    with patch("src.incremental.IncrementalState.fold", autospec=True, side_effect=lambda self, df: folded.append(len(df))):
+        update_incremental("operations.xls", state_path, df=operations)
+    assert folded == [1]
+
+    update_incremental("operations.xls", state_path, df=operations.iloc[:3])
+    state = update_incremental("operations.xls", state_path, df=grown)
+    assert state.cards.result() == aggregate_cards(grown)
+    assert state.category_month_summary() == [
+        {"category": "Переводы", "month": "2024-05", "total": 50.0, "count": 1},
+        {"category": "Такси", "month": "2024-05", "total": -10.0, "count": 1},
+        {"category": "Супермаркеты", "month": "2024-06", "total": -200.5, "count": 1},
+        {"category": "Такси", "month": "2024-06", "total": -1099.0, "count": 2},
+    ]
+
+
+def test_incremental_prepended_rows(operations: Any, state_path: Any) -> None:
+    # Выгрузка банка упорядочена от новых операций к старым: новые строки появляются сверху
+    update_incremental("operations.xls", state_path, df=operations.iloc[2:])
+    state = update_incremental("operations.xls", state_path, df=operations)
+    assert dict(state.cards.totals) == {"*1111": -5000, None: -1000, "*2222": -20050}
+    assert state.rows == 4
+
+
+def test_incremental_rebuild_on_rewrite(operations: Any, state_path: Any) -> None:
+    update_incremental("operations.xls", state_path, df=operations)
+    rewritten = operations.copy()
+    rewritten.loc[1, "transaction_amount"] = -1.0
+    state = update_incremental("operations.xls", state_path, df=rewritten)
+    assert state.cards.result() == aggregate_cards(rewritten)
+
+    state = update_incremental("operations.xls", state_path, df=rewritten.iloc[:2])
+    assert state.cards.result() == aggregate_cards(rewritten.iloc[:2])
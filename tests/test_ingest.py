@@ -0,0 +1,72 @@
+import os
+from typing import Any
+
+import pandas as pd
+import pytest
+
+from src.chunked import iter_operation_batches
+from src.ingest import deduplicate, find_statement_files, ingest
+from src.schema import format_dates, normalize_operations
+from src.utils import get_card_summary
+
+COLUMNS = ["Дата операции", "Дата платежа", "Номер карты", "Сумма операции", "Категория", "Описание"]
+JANUARY = [
+    ["31.01.2024 10:00:00", "31.01.2024", "*1111", -100.0, "Такси", "Яндекс Такси"],
+    ["15.01.2024 12:00:00", "15.01.2024", "*1111", -50.0, "Кафе", "Кофе"],
+    ["15.01.2024 12:00:00", "15.01.2024", "*1111", -50.0, "Кафе", "Кофе"],
+]
+FEBRUARY = [
+    ["02.02.2024 09:30:00", "02.02.2024", "*2222", -300.0, "Супермаркеты", "Магнит"],
+    ["31.01.2024 10:00:00", "31.01.2024", "*1111", -100.0, "Такси", "Яндекс Такси"],
+]
+
+
+@pytest.fixture
+def statements(tmpdir: Any, operations_cache: Any) -> Any:
+    directory = tmpdir.mkdir("statements")
+    pd.DataFrame(JANUARY, columns=COLUMNS).to_excel(str(directory.join("2024-01.xlsx")), index=False)
+    february = pd.DataFrame(FEBRUARY, columns=[" " + name for name in COLUMNS])
+    february.to_csv(str(directory.join("2024-02.csv")), index=False)
+    directory.join("readme.txt").write("не выписка")
+    return directory
+
+
+def test_find_statement_files(statements: Any) -> None:
+    expected = [str(statements.join("2024-01.xlsx")), str(statements.join("2024-02.csv"))]
+    assert find_statement_files(str(statements)) == expected
+    assert find_statement_files(str(statements.join("*.csv"))) == expected[1:]
+
+
+def test_deduplicate_keeps_repeats_within_file() -> None:
+    january = normalize_operations(pd.DataFrame(JANUARY, columns=COLUMNS))
+    # Тот же январь повторно и еще одна одинаковая покупка кофе в другом файле
+    overlap = normalize_operations(pd.DataFrame(JANUARY + [JANUARY[1]], columns=COLUMNS))
+    merged = deduplicate([january, overlap])
+    assert len(merged) == 4
+    assert (merged["description"] == "Кофе").sum() == 3
+
+
+@pytest.mark.parametrize("workers", [1, 2])
+def test_ingest_merged_store(statements: Any, tmpdir: Any, workers: int) -> None:
+    output_file = str(tmpdir.join("merged.pkl"))
+    assert ingest(str(statements), output_file, max_workers=workers) == output_file
+
+    merged = pd.read_pickle(output_file)
+    assert len(merged) == 4
+    assert list(format_dates(merged)["date_operation"]) == [
+        "02.02.2024 09:30:00",
+        "31.01.2024 10:00:00",
+        "15.01.2024 12:00:00",
+        "15.01.2024 12:00:00",
+    ]
+    summary = get_card_summary(output_file, currency_rates=[])
+    assert {card["last_digits"]: card["total_spent"] for card in summary["cards"]} == {"1111": 200.0, "2222": 300.0}
+    # Хранилище читается и в режиме порций
+    assert get_card_summary(output_file, currency_rates=[], batch_size=3)["cards"] == summary["cards"]
+    assert [len(batch) for batch in iter_operation_batches(output_file, batch_size=3)] == [3, 1]
+    assert not os.path.exists(str(tmpdir.join("cache")))
+
+
+def test_ingest_no_files(tmpdir: Any) -> None:
+    with pytest.raises(FileNotFoundError):
+        ingest(str(tmpdir.join("*.xls")), str(tmpdir.join("merged.pkl")))
@@ -0,0 +1,76 @@
+import os
+import time
+from typing import Any
+
+import pytest
+
+from src.instrumentation import (
+    annotate,
+    clear_metrics,
+    enable_profiling,
+    get_metrics,
+    instrumented,
+    metrics_summary,
+    stage_timer,
+    write_profile_report,
+)
+
+
+@pytest.fixture(autouse=True)
+def clean_metrics() -> Any:
+    clear_metrics()
+    yield
+    clear_metrics()
+    enable_profiling(False)
+
+
+@instrumented(rows=len)
+def load_rows(count: int) -> list:
+    time.sleep(0.01)
+    return list(range(count))
+
+
+@instrumented("outer_stage")
+def outer() -> None:
+    annotate(bytes_read=128)
+    load_rows(3)
+
+
+def test_instrumented_records_rows_and_time() -> None:
+    assert load_rows(5) == [0, 1, 2, 3, 4]
+    [record] = get_metrics()
+    assert record["stage"] == "load_rows"
+    assert record["rows"] == 5
+    assert record["seconds"] >= 0.01
+
+
+def test_nested_stages_and_summary() -> None:
+    outer()
+    outer()
+    assert [record["stage"] for record in get_metrics()] == ["load_rows", "outer_stage"] * 2
+    summary = metrics_summary()
+    assert summary["outer_stage"]["calls"] == 2
+    assert summary["outer_stage"]["bytes_read"] == 256
+    assert summary["load_rows"]["rows"] == 6
+
+
+def test_stage_timer_records_errors() -> None:
+    with pytest.raises(ValueError):
+        with stage_timer("failing", source="test"):
+            raise ValueError("boom")
+    assert get_metrics() == [{"stage": "failing", "source": "test", "error": "ValueError", "seconds": pytest.approx(0, abs=1)}]
+
+
+def test_profile_report(tmpdir: Any) -> None:
+    enable_profiling()
+    outer()
+    [inner, outer_record] = get_metrics()
+    assert "peak_alloc_mb" in outer_record
+    assert "peak_alloc_mb" not in inner
+
+    report_file = os.path.join(tmpdir, "profile.txt")
+    write_profile_report(report_file)
+    with open(report_file, encoding="utf-8") as f:
+        report = f.read()
+    assert "===== outer_stage =====" in report
+    assert "load_rows" in report
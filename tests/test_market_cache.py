@@ -0,0 +1,76 @@
+import os
+import time
+from typing import Any
+
+import pytest
+
+from src.market_cache import MemoryBackend, ShelveBackend, TTLCache
+
+
+def wait_for(condition: Any, timeout: float = 2.0) -> None:
+    deadline = time.monotonic() + timeout
+    while not condition() and time.monotonic() < deadline:
+        time.sleep(0.01)
+
+
+def test_ttl_cache_hit_and_miss() -> None:
+    cache = TTLCache("test", ttl=60, backend=MemoryBackend())
+    calls = []
+    assert cache.get_or_fetch("key", lambda: calls.append(1) or "value") == "value"
+    assert cache.get_or_fetch("key", lambda: calls.append(1) or "other") == "value"
+    assert calls == [1]
+    assert cache.stats["hits"] == 1
+    assert cache.stats["misses"] == 1
+
+
+def test_ttl_cache_stale_while_revalidate() -> None:
+    cache = TTLCache("test", ttl=0.05, stale_ttl=60, backend=MemoryBackend())
+    cache.set("key", "old")
+    time.sleep(0.06)
+    assert cache.get_or_fetch("key", lambda: "new") == "old"
+    wait_for(lambda: cache.lookup("key")[1] == "new")
+    assert cache.lookup("key") == ("fresh", "new")
+    assert cache.stats["stale_hits"] == 1
+
+
+def test_ttl_cache_serves_stale_on_error() -> None:
+    cache = TTLCache("test", ttl=0.01, backend=MemoryBackend())
+    cache.set("key", "old")
+    time.sleep(0.02)
+
+    def fail() -> Any:
+        raise ConnectionError("down")
+
+    assert cache.get_or_fetch("key", fail) == "old"
+    assert cache.stats["stale_on_error"] == 1
+    with pytest.raises(ConnectionError):
+        cache.get_or_fetch("missing", fail)
+
+
+def test_ttl_cache_many() -> None:
+    cache = TTLCache("test", ttl=60, backend=MemoryBackend())
+    cache.set("AAPL", 1.0)
+    requested = []
+
+    def fetch_many(keys: list) -> dict:
+        requested.extend(keys)
+        return {key: 2.0 for key in keys if key != "BAD"}
+
+    assert cache.get_or_fetch_many(["AAPL", "MSFT", "BAD"], fetch_many) == {"AAPL": 1.0, "MSFT": 2.0}
+    assert requested == ["MSFT", "BAD"]
+
+
+def test_memory_backend_lru() -> None:
+    backend = MemoryBackend(maxsize=2)
+    backend.set("a", (0, 1))
+    backend.set("b", (0, 2))
+    backend.get("a")
+    backend.set("c", (0, 3))
+    assert backend.get("b") is None
+    assert backend.get("a") == (0, 1)
+
+
+def test_shelve_backend_persists(tmpdir: Any) -> None:
+    path = os.path.join(tmpdir, "market_cache")
+    TTLCache("test", ttl=60, backend=ShelveBackend(path)).set("key", "value")
+    assert TTLCache("test", ttl=60, backend=ShelveBackend(path)).lookup("key") == ("fresh", "value")
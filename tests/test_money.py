@@ -0,0 +1,51 @@
+import numpy as np
+import pandas as pd
+
+from src.money import CashbackRule, cashback_kopecks, group_money, split_spending, to_kopecks
+from src.utils import aggregate_cards, summarize_cards
+
+
+def test_to_kopecks_exact_sum() -> None:
+    amounts = np.full(1_000_000, 0.1)
+    assert amounts.sum() != 100000.0
+    assert to_kopecks(amounts).sum() == 10_000_000
+    assert list(to_kopecks([-349.97, None, "12.5", "x"])) == [-34997, 0, 1250, 0]
+
+
+def test_split_spending() -> None:
+    spent, refunds = split_spending(np.array([-100, 250, 0, -5]))
+    assert list(spent) == [100, 0, 0, 5]
+    assert list(refunds) == [0, 250, 0, 0]
+
+
+def test_cashback_rules_floor() -> None:
+    rules = {None: CashbackRule(), "Супермаркеты": CashbackRule(step=10000, reward=300), "Переводы": CashbackRule(0, 0)}
+    cashback = cashback_kopecks(["Такси", "Супермаркеты", "Переводы", None], [19999, 25000, 500000, 10000], rules)
+    assert list(cashback) == [100, 600, 0, 100]
+
+
+def test_group_money_order() -> None:
+    sums = group_money(["*2", "*1", "*2", None], ["A", "A", "B", "A"], np.array([-100, 50, -1, -7]))
+    assert list(sums.index)[:3] == [("*2", "A"), ("*1", "A"), ("*2", "B")]
+    assert pd.isna(sums.index[3][0])
+    assert sums["net"].tolist() == [-100, 50, -1, -7]
+    assert sums["refunds"].tolist() == [0, 50, 0, 0]
+
+
+def test_card_summary_cashback_per_category() -> None:
+    df = pd.DataFrame(
+        {
+            "card_number": ["*1111", "*1111", "*1111", "*1111"],
+            "transaction_amount": [-150.0, -60.0, -60.0, 500.0],
+            "category": ["Супермаркеты", "Такси", "Такси", "Пополнения"],
+        }
+    )
+    summary, _ = aggregate_cards(df)
+    # Траты 270 руб.: 1 руб. за 150 руб. в супермаркетах и 1 руб. за 120 руб. такси
+    assert summary == [{"last_digits": "1111", "total_spent": 270.0, "refunds": 500.0, "cashback": 2.0}]
+
+    rules = {None: CashbackRule(), "Супермаркеты": CashbackRule(step=5000, reward=100)}
+    assert aggregate_cards(df, cashback_rules=rules)[0][0]["cashback"] == 4.0
+
+    cards = {"*1111": {"total_amount": 0, "transactions": df.to_dict("records")}}
+    assert summarize_cards(cards) == summary
@@ -0,0 +1,81 @@
+import json
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Any
+from urllib.parse import parse_qs, urlparse
+
+import pytest
+
+from src.quotes import RateLimiter, fetch_quote, fetch_quotes
+
+PRICES = {"AAPL": "190.5", "AMZN": "180.25", "MSFT": "420.0"}
+
+
+class StubHandler(BaseHTTPRequestHandler):
+    # Заглушка Alpha Vantage: задержка ответа, сбои для FLAKY и отсутствие данных для прочих тикеров
+    failures: dict = {}
+    delay = 0.2
+
+    def do_GET(self) -> None:
+        symbol = parse_qs(urlparse(self.path).query)["symbol"][0]
+        time.sleep(self.delay)
+        if symbol == "FLAKY" and self.failures.setdefault(symbol, 0) < 2:
+            self.failures[symbol] += 1
+            self.send_response(503)
+            self.end_headers()
+            return
+        if symbol in PRICES or symbol == "FLAKY":
+            body = {"Global Quote": {"01. symbol": symbol, "05. price": PRICES.get(symbol, "1.0")}}
+        else:
+            body = {}
+        payload = json.dumps(body).encode()
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(payload)))
+        self.end_headers()
+        self.wfile.write(payload)
+
+    def log_message(self, format: str, *args: Any) -> None:
+        pass
+
+
+@pytest.fixture(scope="module")
+def stub_url() -> Any:
+    server = ThreadingHTTPServer(("127.0.0.1", 0), StubHandler)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    yield f"http://127.0.0.1:{server.server_address[1]}/query"
+    server.shutdown()
+
+
+def test_fetch_quotes_concurrent(stub_url: Any) -> None:
+    started = time.monotonic()
+    result = fetch_quotes(["AAPL", "AMZN", "MSFT", "UNKNOWN"], "key", stub_url, max_workers=4)
+    elapsed = time.monotonic() - started
+    assert result == [
+        {"symbol": "AAPL", "price": 190.5},
+        {"symbol": "AMZN", "price": 180.25},
+        {"symbol": "MSFT", "price": 420.0},
+        {"symbol": "UNKNOWN", "price": "Not available"},
+    ]
+    # Четыре запроса по 0.2 с идут параллельно, а не последовательно
+    assert elapsed < 0.6
+
+
+def test_fetch_quote_retries(stub_url: Any) -> None:
+    assert fetch_quote("FLAKY", "key", stub_url, backoff=0.01) == {"symbol": "FLAKY", "price": 1.0}
+
+
+def test_fetch_quote_timeout(stub_url: Any) -> None:
+    result = fetch_quote("AAPL", "key", stub_url, timeout=0.05, max_retries=1, backoff=0.01)
+    assert result == {"symbol": "AAPL", "price": "Not available"}
+
+
+def test_rate_limiter() -> None:
+    limiter = RateLimiter(requests_per_minute=1200)
+    started = time.monotonic()
+    for _ in range(4):
+        limiter.wait()
+    # 1200 запросов в минуту - не чаще одного раза в 50 мс
+    assert time.monotonic() - started >= 0.15
@@ -1,7 +1,16 @@
-from unittest.mock import patch
+from datetime import datetime
 from typing import Any
+from unittest.mock import patch
+
+import pandas as pd
 import pytest
 
+from src.date_index import CategoryDateIndex
+from src.reports import (
+    filter_batches_by_category_and_date,
+    filter_transactions_by_category_and_date,
+    select_transactions_by_category_and_date,
+)
 from src.views import load_api_key
 
 
@@ -28,5 +37,57 @@ def test_load_api_key(mock_load_dotenv: Any) -> None:
         assert result == mock_api_key
 
 
+@pytest.fixture(scope="module")
+def mock_operations() -> Any:
+    # Мок операций с датами платежей в формате DD.MM.YYYY
+    return pd.DataFrame(
+        {
+            "data_payment": ["05.03.2024", "01.01.2024", "31.03.2024", "15.02.2024", None, "01.04.2024"],
+            "category": ["Такси", "Такси", "Такси", "Фастфуд", "Такси", "Такси"],
+            "transaction_amount": [-100.0, -200.0, -300.0, -50.0, -10.0, -400.0],
+        }
+    )
+
+
+def test_filter_transactions_by_category_and_date(mock_operations: Any) -> None:
+    # Тест фильтрации за 90 дней: сравнение идет по датам, а не по строкам DD.MM.YYYY
+    result = filter_transactions_by_category_and_date(mock_operations, "Такси", "01.01.2024")
+    assert [t["transaction_amount"] for t in result] == [-200.0, -100.0]
+    result = filter_transactions_by_category_and_date(mock_operations, "Такси", "02.01.2024")
+    assert [t["transaction_amount"] for t in result] == [-100.0, -300.0]
+
+
+def test_filter_transactions_arbitrary_window(mock_operations: Any) -> None:
+    # Тест произвольного периода: конец периода не включается
+    result = filter_transactions_by_category_and_date(mock_operations, "Такси", "05.03.2024", end_date="01.04.2024")
+    assert [t["transaction_amount"] for t in result] == [-100.0, -300.0]
+    result = filter_transactions_by_category_and_date(mock_operations, "Такси", "01.03.2024", days=365)
+    assert [t["transaction_amount"] for t in result] == [-100.0, -300.0, -400.0]
+    assert filter_transactions_by_category_and_date(mock_operations, "Кино", "01.01.2024") == []
+
+
+def test_select_transactions_with_prebuilt_index(mock_operations: Any) -> None:
+    # Тест выборки по заранее построенному индексу
+    index = CategoryDateIndex(mock_operations)
+    result = select_transactions_by_category_and_date(mock_operations, "Фастфуд", "01.01.2024", index=index)
+    assert list(result["transaction_amount"]) == [-50.0]
+
+
+def test_select_without_index_matches_index(make_operations: Any) -> None:
+    # Разовая выборка маской совпадает с выборкой по индексу, включая порядок по дате
+    df = make_operations(1000, seed=5)
+    index = CategoryDateIndex(df)
+    for category, start_date in [("Супермаркеты", "01.02.2023"), ("Переводы", "15.12.2023"), ("Нет такой", "01.01.2024")]:
+        expected = select_transactions_by_category_and_date(df, category, start_date, days=180, index=index)
+        assert select_transactions_by_category_and_date(df, category, start_date, days=180).equals(expected)
+
+
+def test_filter_batches_by_category_and_date(mock_operations: Any) -> None:
+    # Тест потоковой фильтрации по порциям: результат совпадает с фильтрацией всего DataFrame
+    batches = [mock_operations.iloc[:3], mock_operations.iloc[3:]]
+    result = filter_batches_by_category_and_date(batches, "Такси", datetime(2024, 3, 1), datetime(2024, 4, 2))
+    assert [t["transaction_amount"] for t in result] == [-100.0, -300.0, -400.0]
+
+
 if __name__ == "__main__":
-    pytest.main()
\ No newline at end of file
+    pytest.main()
@@ -0,0 +1,66 @@
+import numpy as np
+import pandas as pd
+
+from src.schema import format_date, format_dates, mask_card_numbers, normalize_column_names, normalize_operations
+
+
+def raw_operations() -> pd.DataFrame:
+    return pd.DataFrame(
+        {
+            "Дата операции": ["31.12.2021 16:44:00", "30.12.2021", None],
+            " Дата платежа": ["31.12.2021", "30.12.2021", "не дата"],
+            "Номер карты": ["*7197", "5536 9140 1234 5678", np.nan],
+            "Сумма операции": [-160.89, "1 234,50", "нет"],
+            "Категория": [" Супермаркеты ", "", None],
+            "Описание": ["Колхоз", "Перевод", "  "],
+        }
+    )
+
+
+def test_normalize_column_names() -> None:
+    df = normalize_column_names(pd.DataFrame(columns=[" Номер карты", "Сумма операции", "MCC", "extra "]))
+    assert list(df.columns) == ["card_number", "transaction_amount", "MCC", "extra"]
+
+
+def test_normalize_operations() -> None:
+    df = normalize_operations(raw_operations())
+
+    assert list(df.columns) == [
+        "date_operation",
+        "data_payment",
+        "card_number",
+        "transaction_amount",
+        "category",
+        "description",
+    ]
+    assert list(df["date_operation"]) == [pd.Timestamp("2021-12-31 16:44:00"), pd.Timestamp("2021-12-30"), pd.NaT]
+    assert list(df["data_payment"][:2]) == [pd.Timestamp("2021-12-31"), pd.Timestamp("2021-12-30")]
+    assert pd.isna(df["data_payment"][2])
+    assert list(df["transaction_amount"][:2]) == [-160.89, 1234.5]
+    assert pd.isna(df["transaction_amount"][2])
+    assert isinstance(df["category"].dtype, pd.CategoricalDtype)
+    assert df["category"][0] == "Супермаркеты"
+    assert df["category"][1:].isna().all()
+    assert pd.isna(df["description"][2])
+
+
+def test_normalize_operations_is_idempotent() -> None:
+    df = normalize_operations(raw_operations())
+    assert normalize_operations(df).equals(df)
+
+
+def test_mask_card_numbers() -> None:
+    masked = mask_card_numbers(pd.Series(["*7197", "5536 9140 1234 5678", None, "нет карты"]))
+    assert list(masked[:2]) == ["*7197", "*5678"]
+    assert pd.isna(masked[2])
+    assert masked[3] == "нет карты"
+    assert list(mask_card_numbers(pd.Series([5536914012345678]))) == ["*5678"]
+
+
+def test_format_dates() -> None:
+    formatted = format_dates(normalize_operations(raw_operations()))
+    assert list(formatted["date_operation"][:2]) == ["31.12.2021 16:44:00", "30.12.2021 00:00:00"]
+    assert list(formatted["data_payment"][:2]) == ["31.12.2021", "30.12.2021"]
+    assert format_date(pd.Timestamp("2021-12-31")) == "31.12.2021"
+    assert format_date(pd.NaT) is None
+    assert format_date("unknown") == "unknown"
@@ -0,0 +1,43 @@
+from typing import Any
+
+import pandas as pd
+import pytest
+
+from src.search_index import SearchIndex
+
+
+@pytest.fixture(scope="module")
+def index() -> Any:
+    df = pd.DataFrame(
+        {
+            "description": ["Магнит", "Такси Яндекс", None, "Супермаркет Перекресток", "Яндекс Еда", "Магнит"],
+            "category": ["Супермаркеты", "Такси", "Переводы", "Супермаркеты", "Фастфуд", "Супермаркеты"],
+        }
+    )
+    return SearchIndex(df)
+
+
+def test_search_substring(index: Any) -> None:
+    assert list(index.search("маркет")) == [0, 3, 5]
+    assert list(index.search("ЯНДЕКС")) == [1, 4]
+    assert list(index.search("перекресток")) == [3]
+    assert list(index.search("несуществующий")) == []
+
+
+def test_search_short_query(index: Any) -> None:
+    # Запросы короче триграммы проверяются по уникальным значениям без индекса
+    assert list(index.search("еда")) == [4]
+    assert list(index.search("та")) == [1]
+
+
+def test_search_ranking_and_limit(index: Any) -> None:
+    # Полное совпадение категории выше вхождения в описание
+    assert list(index.search("такси")) == [1]
+    assert list(index.search("магнит", limit=1)) == [0]
+    assert len(index.search("")) == 6
+
+
+def test_search_many(index: Any) -> None:
+    result = index.search_many(["такси", "перевод"], limit=5)
+    assert list(result["такси"]) == [1]
+    assert list(result["перевод"]) == [2]
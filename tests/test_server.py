@@ -0,0 +1,77 @@
+import json
+import os
+import threading
+from typing import Any
+from unittest.mock import patch
+from urllib.error import HTTPError
+from urllib.parse import quote
+from urllib.request import urlopen
+
+import pandas as pd
+import pytest
+
+from src.server import make_server
+from src.store import load_operations
+
+
+def operations(extra_rows: int = 0) -> pd.DataFrame:
+    rows = [
+        ["05.01.2024", "*1111", -150.0, "Такси", "Яндекс Такси"],
+        ["10.01.2024", "*2222", -300.0, "Супермаркеты", "Магнит"],
+        ["15.02.2024", "*1111", -80.0, "Такси", "Ситимобил"],
+    ] + [["20.02.2024", "*3333", -1.0, "Такси", "Такси Везет"]] * extra_rows
+    df = pd.DataFrame(rows, columns=["data_payment", "card_number", "transaction_amount", "category", "description"])
+    return df
+
+
+@pytest.fixture
+def server(write_operations: Any) -> Any:
+    server = make_server(write_operations(operations(), "operations.xlsx"), port=0)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    yield server
+    server.shutdown()
+    server.server_close()
+
+
+def get(server: Any, path: str) -> Any:
+    with urlopen(f"http://127.0.0.1:{server.server_address[1]}{path}") as response:
+        return json.loads(response.read().decode("utf-8"))
+
+
+def test_summary(server: Any) -> None:
+    result = get(server, "/summary")
+    assert [card["last_digits"] for card in result["cards"]] == ["1111", "2222"]
+    assert result["currency_rates"] == []
+    assert len(result["top_transactions"]) == 3
+
+
+def test_search_and_report(server: Any) -> None:
+    found = get(server, f"/search?q={quote('такси')}&limit=5")
+    assert sorted(record["description"] for record in found) == ["Ситимобил", "Яндекс Такси"]
+    assert get(server, f"/search?q={quote('магнит')}")[0]["transaction_amount"] == -300.0
+
+    report = get(server, f"/report?category={quote('Такси')}&date=01.01.2024&days=30")
+    assert [record["transaction_amount"] for record in report] == [-150.0]
+
+    with pytest.raises(HTTPError) as error:
+        get(server, "/report?category=x")
+    assert error.value.code == 400
+    with pytest.raises(HTTPError) as error:
+        get(server, "/unknown")
+    assert error.value.code == 404
+
+
+def test_reload_on_file_change(server: Any) -> None:
+    assert get(server, "/health")["rows"] == 3
+    with patch("src.server.load_operations", wraps=load_operations) as load:
+        get(server, "/search?q=magnit")
+        get(server, "/summary")
+        assert load.call_count == 0
+
+        operations(extra_rows=2).to_excel(server.data.file_path, index=False)
+        stat = os.stat(server.data.file_path)
+        os.utime(server.data.file_path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 10**9))
+        assert get(server, "/health")["rows"] == 5
+        assert get(server, "/health")["rows"] == 5
+        assert load.call_count == 1
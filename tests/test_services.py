@@ -5,7 +5,7 @@ from typing import  Any
 import pandas as pd
 import pytest
 
-from src.services import read_transactions_xlsx_file, simple_search
+from src.services import batch_search, read_transactions_xlsx_file, search_batches, simple_search
 
 
 # Тест для функции read_transactions_xlsx_file
@@ -16,13 +16,14 @@ def test_read_transactions_xlsx_file() -> None:
     with patch("pandas.read_excel", return_value=df):
         result = read_transactions_xlsx_file("dummy_path")
         assert len(result) == 1
-        assert result[0]["Описание"] == "Test description"
-        assert result[0]["Категория"] == "Test category"
+        assert result[0]["description"] == "Test description"
+        assert result[0]["category"] == "Test category"
         assert result[0]["Сумма"] == 100.0
 
     with patch("pandas.read_excel", side_effect=Exception("File not found")):
         result = read_transactions_xlsx_file("dummy_path")
-        assert result == []
+        assert len(result) == 0
+        assert list(result) == []
 
 
 # Тест для функции simple_search
@@ -41,8 +42,8 @@ def test_simple_search(tmpdir: Any) -> None:
             result = json.load(f)
 
         assert len(result) == 1
-        assert result[0]["Описание"] == "Test description"
-        assert result[0]["Категория"] == "Test category"
+        assert result[0]["description"] == "Test description"
+        assert result[0]["category"] == "Test category"
         assert result[0]["Сумма"] == 100.0
 
         simple_search("Another", "dummy_path", output_file)
@@ -51,8 +52,8 @@ def test_simple_search(tmpdir: Any) -> None:
             result = json.load(f)
 
         assert len(result) == 1
-        assert result[0]["Описание"] == "Another description"
-        assert result[0]["Категория"] == "Another category"
+        assert result[0]["description"] == "Another description"
+        assert result[0]["category"] == "Another category"
         assert result[0]["Сумма"] == 200.0
 
         simple_search("Non-existing", "dummy_path", output_file)
@@ -63,5 +64,53 @@ def test_simple_search(tmpdir: Any) -> None:
         assert len(result) == 0
 
 
+# Тест для функции batch_search
+def test_batch_search(tmpdir: Any) -> None:
+    mock_data = [
+        {"Описание": "Test description", "Категория": "Test category", "Сумма": 100.0},
+        {"Описание": "Another description", "Категория": None, "Сумма": 200.0},
+    ]
+    df = pd.DataFrame(mock_data)
+
+    with patch("pandas.read_excel", return_value=df):
+        output_file = os.path.join(tmpdir, "batch_results.json")
+        batch_search(["description", "Another"], "dummy_path", output_file, limit=1)
+
+        with open(output_file, "r", encoding="utf-8") as f:
+            result = json.load(f)
+
+    assert [t["Сумма"] for t in result["description"]] == [100.0]
+    assert result["Another"][0]["category"] is None
+
+
+# Тест для функции search_batches
+def test_search_batches() -> None:
+    batches = [
+        pd.DataFrame({"description": ["Такси", None], "category": ["Транспорт", "Переводы"]}),
+        pd.DataFrame({"description": ["Яндекс Такси", "Магнит"], "category": ["Транспорт", "Супермаркеты"]}),
+    ]
+    result = list(search_batches(iter(batches), "такси"))
+    assert [t["description"] for t in result] == ["Такси", "Яндекс Такси"]
+
+    assert len(list(search_batches(iter(batches), "о"))) == 3
+    result = list(search_batches(iter(batches), "о", limit=2))
+    assert len(result) == 2
+    assert result[1] == {"description": None, "category": "Переводы"}
+
+
+def test_simple_search_fuzzy(tmpdir: Any) -> None:
+    df = pd.DataFrame(
+        {
+            "Описание": ["Перевод Сбербанк", "Супермаркет Магнит", "Кофейня"],
+            "Категория": ["Переводы", "Супермаркеты", "Кафе"],
+        }
+    )
+    output_file = os.path.join(tmpdir, "search_results.json")
+    with patch("pandas.read_excel", return_value=df):
+        simple_search("супермаркеты магнт", "dummy_path", output_file, fuzzy=True)
+    with open(output_file, "r", encoding="utf-8") as f:
+        assert [record["description"] for record in json.load(f)] == ["Супермаркет Магнит"]
+
+
 if __name__ == "__main__":
     pytest.main()
@@ -0,0 +1,82 @@
+import json
+import os
+from typing import Any
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from src.chunked import iter_operation_batches
+from src.schema import normalize_operations
+from src.services import simple_search
+from src.snapshot import MANIFEST_FILE, export_snapshot, is_snapshot, read_snapshot, write_snapshot
+from src.store import clear_memory_cache, load_operations
+from src.utils import get_card_summary
+from src.writers import iter_records
+
+
+def is_memory_mapped(array: Any) -> bool:
+    while array is not None:
+        if isinstance(array, np.memmap):
+            return True
+        array = array.base
+    return False
+
+
+def test_snapshot_round_trip(operations_file: Any) -> None:
+    snapshot_dir = export_snapshot(operations_file)
+    assert snapshot_dir == operations_file[: -len(".csv")] + ".snapshot"
+    assert is_snapshot(snapshot_dir)
+    assert not is_snapshot(operations_file)
+
+    expected = normalize_operations(pd.read_csv(operations_file))
+    df = read_snapshot(snapshot_dir)
+    assert list(df.columns) == list(expected.columns)
+    assert list(iter_records(df)) == list(iter_records(expected))
+
+
+def test_snapshot_is_memory_mapped(operations_file: Any) -> None:
+    df = read_snapshot(export_snapshot(operations_file))
+    assert is_memory_mapped(df["transaction_amount"].to_numpy())
+    assert is_memory_mapped(df["data_payment"].to_numpy())
+    assert is_memory_mapped(df["category"].array.codes)
+    with pytest.raises(ValueError):
+        df["transaction_amount"].to_numpy()[0] = 0
+
+
+def test_snapshot_as_operations_file(operations_file: Any, tmpdir: Any) -> None:
+    snapshot_dir = export_snapshot(operations_file, str(tmpdir.join("shared.snapshot")))
+    clear_memory_cache()
+
+    assert len(load_operations(snapshot_dir)) == 2000
+    assert get_card_summary(snapshot_dir, currency_rates=[]) == get_card_summary(operations_file, currency_rates=[])
+    assert sum(len(batch) for batch in iter_operation_batches(snapshot_dir, batch_size=300)) == 2000
+
+    output_file = str(tmpdir.join("search.json"))
+    simple_search("магнит", snapshot_dir, output_file, limit=3)
+    with open(output_file, encoding="utf-8") as f:
+        assert [record["description"] for record in json.load(f)] == ["Магнит"] * 3
+    assert not any(name.startswith("shared.snapshot") and name.endswith("v1.pkl") for name in os.listdir(tmpdir.join("cache")))
+
+
+def test_snapshot_replaced_atomically(tmpdir: Any) -> None:
+    snapshot_dir = str(tmpdir.join("operations.snapshot"))
+    write_snapshot(pd.DataFrame({"description": ["Магнит", None]}), snapshot_dir)
+    first = read_snapshot(snapshot_dir)
+    write_snapshot(pd.DataFrame({"description": ["Лента"]}), snapshot_dir)
+
+    assert list(read_snapshot(snapshot_dir)["description"]) == ["Лента"]
+    assert list(iter_records(first)) == [{"description": "Магнит"}, {"description": None}]
+    assert sorted(os.listdir(tmpdir)) == ["operations.snapshot"]
+
+
+def test_snapshot_version_mismatch(tmpdir: Any) -> None:
+    snapshot_dir = write_snapshot(pd.DataFrame({"transaction_amount": [1.0]}), str(tmpdir.join("old.snapshot")))
+    manifest_path = os.path.join(snapshot_dir, MANIFEST_FILE)
+    with open(manifest_path, encoding="utf-8") as f:
+        manifest = json.load(f)
+    manifest["version"] = 0
+    with open(manifest_path, "w", encoding="utf-8") as f:
+        json.dump(manifest, f)
+    with pytest.raises(ValueError):
+        read_snapshot(snapshot_dir)
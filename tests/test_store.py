@@ -0,0 +1,77 @@
+import os
+from typing import Any
+from unittest.mock import patch
+
+import pandas as pd
+import pytest
+
+from src.schema import normalize_operations
+from src.store import cache_path, clear_memory_cache, load_artifact, load_operations, source_key
+
+
+@pytest.fixture
+def operations_file(tmpdir: Any, operations_cache: Any) -> Any:
+    # Файл-заглушка: содержимое подменяется через мок pandas.read_excel
+    file_path = tmpdir.join("operations.xls")
+    file_path.write_binary(b"stub")
+    return str(file_path)
+
+
+@pytest.fixture
+def mock_df() -> Any:
+    return pd.DataFrame({"card_number": ["*1234", "*5678"], "transaction_amount": [-100.0, 50.0]})
+
+
+def test_load_operations_parses_once(operations_file: Any, mock_df: Any) -> None:
+    with patch("pandas.read_excel", return_value=mock_df) as mock_read:
+        first = load_operations(operations_file)
+        second = load_operations(operations_file)
+    assert mock_read.call_count == 1
+    assert first is second
+    assert list(first["transaction_amount"]) == [-100.0, 50.0]
+
+
+def test_load_operations_uses_disk_cache(operations_file: Any, mock_df: Any) -> None:
+    with patch("pandas.read_excel", return_value=mock_df):
+        load_operations(operations_file)
+    assert os.path.exists(cache_path(source_key(operations_file), "pkl"))
+
+    clear_memory_cache()
+    with patch("pandas.read_excel", side_effect=AssertionError("xlrd не должен вызываться")):
+        result = load_operations(operations_file)
+    pd.testing.assert_frame_equal(result, normalize_operations(mock_df))
+
+
+def test_load_operations_invalidated_on_change(operations_file: Any, mock_df: Any) -> None:
+    with patch("pandas.read_excel", return_value=mock_df):
+        load_operations(operations_file)
+    old_cache = cache_path(source_key(operations_file), "pkl")
+
+    with open(operations_file, "wb") as f:
+        f.write(b"changed stub")
+    new_df = mock_df.head(1)
+    with patch("pandas.read_excel", return_value=new_df) as mock_read:
+        result = load_operations(operations_file)
+    assert mock_read.call_count == 1
+    assert len(result) == 1
+    assert not os.path.exists(old_cache)
+
+
+def test_load_artifact_cached_with_operations(operations_file: Any, mock_df: Any) -> None:
+    builds = []
+
+    def build(df: pd.DataFrame) -> int:
+        builds.append(len(df))
+        return len(df)
+
+    with patch("pandas.read_excel", return_value=mock_df):
+        assert load_artifact(operations_file, "rows", build) == 2
+        clear_memory_cache()
+        assert load_artifact(operations_file, "rows", build) == 2
+    assert builds == [2]
+    assert os.path.exists(cache_path(source_key(operations_file), "rows.pkl"))
+
+
+def test_load_operations_missing_file() -> None:
+    with pytest.raises(FileNotFoundError):
+        load_operations("missing_operations.xls")
@@ -0,0 +1,104 @@
+import sys
+from typing import Any
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from src.schema import normalize_operations
+from src.search_index import SearchIndex
+from src.transactions import Transactions, load_transactions
+from src.utils import format_top_transactions, process_cards, summarize_cards
+from src.writers import iter_records
+
+
+@pytest.fixture(scope="module")
+def mock_df() -> Any:
+    return pd.DataFrame(
+        {
+            "date_operation": ["05.06.2024 11:04:40", "04.06.2024 09:00:00", "03.06.2024 18:30:00", "01.06.2024 10:00:00"],
+            "data_payment": ["05.06.2024", None, "03.06.2024", "01.06.2024"],
+            "card_number": [None, "*1672", "*1672", "*5091"],
+            "status": ["OK", "OK", "FAILED", "OK"],
+            "transaction_amount": [-14.78, 0.1, 0.2, -349.97],
+            "category": ["Услуги банка", "Переводы", "Супермаркеты", "Супермаркеты"],
+            "description": ["Плата за оповещения", "Владимиров А.", "Магнит", "Пятёрочка"],
+        }
+    )
+
+
+@pytest.fixture(scope="module")
+def transactions(mock_df: Any) -> Any:
+    return Transactions.from_frame(mock_df)
+
+
+def test_row_view(transactions: Any, mock_df: Any) -> None:
+    assert len(transactions) == 4
+    row = transactions[1]
+    assert row["card_number"] == "*1672"
+    assert row["transaction_amount"] == 0.1
+    assert row["data_payment"] is None
+    assert "data_payment" in row and "missing" not in row
+    assert row.get("data_payment", "unknown") == "unknown"
+    assert row.get("missing", "default") == "default"
+    assert transactions[-1]["date_operation"] == "01.06.2024 10:00:00"
+    assert [row["description"] for row in transactions[1:3]] == ["Владимиров А.", "Магнит"]
+    assert transactions.to_records() == mock_df.astype(object).where(mock_df.notna(), None).to_dict("records")
+
+
+def test_records_match_iter_records(write_operations: Any, make_operations: Any) -> None:
+    # Записи из Transactions совпадают с выдачей writers.iter_records по операциям из файла
+    file_path = write_operations(make_operations(300, seed=4))
+    df = normalize_operations(make_operations(300, seed=4))
+    transactions = load_transactions(file_path)
+    positions = np.array([5, 0, 299])
+    assert transactions.to_records(positions) == list(iter_records(df, positions))
+
+
+def test_card_totals_exact(transactions: Any) -> None:
+    # 0.1 + 0.2 в копейках складывается точно
+    assert transactions.card_totals() == {None: -1478, "*1672": 30, "*5091": -34997}
+    assert summarize_cards(transactions) == [
+        {"last_digits": "unknown", "total_spent": 14.78, "refunds": 0.0, "cashback": 0.0},
+        {"last_digits": "1672", "total_spent": 0.0, "refunds": 0.3, "cashback": 0.0},
+        {"last_digits": "5091", "total_spent": 349.97, "refunds": 0.0, "cashback": 3.0},
+    ]
+
+    cards, _ = process_cards(transactions)
+    assert list(cards) == ["unknown", "*1672", "*5091"]
+    assert cards["*1672"]["total_amount"] == 0.3
+    assert [row["description"] for row in cards["*1672"]["transactions"]] == ["Владимиров А.", "Магнит"]
+    assert summarize_cards(cards) == summarize_cards(transactions)
+
+
+def test_top_and_format(transactions: Any) -> None:
+    top = transactions.top_positions(2)
+    assert list(top) == [3, 0]
+    formatted = format_top_transactions(transactions.take(top))
+    assert formatted[0] == {"date": "01.06.2024", "amount": -349.97, "category": "Супермаркеты", "description": "Пятёрочка"}
+
+
+def test_search(transactions: Any, mock_df: Any) -> None:
+    assert list(transactions.search("супермаркет")) == [2, 3]
+    assert list(transactions.search("МАГНИТ")) == [2]
+    assert list(transactions.search("а", limit=2)) == [0, 1]
+    # Индекс по словарям Transactions находит то же, что индекс по DataFrame
+    for query in ("супермаркет", "МАГНИТ", "а", "нет"):
+        assert list(SearchIndex(transactions).search(query)) == list(SearchIndex(mock_df).search(query))
+
+
+def test_memory_per_row(make_operations: Any) -> None:
+    df = normalize_operations(make_operations(20000, seed=2))
+    transactions = Transactions.from_frame(df)
+    records = df.to_dict("records")
+    # Список словарей: сами словари плюс различные объекты значений
+    seen: set = set()
+    records_bytes = 0
+    for record in records:
+        records_bytes += sys.getsizeof(record)
+        for value in record.values():
+            if id(value) not in seen:
+                seen.add(id(value))
+                records_bytes += sys.getsizeof(value)
+    assert transactions.nbytes / len(transactions) < 40
+    assert transactions.nbytes * 10 < records_bytes
@@ -0,0 +1,142 @@
+import json
+import os
+import time
+from typing import Any
+from unittest.mock import MagicMock
+
+import pytest
+import requests
+
+from src.market_cache import clear_market_caches
+from src.quotes import ALPHAVANTAGE_URL, fetch_quote
+from src.transport import (
+    DEFAULT_FIXTURES_DIR,
+    FixtureNotFoundError,
+    HttpTransport,
+    RecordingTransport,
+    ReplayTransport,
+    SimulatedTransport,
+    fixture_name,
+    set_transport,
+    transport_from_env,
+)
+from src.utils import CBR_DAILY_URL, get_currency_rate, get_stock_prices
+
+
+@pytest.fixture
+def replay() -> Any:
+    # Транспорт процесса - записи из data/fixtures; после теста возвращается прежний
+    previous = set_transport(ReplayTransport())
+    clear_market_caches()
+    yield
+    set_transport(previous)
+    clear_market_caches()
+
+
+def make_response(status_code: int, body: Any) -> Any:
+    response = MagicMock()
+    response.status_code = status_code
+    response.json.return_value = body
+    return response
+
+
+def test_fixture_name() -> None:
+    params = {"function": "GLOBAL_QUOTE", "symbol": "AAPL", "apikey": "secret"}
+    same = {"symbol": "AAPL", "apikey": "other", "function": "GLOBAL_QUOTE"}
+    assert fixture_name(ALPHAVANTAGE_URL, params) == fixture_name(ALPHAVANTAGE_URL, same)
+    assert fixture_name(ALPHAVANTAGE_URL, params) != fixture_name(ALPHAVANTAGE_URL, {**params, "symbol": "MSFT"})
+    assert fixture_name(CBR_DAILY_URL).startswith("www.cbr-xml-daily.ru-")
+
+
+def test_record_and_replay(tmpdir: Any) -> None:
+    inner = MagicMock()
+    inner.get.side_effect = [make_response(200, {"Global Quote": {"05. price": "1.5"}}), make_response(503, {})]
+    recorder = RecordingTransport(inner, str(tmpdir))
+    params = {"function": "GLOBAL_QUOTE", "symbol": "AAPL", "apikey": "secret"}
+
+    assert recorder.get(ALPHAVANTAGE_URL, params=params, timeout=1).status_code == 200
+    inner.get.assert_called_once_with(ALPHAVANTAGE_URL, params=params, timeout=1)
+    # Ответ с ошибкой не записывается
+    recorder.get(ALPHAVANTAGE_URL, params={**params, "symbol": "MSFT"})
+    assert os.listdir(str(tmpdir)) == [fixture_name(ALPHAVANTAGE_URL, params)]
+    with open(str(tmpdir.join(fixture_name(ALPHAVANTAGE_URL, params))), encoding="utf-8") as f:
+        assert "secret" not in f.read()
+
+    replay = ReplayTransport(str(tmpdir))
+    response = replay.get(ALPHAVANTAGE_URL, params={**params, "apikey": "another"})
+    assert response.status_code == 200
+    response.json()["Global Quote"]["05. price"] = "changed"
+    assert response.json() == {"Global Quote": {"05. price": "1.5"}}
+    with pytest.raises(FixtureNotFoundError):
+        replay.get(ALPHAVANTAGE_URL, params={**params, "symbol": "MSFT"})
+    assert fetch_quote("MSFT", "key", session=replay) == {"symbol": "MSFT", "price": "Not available"}
+
+
+def test_simulated_transport() -> None:
+    inner = MagicMock()
+    inner.get.return_value = make_response(200, {})
+
+    started = time.monotonic()
+    assert SimulatedTransport(inner, latency=0.05).get("http://api/").status_code == 200
+    assert time.monotonic() - started >= 0.05
+
+    with pytest.raises(requests.Timeout):
+        SimulatedTransport(inner, latency=0.2).get("http://api/", timeout=0.01)
+
+    failing = SimulatedTransport(inner, failure_rate=1.0).get("http://api/")
+    assert failing.status_code == 503
+    with pytest.raises(requests.HTTPError):
+        failing.raise_for_status()
+    assert inner.get.call_count == 1
+
+
+def test_market_data_from_fixtures(replay: Any, monkeypatch: Any) -> None:
+    monkeypatch.setenv("ALPHAVANTAGE_API_KEY", "replay")
+    assert get_currency_rate(use_cache=False) == [
+        {"currency": "USD", "rate": 90.3041},
+        {"currency": "EUR", "rate": 97.9278},
+    ]
+    assert get_stock_prices(["AAPL", "MSFT", "UNKNOWN"], use_cache=False) == [
+        {"symbol": "AAPL", "price": 191.29},
+        {"symbol": "MSFT", "price": 415.13},
+        {"symbol": "UNKNOWN", "price": "Not available"},
+    ]
+
+
+def test_market_data_failures() -> None:
+    failing = SimulatedTransport(ReplayTransport(), failure_rate=1.0)
+    previous = set_transport(failing)
+    try:
+        assert get_currency_rate(use_cache=False) == []
+    finally:
+        set_transport(previous)
+    # HTTP 503 повторяется, после исчерпания повторов цена недоступна
+    assert fetch_quote("AAPL", "key", session=failing, backoff=0.001) == {"symbol": "AAPL", "price": "Not available"}
+
+
+def test_transport_from_env(tmpdir: Any, monkeypatch: Any) -> None:
+    monkeypatch.delenv("MARKET_TRANSPORT", raising=False)
+    assert isinstance(transport_from_env(), HttpTransport)
+
+    monkeypatch.setenv("MARKET_TRANSPORT", "record")
+    monkeypatch.setenv("MARKET_FIXTURES_DIR", str(tmpdir))
+    recorder = transport_from_env()
+    assert isinstance(recorder, RecordingTransport) and recorder.fixtures_dir == str(tmpdir)
+
+    monkeypatch.setenv("MARKET_TRANSPORT", "replay")
+    monkeypatch.setenv("MARKET_LATENCY", "0.1")
+    simulated = transport_from_env()
+    assert isinstance(simulated, SimulatedTransport) and isinstance(simulated.inner, ReplayTransport)
+    assert simulated.latency == 0.1
+
+    monkeypatch.setenv("MARKET_TRANSPORT", "ftp")
+    with pytest.raises(ValueError):
+        transport_from_env()
+
+
+def test_shipped_fixtures() -> None:
+    # Записи в репозитории читаются ReplayTransport под своими именами
+    for name in os.listdir(DEFAULT_FIXTURES_DIR):
+        with open(os.path.join(DEFAULT_FIXTURES_DIR, name), encoding="utf-8") as f:
+            fixture = json.load(f)
+        assert name == fixture_name(fixture["url"], fixture["params"])
@@ -1,10 +1,19 @@
+from datetime import datetime
 from unittest.mock import MagicMock, patch
 from typing import Any
 import pandas as pd
 import pytest
 
+from src.market_cache import clear_market_caches, get_cache_stats
+from src.transactions import Transactions
 from src.utils import (
+    CardAggregate,
+    aggregate_cards,
+    aggregate_cards_by_dates,
+    filter_month_to_date,
     format_top_transactions,
+    get_card_summaries,
+    get_card_summary,
     get_currency_rate,
     get_greeting,
     get_stock_prices,
@@ -15,6 +24,14 @@ from src.utils import (
 )
 
 
+@pytest.fixture(autouse=True)
+def clear_caches() -> Any:
+    # Market data must not leak between tests through the TTL caches
+    clear_market_caches()
+    yield
+    clear_market_caches()
+
+
 @pytest.fixture(scope="module")
 def mock_xls_data() -> Any:
     # Mock data for read_xls_file function
@@ -49,9 +66,10 @@ def test_read_xls_file(mock_xls_data: Any) -> None:
     file_path = "mock_data.xlsx"
     with patch("pandas.read_excel", return_value=mock_xls_data):
         result = read_xls_file(file_path)
-        assert isinstance(result, list)
+        assert isinstance(result, Transactions)
         assert len(result) == 2
         assert "transaction_amount" in result[0]
+        assert result[1]["transaction_amount"] == -50.0
 
 
 def test_process_cards(mock_cards_data: Any) -> None:
@@ -60,6 +78,64 @@ def test_process_cards(mock_cards_data: Any) -> None:
     assert isinstance(cards, dict)
     assert len(cards) == 2
     assert len(top_transactions) <= 5
+    assert cards["9876543210987654"]["total_amount"] == -50.0
+    assert [row["transaction_amount"] for row in top_transactions] == [100.0, -50.0]
+
+
+def test_aggregate_cards() -> None:
+    # Test aggregate_cards matches the per-row process_cards/summarize_cards path
+    df = pd.DataFrame(
+        {
+            "card_number": ["*1111", "*2222", "*1111", None, "*2222", "*1111"],
+            "transaction_amount": [-100.0, 250.0, -300.5, -10.0, -5.0, 40.0],
+            "description": ["a", "b", "c", "d", "e", "f"],
+        }
+    )
+    summary, top_transactions = aggregate_cards(df, top_n=3)
+    assert summary == [
+        {"last_digits": "1111", "total_spent": 400.5, "refunds": 40.0, "cashback": 4.0},
+        {"last_digits": "2222", "total_spent": 5.0, "refunds": 250.0, "cashback": 0.0},
+        {"last_digits": "unknown", "total_spent": 10.0, "refunds": 0.0, "cashback": 0.0},
+    ]
+    assert [t["description"] for t in top_transactions] == ["c", "b", "a"]
+
+    _, expected_top = process_cards(df.to_dict(orient="records"))
+    assert [t["description"] for t in expected_top[:3]] == ["c", "b", "a"]
+
+
+def test_card_aggregate_batches_and_merge() -> None:
+    # Test that batch updates and merged partial aggregates match a single pass
+    df = pd.DataFrame(
+        {
+            "card_number": ["*1111", "*2222", "*1111", None, "*2222", "*1111"],
+            "transaction_amount": [-100.0, 250.0, -300.5, -10.0, -5.0, 40.0],
+        }
+    )
+    expected = aggregate_cards(df, top_n=3)
+
+    batched = CardAggregate(top_n=3)
+    for start in range(0, len(df), 2):
+        batched.update(df.iloc[start : start + 2])
+    assert batched.result() == expected
+
+    merged = CardAggregate(top_n=3).update(df.iloc[:3]).merge(CardAggregate(top_n=3).update(df.iloc[3:]))
+    assert merged.result() == expected
+
+
+def test_aggregate_cards_empty() -> None:
+    # Test aggregate_cards on an empty frame
+    assert aggregate_cards(pd.DataFrame()) == ([], [])
+
+
+def test_get_card_summary(mock_xls_data: Any) -> None:
+    # Test get_card_summary function
+    with patch("src.utils.load_operations", return_value=mock_xls_data), patch(
+        "src.utils.get_currency_rate", return_value=[]
+    ):
+        result = get_card_summary("mock_data.xls")
+    assert [card["last_digits"] for card in result["cards"]] == ["3456", "7654"]
+    assert [t["amount"] for t in result["top_transactions"]] == [100, -50]
+    assert result["currency_rates"] == []
 
 
 def test_summarize_cards() -> None:
@@ -76,6 +152,22 @@ def test_summarize_cards() -> None:
     assert "cashback" in result[0]
 
 
+def test_summarize_cards_spending_and_refunds() -> None:
+    # Spending is reported as a positive total, refunds separately; a refunds-only card spends nothing
+    cards, _ = process_cards(
+        [
+            {"card_number": "1234567890123456", "transaction_amount": -100.0, "category": "Супермаркеты"},
+            {"card_number": "1234567890123456", "transaction_amount": -250.5, "category": "Транспорт"},
+            {"card_number": "1234567890123456", "transaction_amount": 40.0, "category": "Переводы"},
+            {"card_number": "9876543210987654", "transaction_amount": 200.0, "category": "Переводы"},
+        ]
+    )
+    assert summarize_cards(cards) == [
+        {"last_digits": "3456", "total_spent": 350.5, "refunds": 40.0, "cashback": 3.0},
+        {"last_digits": "7654", "total_spent": 0.0, "refunds": 200.0, "cashback": 0.0},
+    ]
+
+
 def test_format_top_transactions() -> None:
     # Test format_top_transactions function
     top_transactions = [
@@ -100,7 +192,7 @@ def test_get_greeting() -> None:
 
 def test_get_currency_rate(mock_currency_data: Any, mock_requests_get: Any) -> None:
     # Test get_currency_rate function
-    with patch("requests.get", return_value=mock_requests_get):
+    with patch("requests.Session.get", return_value=mock_requests_get):
         result = get_currency_rate()
         assert isinstance(result, list)
         assert len(result) == 2
@@ -110,6 +202,19 @@ def test_get_currency_rate(mock_currency_data: Any, mock_requests_get: Any) -> N
         assert result[1]["rate"] == 85.0
 
 
+def test_get_currency_rate_cached(mock_requests_get: Any) -> None:
+    # Repeated calls are served from the cache without network round-trips
+    with patch("requests.Session.get", return_value=mock_requests_get) as mock_get:
+        first = get_currency_rate()
+        second = get_currency_rate()
+    assert first == second
+    assert mock_get.call_count == 1
+    assert get_cache_stats()["currency_rates"]["hits"] == 1
+
+    with patch("requests.Session.get", side_effect=Exception("network down")):
+        assert get_currency_rate(use_cache=False) == []
+
+
 def test_load_api_key(monkeypatch: Any) -> None:
     # Test load_api_key function
     mock_api_key = "mock_api_key"
@@ -118,10 +223,12 @@ def test_load_api_key(monkeypatch: Any) -> None:
     assert result == mock_api_key
 
 
-def test_get_stock_prices(mock_requests_get: Any) -> None:
-    # Test get_stock_prices function
+def test_get_stock_prices(mock_requests_get: Any, monkeypatch: Any) -> None:
+    # Test get_stock_prices function (quotes go through the shared requests session)
+    monkeypatch.setenv("ALPHAVANTAGE_API_KEY", "mock_api_key")
+    mock_requests_get.status_code = 200
     stock_symbols = ["AAPL", "AMZN"]
-    with patch("requests.get", return_value=mock_requests_get):
+    with patch("requests.Session.get", return_value=mock_requests_get):
         result = get_stock_prices(stock_symbols)
         assert isinstance(result, list)
         assert len(result) == 2
@@ -129,5 +236,49 @@ def test_get_stock_prices(mock_requests_get: Any) -> None:
         assert result[1]["symbol"] == "AMZN"
 
 
+def test_get_card_summary_month_to_date() -> None:
+    # Test that get_card_summary only summarizes the month up to the analysis date
+    df = pd.DataFrame(
+        {
+            "data_payment": ["31.05.2024", "01.06.2024", "10.06.2024", "11.06.2024", None],
+            "card_number": ["*1111", "*2222", "*1111", "*1111", "*2222"],
+            "transaction_amount": [-1000.0, -200.0, -150.0, -5000.0, -1.0],
+            "category": ["Такси", "Такси", "Супермаркеты", "Супермаркеты", "Такси"],
+        }
+    )
+    with patch("src.utils.load_operations", return_value=df):
+        result = get_card_summary("mock_data.xls", datetime(2024, 6, 10, 15, 30), currency_rates=[])
+    assert [(card["last_digits"], card["total_spent"]) for card in result["cards"]] == [("2222", 200.0), ("1111", 150.0)]
+    assert [t["amount"] for t in result["top_transactions"]] == [-200.0, -150.0]
+
+
+def test_aggregate_cards_by_dates_matches_single_dates(make_operations: Any) -> None:
+    # Test that the single-sweep batch equals one aggregate per date
+    df = make_operations(2000, cards=5, seed=3)
+    dates = [datetime(2023, month, 28) for month in range(1, 13)] + ["15.02.2024", "30.06.2024", "01.01.2030"]
+    batch = aggregate_cards_by_dates(df, dates)
+    for analysis_date, (summary, top_transactions) in zip(dates, batch):
+        expected_summary, expected_top = aggregate_cards(filter_month_to_date(df, analysis_date))
+        assert summary == expected_summary
+        assert pd.DataFrame(top_transactions).equals(pd.DataFrame(expected_top))
+    assert batch[-1] == ([], [])
+
+
+def test_get_card_summaries(make_operations: Any) -> None:
+    # Test that the batch API loads the file and fetches rates once
+    df = make_operations(500, cards=3, seed=1, start="2024-01-01", end="2024-03-31")
+    with patch("src.utils.load_operations", return_value=df) as load, patch(
+        "src.utils.get_currency_rate", return_value=[{"currency": "USD", "rate": 90.0}]
+    ) as rates:
+        result = get_card_summaries("mock_data.xls", ["31.01.2024", datetime(2024, 2, 29)])
+    load.assert_called_once()
+    rates.assert_called_once()
+    assert list(result) == ["31.01.2024", "29.02.2024"]
+    with patch("src.utils.load_operations", return_value=df):
+        expected = get_card_summary("mock_data.xls", datetime(2024, 2, 29), currency_rates=result["29.02.2024"]["currency_rates"])
+    assert result["29.02.2024"]["cards"] == expected["cards"]
+    assert result["29.02.2024"]["top_transactions"] == expected["top_transactions"]
+
+
 if __name__ == "__main__":
     pytest.main()
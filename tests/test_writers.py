@@ -0,0 +1,58 @@
+import gzip
+import json
+import os
+from typing import Any
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from src.writers import iter_records, write_json_stream
+
+
+@pytest.fixture(scope="module")
+def mock_df() -> Any:
+    return pd.DataFrame(
+        {"Описание": ["Такси", None, "Магнит"], "Сумма": [100.0, np.nan, -5.5], "Карта": ["*1", "*2", "*3"]}
+    )
+
+
+def test_iter_records(mock_df: Any) -> None:
+    records = list(iter_records(mock_df, np.array([2, 1]), chunk_size=1))
+    assert records == [
+        {"Описание": "Магнит", "Сумма": -5.5, "Карта": "*3"},
+        {"Описание": None, "Сумма": None, "Карта": "*2"},
+    ]
+    assert len(list(iter_records(mock_df))) == 3
+
+
+def test_write_json_stream_matches_json_dump(mock_df: Any, tmpdir: Any) -> None:
+    output_file = os.path.join(tmpdir, "out.json")
+    records = list(iter_records(mock_df))
+    assert write_json_stream(iter_records(mock_df, chunk_size=2), output_file) == 3
+    with open(output_file, encoding="utf-8") as f:
+        assert f.read() == json.dumps(records, ensure_ascii=False, indent=4)
+
+    write_json_stream(iter([]), output_file)
+    with open(output_file, encoding="utf-8") as f:
+        assert f.read() == "[]"
+
+
+def test_write_json_stream_compact_gzip(mock_df: Any, tmpdir: Any) -> None:
+    output_file = os.path.join(tmpdir, "out.json.gz")
+    write_json_stream(iter_records(mock_df), output_file, indent=None)
+    with gzip.open(output_file, "rt", encoding="utf-8") as f:
+        content = f.read()
+    assert "\n" not in content
+    assert json.loads(content)[0]["Описание"] == "Такси"
+
+
+def test_write_json_stream_jsonl(mock_df: Any, tmpdir: Any) -> None:
+    output_file = os.path.join(tmpdir, "out.jsonl")
+    write_json_stream(iter_records(mock_df), output_file, output_format="jsonl")
+    with open(output_file, encoding="utf-8") as f:
+        lines = f.read().splitlines()
+    assert [json.loads(line)["Карта"] for line in lines] == ["*1", "*2", "*3"]
+
+    with pytest.raises(ValueError):
+        write_json_stream([], output_file, output_format="xml")